@@ -0,0 +1,22 @@
+# coding: utf-8
+"""test_bench_bulk.py"""
+
+import pytest
+
+from workspace import board_source, make_client, measure, replay_transport
+
+pytest.importorskip('pytest_benchmark')
+
+SOURCE = board_source(num_lists=2, cards_per_list=250)
+NUM_CARDS = len(SOURCE['cards'])
+
+
+@pytest.mark.parametrize('max_workers', [1, 8])
+def test_bulk_update_cards(benchmark, max_workers):
+    replay = replay_transport(SOURCE, latency=0.001)
+    updates = [{'id': card['id'], 'name': 'Renamed'} for card in SOURCE['cards']]
+
+    def update():
+        return make_client(replay).bulk_update_cards(updates, max_workers=max_workers)
+    report = measure(benchmark, update, NUM_CARDS)
+    assert not report.failed
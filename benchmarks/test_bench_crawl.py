@@ -0,0 +1,49 @@
+# coding: utf-8
+"""test_bench_crawl.py
+
+Loading every card of a board, the ways the client offers.
+"""
+
+import pytest
+
+from workspace import board_source, make_client, measure, replay_transport
+
+pytest.importorskip('pytest_benchmark')
+
+SOURCE = board_source()
+NUM_CARDS = len(SOURCE['cards'])
+
+
+@pytest.fixture(scope='module')
+def replay():
+    return replay_transport(SOURCE)
+
+
+def test_crawl_list_by_list(benchmark, replay):
+    def crawl():
+        board = make_client(replay).get_board('b1')
+        return sum(len(board_list.cards) for board_list in board.lists)
+    assert measure(benchmark, crawl, NUM_CARDS) == NUM_CARDS
+
+
+def test_crawl_snapshot(benchmark, replay):
+    def crawl():
+        board = make_client(replay).load_board_snapshot('b1')
+        return sum(len(board_list.cards) for board_list in board.lists)
+    assert measure(benchmark, crawl, NUM_CARDS) == NUM_CARDS
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_cards_by_board(benchmark, replay, stream):
+    def crawl():
+        return len(make_client(replay).get_cards_by_board('b1', stream=stream))
+    assert measure(benchmark, crawl, NUM_CARDS) == NUM_CARDS
+
+
+def test_crawl_with_latency_and_throttling(benchmark):
+    replay = replay_transport(SOURCE, latency=0.001, throttle_every=10, retry_after=0)
+
+    def crawl():
+        board = make_client(replay, rate_limit=True).get_board('b1')
+        return sum(len(board_list.cards) for board_list in board.lists)
+    assert measure(benchmark, crawl, NUM_CARDS) == NUM_CARDS
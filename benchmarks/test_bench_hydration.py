@@ -0,0 +1,31 @@
+# coding: utf-8
+"""test_bench_hydration.py"""
+
+import pytest
+
+from workspace import board_source, make_client, measure, replay_transport
+
+from simpletrello.cardobject import Card
+
+pytest.importorskip('pytest_benchmark')
+
+SOURCE = board_source()
+
+
+@pytest.mark.parametrize('keep_source_data', [True, False])
+def test_hydrate_cards(benchmark, keep_source_data):
+    cards = SOURCE['cards']
+
+    def hydrate():
+        client = make_client(None, keep_source_data=keep_source_data)
+        return [client._hydrate(Card, card_source) for card_source in cards]
+    assert len(measure(benchmark, hydrate, len(cards))) == len(cards)
+
+
+def test_load_board_snapshot(benchmark):
+    replay = replay_transport(SOURCE)
+
+    def load():
+        return make_client(replay).load_board_snapshot('b1')
+    board = measure(benchmark, load, len(SOURCE['cards']))
+    assert len(board.cards) == len(SOURCE['cards'])
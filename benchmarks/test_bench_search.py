@@ -0,0 +1,42 @@
+# coding: utf-8
+"""test_bench_search.py"""
+
+import pytest
+
+from workspace import SEARCH_QUERY, board_source, make_client, measure, replay_transport
+
+from simpletrello.cardobject import Card
+from simpletrello.textindex import SearchIndex
+
+pytest.importorskip('pytest_benchmark')
+
+SOURCE = board_source()
+NUM_CARDS = len(SOURCE['cards'])
+
+
+def test_iter_search(benchmark):
+    replay = replay_transport(SOURCE)
+
+    def search():
+        return sum(1 for card in make_client(replay).iter_search(SEARCH_QUERY))
+    assert measure(benchmark, search, NUM_CARDS) == NUM_CARDS
+
+
+def test_local_search_index_build(benchmark):
+    board = make_client(replay_transport(SOURCE)).load_board_snapshot('b1')
+
+    def build():
+        index = SearchIndex()
+        index.add_board(board)
+        return index
+    measure(benchmark, build, NUM_CARDS)
+
+
+def test_local_search_query(benchmark):
+    board = make_client(replay_transport(SOURCE)).load_board_snapshot('b1')
+    index = SearchIndex()
+    index.add_board(board)
+
+    def search():
+        return index.search('{} chec*'.format(SEARCH_QUERY), types=Card, limit=50)
+    assert len(measure(benchmark, search, 1)) == 50
@@ -0,0 +1,103 @@
+# coding: utf-8
+"""workspace.py
+
+Synthetic board data, and a ReplayTransport serving it, for the benchmarks.
+"""
+
+import gc
+
+from simpletrello import TrelloClient
+from simpletrello.transport import ReplayTransport
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+SEARCH_QUERY = 'release'
+
+
+def board_source(num_lists=20, cards_per_list=250, board_id='b1'):
+    """A board in load_board_snapshot() format: <num_lists> * <cards_per_list>
+    cards, each with a label and a comment.
+    """
+    labels = [{'id': 'lab{}'.format(i), 'idBoard': board_id, 'name': 'Label {}'.format(i),
+               'color': color}
+              for i, color in enumerate(['red', 'green', 'blue', 'yellow'])]
+    lists, cards, actions = [], [], []
+    for i in range(num_lists):
+        list_id = '{}l{:04}'.format(board_id, i)
+        lists.append({'id': list_id, 'idBoard': board_id, 'name': 'List {}'.format(i),
+                      'closed': False, 'pos': i * 1024, 'subscribed': False})
+        for j in range(cards_per_list):
+            card_id = '{}c{:05}'.format(list_id, j)
+            label = labels[j % len(labels)]
+            cards.append({
+                'id': card_id, 'idBoard': board_id, 'idList': list_id,
+                'name': 'Card {} of {}'.format(j, i), 'closed': False,
+                'desc': 'Steps for the {} {} checklist.'.format(SEARCH_QUERY, j),
+                'pos': j * 1024, 'due': None, 'shortLink': 'sl{}'.format(card_id),
+                'dateLastActivity': '2018-03-01T12:00:00.000Z',
+                'idLabels': [label['id']], 'labels': [dict(label)],
+                'badges': {'comments': 1}})
+            actions.append({
+                'id': 'a' + card_id, 'type': 'commentCard', 'idMemberCreator': 'm1',
+                'date': '2018-03-01T12:00:00.000Z',
+                'data': {'text': 'Looks good', 'card': {'id': card_id},
+                         'board': {'id': board_id}, 'list': {'id': list_id}}})
+    return {'id': board_id, 'name': 'Board', 'closed': False, 'labels': labels,
+            'lists': lists, 'cards': cards, 'actions': actions, 'checklists': []}
+
+
+def replay_transport(source, search_page_size=1000, **kwargs):
+    """ReplayTransport serving <source> for the endpoints the benchmarks use."""
+    replay = ReplayTransport(**kwargs)
+    prefix = '/1/boards/{}'.format(source['id'])
+    replay.add('get', prefix, source)
+    # get_board_lists() uses the singular /board/{id}/lists.
+    replay.add('get', '/1/board/{}/lists'.format(source['id']), source['lists'])
+    replay.add('get', prefix + '/cards', source['cards'])
+    for board_list in source['lists']:
+        cards = [card for card in source['cards'] if card['idList'] == board_list['id']]
+        replay.add('get', '/1/lists/{}/cards'.format(board_list['id']), cards)
+    for card in source['cards']:
+        replay.add('put', '/1/cards/{}'.format(card['id']), card)
+    cards = source['cards']
+    for page, start in enumerate(range(0, len(cards) + 1, search_page_size)):
+        params = {'query': SEARCH_QUERY, 'modelTypes': 'cards',
+                  'cards_limit': search_page_size, 'cards_page': page}
+        replay.add('get', '/1/search', {'cards': cards[start:start + search_page_size]},
+                   params=params)
+    return replay
+
+
+def make_client(replay, **kwargs):
+    kwargs.setdefault('rate_limit', False)
+    return TrelloClient(api_key='bench', token='bench', session=replay, **kwargs)
+
+
+def peak_memory(fn):
+    """Run <fn> and return the peak of memory allocated meanwhile, in KiB.
+    None where tracemalloc is not available.
+    """
+    if tracemalloc is None:
+        fn()
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+
+def measure(benchmark, fn, items):
+    """Benchmark <fn>, and record its peak memory and items per second."""
+    benchmark.extra_info['peak_kib'] = peak_memory(fn)
+    benchmark.extra_info['items'] = items
+    result = benchmark(fn)
+    if benchmark.stats:
+        benchmark.extra_info['items_per_second'] = items / benchmark.stats.stats.mean
+    return result
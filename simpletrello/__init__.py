@@ -1,4 +1,9 @@
 # coding: utf-8
 """__init__.py"""
 
+import sys
+
 from simpletrello.client import TrelloClient
+
+if sys.version_info >= (3, 5):
+    from simpletrello.asyncclient import AsyncTrelloClient
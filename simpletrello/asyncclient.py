@@ -0,0 +1,117 @@
+# coding: utf-8
+"""asyncclient.py
+
+Python 3 only.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from simpletrello.client import TrelloClient
+
+DEFAULT_MAX_CONCURRENCY = 20
+
+# Each request in flight holds a worker thread, and Trello's per token limit
+# of 100 requests per 10 seconds leaves nothing for more threads to do.
+MAX_CONCURRENCY = 64
+
+# TrelloClient methods exposed as coroutines on AsyncTrelloClient.
+ASYNC_METHODS = [
+    'get_all_boards',
+    'get_board_by_name',
+    'search_boards_by_name',
+    'get_board',
+    'get_board_lists',
+    'get_list',
+    'get_card',
+    'get_cards',
+    'get_cards_by_board',
+    'get_card_comments',
+    'get_comment_by_id',
+    'get_board_labels',
+    'create_board',
+    'create_list',
+    'create_card',
+    'create_comment',
+    'delete_board',
+    'search',
+]
+
+
+class AsyncTrelloClient(object):
+    """Asyncio counterpart to TrelloClient.
+
+    Each method returns an awaitable, and takes the same arguments as the
+    TrelloClient method of the same name. Calls run on a bounded pool of
+    worker threads over one pooled TrelloClient, so up to <max_concurrency>
+    requests are in flight at once while sharing its keep-alive connections
+    and rate limiter.
+
+    This is not an asyncio transport: every request in flight blocks one
+    worker thread, and calls beyond <max_concurrency> wait for a free one.
+    It keeps an event loop responsive, but gives no more concurrency than
+    TrelloClient.fetch_many().
+
+    Objects returned are the usual Board/List/Card/Comment/Label instances,
+    bound to the underlying TrelloClient (available as <client>). Their lazy
+    properties are therefore blocking; use the coroutines here to fetch.
+
+    Params
+    ------
+    max_concurrency: int
+        Maximum number of requests in flight, i.e. worker threads. At most
+        MAX_CONCURRENCY.
+
+    client: TrelloClient
+        Use an existing client instead of creating one.
+
+    All other keyword arguments are passed to TrelloClient.
+    """
+
+    def __init__(self, api_key=None, token=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 client=None, **client_kwargs):
+        if not 1 <= max_concurrency <= MAX_CONCURRENCY:
+            raise ValueError('max_concurrency must be between 1 and {}, as each request in '
+                             'flight takes a thread.'.format(MAX_CONCURRENCY))
+        if client is None:
+            client_kwargs.setdefault('pool_maxsize', max_concurrency)
+            client = TrelloClient(api_key=api_key, token=token, **client_kwargs)
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        call = functools.partial(func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def gather(self, *aws):
+        """Await several calls at once, keeping results in order."""
+        return await asyncio.gather(*aws)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await asyncio.get_event_loop().run_in_executor(None, self.close)
+
+    def __repr__(self):
+        return '<simpletrello.AsyncTrelloClient>({!r})'.format(self.client)
+
+
+def _make_async_method(name):
+    sync_method = getattr(TrelloClient, name)
+
+    @functools.wraps(sync_method)
+    async def method(self, *args, **kwargs):
+        return await self._run(getattr(self.client, name), *args, **kwargs)
+    return method
+
+
+for _name in ASYNC_METHODS:
+    setattr(AsyncTrelloClient, _name, _make_async_method(_name))
@@ -0,0 +1,122 @@
+# coding: utf-8
+"""batch.py"""
+
+from __future__ import print_function, unicode_literals
+
+from simpletrello.exceptions import BatchRequestError
+from simpletrello.utils import listify
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+# Trello accepts at most 10 urls per call to GET /batch.
+BATCH_LIMIT = 10
+
+
+def batch_url(path_parts, params=None):
+    """Return the relative url for one GET inside a /batch call.
+
+    Examples
+    --------
+    >>> batch_url(['lists', 'abc', 'cards'], {'fields': 'name,idList'})
+    >>> '/lists/abc/cards?fields=name%2CidList'
+    """
+    url = '/' + '/'.join(listify(path_parts))
+    if params:
+        url = '{}?{}'.format(url, urlencode(sorted(params.items())))
+    return url
+
+
+def split_batch_response(response):
+    """Turn one element of a /batch response into (body, error).
+
+    Successful entries look like {"200": body}. Failed entries carry the
+    status code and message of the individual request.
+    """
+    if isinstance(response, dict) and '200' in response:
+        return response['200'], None
+    if isinstance(response, dict):
+        status = response.get('statusCode')
+        message = response.get('message') or response.get('name')
+    else:
+        status, message = None, response
+    return None, BatchRequestError(message, status_code=status)
+
+
+class BatchItem(object):
+    """Placeholder for one GET queued on a Batch. Resolved when the batch flushes."""
+
+    def __init__(self, path_parts, params=None, factory=None):
+        self.path_parts = listify(path_parts)
+        self.params = params
+        self.factory = factory
+        self.done = False
+        self.error = None
+        self._value = None
+
+    @property
+    def url(self):
+        return batch_url(self.path_parts, self.params)
+
+    def resolve(self, body, error):
+        self.done = True
+        self.error = error
+        if error is None:
+            self._value = self.factory(body) if self.factory else body
+
+    @property
+    def result(self):
+        if not self.done:
+            raise RuntimeError('Batch has not been sent yet.')
+        if self.error is not None:
+            raise self.error
+        return self._value
+
+    def __repr__(self):
+        return '<simpletrello.batch.BatchItem ({}, done={})>'.format(self.url, self.done)
+
+
+class Batch(object):
+    """Collect GET requests and send them through /batch, 10 urls at a time.
+
+    Usually created with TrelloClient.batch():
+
+    >>> with trello.batch() as batch:
+    ...     cards = [batch.get(['lists', list_id, 'cards']) for list_id in list_ids]
+    >>> cards[0].result
+
+    Queued requests are sent when the with block exits, or on flush().
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._pending = []
+
+    def get(self, path_parts, params=None, factory=None):
+        """Queue a GET. <factory> turns the decoded body into objects.
+
+        Returns
+        -------
+        item: BatchItem
+        """
+        item = BatchItem(path_parts, params=params, factory=factory)
+        self._pending.append(item)
+        return item
+
+    def flush(self):
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start:start + BATCH_LIMIT]
+            urls = ','.join(item.url for item in chunk)
+            responses = self.client._get(['batch'], params={'urls': urls})
+            for item, response in zip(chunk, responses):
+                item.resolve(*split_batch_response(response))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
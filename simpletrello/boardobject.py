@@ -3,22 +3,46 @@
 
 from __future__ import print_function, unicode_literals
 
+from simpletrello.lookup import NameIndex, only_one
 from simpletrello.trelloobject import TrelloObject
 
 
 class Board(TrelloObject):
 
+    __slots__ = ('_id', '_name', '_closed', '_labels', '_lists', '_cards', '_full_data_cache',
+                 '_lookups')
+
+    _api_path = 'boards'
+
+    _source_fields = {
+        'id': '_id',
+        'name': '_name',
+        'closed': '_closed',
+    }
+
     def __init__(self, client, source_data=None):
         super(Board, self).__init__(client, source_data)
-        self._populate_from_source(self.source_data)
+        self._full_data_cache = None
+        self._lookups = None
+        self._populate_from_source(source_data)
 
     def _populate_from_source(self, source_data):
         self._id = source_data.get('id')
         self._name = source_data.get('name')
         self._closed = source_data.get('closed', None)
-        self._labels = source_data.get('labels', None)
+        labels = source_data.get('labels', None)
+        if labels is not None:
+            labels = [self.client.intern_label(label_source) for label_source in labels]
+        self._labels = labels
         self._lists = None
-        self._full_data_cache = None
+        self._cards = None
+        self._lookups = None
+
+    def _update_from_source(self, source_data):
+        super(Board, self)._update_from_source(source_data)
+        if source_data.get('labels') is not None:
+            self._labels = [self.client.intern_label(label_source)
+                            for label_source in source_data['labels']]
 
     @property
     def id(self):
@@ -26,16 +50,16 @@ class Board(TrelloObject):
 
     @property
     def name(self):
+        self._ensure_loaded('name')
         return self._name
 
     @name.setter
     def name(self, value):
-        response = self.put(['boards', self.id], params={'name': value})
-        if response['name'] == value:
-            self._name = value
+        self._write({'name': value})
 
     @property
     def closed(self):
+        self._ensure_loaded('closed')
         if self._closed is None:
             self.refresh_full_data()
         return self._closed
@@ -51,13 +75,15 @@ class Board(TrelloObject):
 
     @property
     def lists(self):
-        if not self._lists:
+        if self._lists is None:
             self.refresh_lists()
         return self._lists
 
     @property
     def cards(self):
-        return self.client.get_cards_by_board(self._id)
+        if self._cards is None:
+            self.refresh_cards()
+        return self._cards
 
     @property
     def labels(self):
@@ -73,12 +99,95 @@ class Board(TrelloObject):
             self.refresh_full_data()
         return self._full_data_cache
 
-    def refresh_lists(self):
-        self._lists = self.client.get_board_lists(self.id)
+    def refresh_lists(self, with_cards=False):
+        self._lists = self.client.get_board_lists(self.id, with_cards=with_cards)
+        self._lookups = None
+
+    def refresh_cards(self):
+        self._cards = self.client.get_cards_by_board(self.id)
+        self._lookups = None
 
     def refresh_full_data(self):
-        self._full_data_cache = self.client.get_board(self.id, fields='all', raw=True)
-        self._populate_from_source(self._full_data_cache)
+        self._full_data_cache = self.client.get_board(
+            self.id, fields='all', raw=True, conditional=True)
+        self._update_from_source(self._full_data_cache)
+        self._loaded = None
+
+    ### LOOKUPS
+
+    def _lookup(self, kind):
+        """Lookup table for <kind>, built from the loaded objects on first use.
+        The client drops them whenever a list, card or label of the board is
+        created, changed or removed.
+        """
+        lookups = self._lookups
+        if lookups is None:
+            lookups = self._lookups = {}
+        table = lookups.get(kind)
+        if table is None:
+            table = lookups[kind] = self._build_lookup(kind)
+        return table
+
+    def _build_lookup(self, kind):
+        if kind == 'lists':
+            return NameIndex(self.lists)
+        if kind == 'labels':
+            return NameIndex(self.labels or [])
+        if kind == 'label_colors':
+            by_color = {}
+            for label in self.labels or []:
+                by_color.setdefault(label.color, []).append(label)
+            return by_color
+        if kind == 'short_links':
+            return dict((card.short_link, card) for card in self._loaded_cards())
+        if kind == 'cards':
+            return dict((card.id, card) for card in self._loaded_cards())
+        raise ValueError(kind)
+
+    def _loaded_cards(self):
+        """Cards of the board, from the lists' cards if those are all loaded,
+        since BoardSyncer keeps those current.
+        """
+        if self._lists is not None:
+            if all(board_list._cards is not None for board_list in self._lists):
+                return [card for board_list in self._lists for card in board_list._cards]
+        return self.cards
+
+    def _here(self, obj):
+        # Objects moved to another board stay in the tables until the next rebuild.
+        return obj is not None and obj._id_board == self.id
+
+    def get_list_by_id(self, list_id):
+        """The <List> with <list_id>, or None."""
+        board_list = self._lookup('lists').get(list_id)
+        return board_list if self._here(board_list) else None
+
+    def get_list_by_name(self, name):
+        """The one open <List> named <name>, ignoring case.
+        Raise ValueError if there is none, or more than one.
+        """
+        matches = [l_ for l_ in self._lookup('lists').find(name) if self._here(l_)]
+        return only_one(matches, 'list', name)
+
+    def get_label_by_name(self, name):
+        """The one <Label> named <name>, ignoring case.
+        Raise ValueError if there is none, or more than one.
+        """
+        return only_one(self._lookup('labels').find(name), 'label', name)
+
+    def get_labels_by_color(self, color):
+        """<Label>s with <color>, e.g. 'red'."""
+        return list(self._lookup('label_colors').get(color, ()))
+
+    def get_card_by_id(self, card_id):
+        """The <Card> with <card_id>, or None."""
+        card = self._lookup('cards').get(card_id)
+        return card if self._here(card) else None
+
+    def get_card_by_short_link(self, short_link):
+        """The <Card> with <short_link>, as in its URL, or None."""
+        card = self._lookup('short_links').get(short_link)
+        return card if self._here(card) else None
 
     def create_list(self, list_name, pos='bottom'):
         new_list = self.client.create_list(
@@ -86,18 +195,13 @@ class Board(TrelloObject):
             id_board=self.id,
             pos=pos
         )
-        self.refresh_lists()
         return new_list
 
     def archive(self):
-        response = self.put(['boards', self.id], params={'closed': 'true'})
-        if response['closed'] is True:
-            self._closed = True
+        self._write({'closed': 'true'})
 
     def unarchive(self):
-        response = self.put(['boards', self.id], params={'closed': 'false'})
-        if response['closed'] is False:
-            self._closed = False
+        self._write({'closed': 'false'})
 
     def delete(self):
         """Delete the board.
@@ -110,9 +214,7 @@ class Board(TrelloObject):
             pass
 
     def rename(self, new_name):
-        response = self.put(['boards', self.id], params={'name': new_name})
-        if response['name'] == new_name:
-            self.name = new_name
+        self.name = new_name
 
     def __repr__(self):
-        return('<simpletrello.boardobject.Board ({}, {})>'.format(self.name, self.id))
+        return('<simpletrello.boardobject.Board ({}, {})>'.format(self._name, self.id))
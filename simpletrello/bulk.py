@@ -0,0 +1,97 @@
+# coding: utf-8
+"""bulk.py"""
+
+from __future__ import print_function, unicode_literals
+
+from simpletrello.cardobject import Card
+from simpletrello.fanout import DEFAULT_MAX_WORKERS, imap_bounded
+from simpletrello.utils import is_stringy
+
+# Gap between the positions given to consecutive created cards, as Trello uses.
+POS_STEP = 16384
+
+
+class BulkReport(object):
+    """Per item outcome of a bulk operation.
+
+    <results> is a list of simpletrello.fanout.ItemResult, in input order.
+    The value of a successful item is the created or updated <Card>.
+    """
+
+    def __init__(self, results):
+        self.results = results
+
+    @property
+    def succeeded(self):
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.ok]
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __repr__(self):
+        return '<simpletrello.bulk.BulkReport ({} succeeded, {} failed)>'.format(
+            len(self.succeeded), len(self.failed))
+
+
+def bottom_pos(client, list_id):
+    """Position of the last open card of <list_id>, or 0 for an empty list."""
+    cards = client._get(['lists', list_id, 'cards'], params={'fields': 'pos'})
+    return max([card['pos'] for card in cards] or [0])
+
+
+def bulk_create_cards(client, list_id, cards, max_workers=DEFAULT_MAX_WORKERS):
+    """Create many cards in <list_id> concurrently. See TrelloClient.bulk_create_cards."""
+    def positioned():
+        # Explicit, increasing positions, given before dispatch, keep the input
+        # order whatever order the creates complete in. A list whose bottom
+        # can't be read fails its own cards only, in their ItemResults.
+        last_pos = {}
+        for card in cards:
+            params = {'name': card} if is_stringy(card) else dict(card)
+            params.setdefault('idList', list_id)
+            if 'pos' not in params:
+                target = params['idList']
+                if target not in last_pos:
+                    try:
+                        last_pos[target] = bottom_pos(client, target)
+                    except Exception as error:
+                        last_pos[target] = error
+                if isinstance(last_pos[target], Exception):
+                    yield card, last_pos[target]
+                    continue
+                last_pos[target] += POS_STEP
+                params['pos'] = last_pos[target]
+            yield card, params
+
+    def create(item):
+        card, params = item
+        if isinstance(params, Exception):
+            raise params
+        # Retries stay in the client: 429s and connect errors are retried there,
+        # 5xx responses to a POST are not, since the card may exist.
+        response = client._post(['cards'], params=params)
+        card = client._hydrate(Card, response)
+        client._attach_created(card)
+        return card
+    results = imap_bounded(create, positioned(), max_workers=max_workers)
+    return BulkReport([result._replace(item=result.item[0]) for result in results])
+
+
+def bulk_update_cards(client, updates, max_workers=DEFAULT_MAX_WORKERS):
+    """Update many cards concurrently. See TrelloClient.bulk_update_cards."""
+    def update(item):
+        if isinstance(item, dict):
+            params = dict(item)
+            card_id = params.pop('id')
+        else:
+            card_id, params = item
+        response = client._put(['cards', card_id], params=params)
+        return client._hydrate(Card, response)
+    return BulkReport(list(imap_bounded(update, updates, max_workers=max_workers)))
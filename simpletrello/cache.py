@@ -0,0 +1,323 @@
+# coding: utf-8
+"""cache.py"""
+
+from __future__ import print_function, unicode_literals
+
+import threading
+import time
+from collections import OrderedDict
+
+from simpletrello.utils import is_stringy, listify
+
+try:
+    from urllib.parse import parse_qsl
+except ImportError:
+    from urlparse import parse_qsl
+
+_clock = getattr(time, 'monotonic', time.time)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_MAX_VALIDATORS = 256
+DEFAULT_MAX_VALIDATOR_BYTES = 16 * 1024 * 1024
+DEFAULT_TTL = 60.0
+
+# Seconds to keep responses, by the first path part of the request.
+DEFAULT_TTLS = {
+    'boards': 60.0,
+    'lists': 60.0,
+    'cards': 30.0,
+    'labels': 300.0,
+    'actions': 30.0,
+    'members': 300.0,
+    'search': 10.0,
+}
+
+# Stands for every id, for responses like search results that can list any
+# object without naming it in the request. Any write drops them.
+ANY_ID = '*'
+
+
+def cache_key(path_parts, params=None):
+    """Return a hashable key for a GET of <path_parts> with <params>.
+    Param order does not matter, and values are compared as strings.
+    """
+    path = tuple(listify(path_parts))
+    normalized = tuple(sorted((k, '' if v is None else '{}'.format(v))
+                              for k, v in (params or {}).items()))
+    return path, normalized
+
+
+def resource_ids(path_parts, params=None):
+    """Return the ids a request touches, for invalidation.
+
+    These are the path parts after the resource type, e.g. the board id in
+    ['boards', id, 'cards'], plus the values of id* params such as idList.
+    A /batch request touches the ids of each of its urls. Search and a
+    member's boards are ANY_ID.
+    """
+    path_parts = listify(path_parts)
+    if not path_parts:
+        return set()
+    if path_parts[0] == 'search' or (path_parts[0] == 'members' and path_parts[-1] == 'boards'):
+        return set([ANY_ID])
+    if path_parts[0] == 'batch':
+        ids = set()
+        for url in (params or {}).get('urls', '').split(','):
+            path, _, query = url.partition('?')
+            ids |= resource_ids([part for part in path.split('/') if part], dict(parse_qsl(query)))
+        return ids
+    ids = set(path_parts[1::2])
+    for name, value in (params or {}).items():
+        if name.startswith('id') and value:
+            ids.add(value)
+    return ids
+
+
+def response_ids(body):
+    """Return the ids of the object a write returned, e.g. a new card's idBoard."""
+    if not isinstance(body, dict):
+        return set()
+    return set(value for name, value in body.items()
+               if name.startswith('id') and is_stringy(value))
+
+
+def contained_ids(body):
+    """Return the ids of the objects listed in a GET response, e.g. the cards of
+    /lists/{id}/cards, so writing to one drops the listing even after the
+    object moved elsewhere. Looks into /batch results and nested collections
+    one level down.
+    """
+    if isinstance(body, dict):
+        items = [value for value in body.values() if isinstance(value, list)]
+        return set(item_id for value in items for item_id in contained_ids(value))
+    if not isinstance(body, list):
+        return set()
+    ids = set()
+    for item in body:
+        if isinstance(item, dict):
+            if '200' in item:
+                item = item['200']
+                ids |= contained_ids(item)
+            if isinstance(item, dict) and is_stringy(item.get('id')):
+                ids.add(item['id'])
+    return ids
+
+
+class CacheStats(object):
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def as_dict(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
+
+    def __repr__(self):
+        return '<simpletrello.cache.CacheStats {}>'.format(self.as_dict())
+
+
+class ResponseCache(object):
+    """LRU cache of decoded GET responses, with per resource TTLs.
+
+    Bounded both by number of entries and by the size of the raw response
+    bodies. Writes through the client invalidate every entry whose path, id
+    params or listed objects mention one of the ids written to.
+
+    Cached values are shared, not copied. Treat them as read only.
+    Safe to use from several threads.
+
+    Params
+    ------
+    max_entries: int
+
+    max_bytes: int
+
+    ttls: dict
+        Seconds to keep responses, keyed by the first path part
+        ('boards', 'cards', ...). Merged over DEFAULT_TTLS.
+
+    default_ttl: float
+        TTL for resources not in <ttls>.
+    """
+
+    def __init__(
+            self,
+            max_entries=DEFAULT_MAX_ENTRIES,
+            max_bytes=DEFAULT_MAX_BYTES,
+            ttls=None,
+            default_ttl=DEFAULT_TTL,
+            clock=_clock):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self.size = 0
+        self._clock = clock
+        # key -> (value, size, expires, ids)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, path_parts):
+        return self.ttls.get(listify(path_parts)[0], self.default_ttl)
+
+    def get(self, path_parts, params=None):
+        """Return (hit, value)."""
+        key = cache_key(path_parts, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return False, None
+            value, size, expires, ids = entry
+            if expires <= self._clock():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return False, None
+            # Re-insert to mark as most recently used.
+            self._entries[key] = self._entries.pop(key)
+            self.stats.hits += 1
+            return True, value
+
+    def set(self, path_parts, params, value, size):
+        """Store <value>, the decoded body of a response <size> bytes long."""
+        ttl = self.ttl_for(path_parts)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        key = cache_key(path_parts, params)
+        ids = resource_ids(path_parts, params) | contained_ids(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, self._clock() + ttl, ids)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+
+    def invalidate(self, path_parts, params=None, response=None, previous=None):
+        """Drop entries touching any id written by a request to <path_parts>,
+        any id of the object in <response>, or any of the <previous> ids of
+        the object, e.g. the list a card was moved from.
+        """
+        ids = resource_ids(path_parts, params) | response_ids(response)
+        self.invalidate_ids(ids | set(previous or ()))
+
+    def invalidate_ids(self, ids):
+        """Drop entries touching any of <ids>, e.g. the objects of a webhook
+        action, and every ANY_ID entry.
+        """
+        if not ids:
+            return
+        ids = set(ids) | set([ANY_ID])
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[3] & ids]
+            for key in stale:
+                self._remove(key)
+            self.stats.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        value, size, expires, ids = self._entries.pop(key)
+        self.size -= size
+
+    def __repr__(self):
+        return '<simpletrello.cache.ResponseCache ({} entries, {} bytes)>'.format(
+            len(self._entries), self.size)
+
+
+class ValidatorStore(object):
+    """Remember ETag / Last-Modified validators and the decoded body they belong
+    to, per GET url and params, so refreshes can be sent as conditional
+    requests and a 304 answered from memory.
+
+    Least recently used entries are dropped past <max_entries>, or once the
+    raw bodies they were decoded from add up to more than <max_bytes>, as in
+    ResponseCache. A body larger than <max_bytes> is not kept at all.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_VALIDATORS, max_bytes=DEFAULT_MAX_VALIDATOR_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.not_modified = 0
+        self.size = 0
+        # key -> (etag, last_modified, body, size)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def headers(self, path_parts, params=None):
+        """Return conditional request headers for a GET, or None if unknown."""
+        with self._lock:
+            entry = self._entries.get(cache_key(path_parts, params))
+        if entry is None:
+            return None
+        etag, last_modified, body, size = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def body(self, path_parts, params=None):
+        """Return (found, body) for the stored body, after the server answered 304.
+        <found> is False if another thread dropped the entry in the meantime.
+        """
+        key = cache_key(path_parts, params)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False, None
+            self._entries[key] = entry
+            self.not_modified += 1
+        return True, entry[2]
+
+    def set(self, path_parts, params, response_headers, body, size):
+        """Store validators from <response_headers>, if the server sent any,
+        with <body>, decoded from a response <size> bytes long.
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        key = cache_key(path_parts, params)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if (not etag and not last_modified) or size > self.max_bytes:
+                return
+            self._entries[key] = (etag, last_modified, body, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry[3]
+
+    def __repr__(self):
+        return '<simpletrello.cache.ValidatorStore ({} entries, {} bytes)>'.format(
+            len(self._entries), self.size)
@@ -3,12 +3,37 @@
 
 from __future__ import print_function, unicode_literals
 
-from simpletrello.labelobject import Label
 from simpletrello.trelloobject import TrelloObject
+from simpletrello.utils import intern_ids
 
 
 class Card(TrelloObject):
 
+    __slots__ = ('_id', '_name', '_closed', '_comments', '_desc', '_id_board', '_id_labels',
+                 '_id_list', '_id_members', '_labels', '_checklists', '_pos', '_short_link',
+                 '_subscribed', '_due', '_date_last_activity', '_full_data_cache', '_list',
+                 '_board')
+
+    _api_path = 'cards'
+
+    _extra_fields = ('labels',)
+
+    _source_fields = {
+        'id': '_id',
+        'name': '_name',
+        'closed': '_closed',
+        'desc': '_desc',
+        'idBoard': '_id_board',
+        'idLabels': '_id_labels',
+        'idList': '_id_list',
+        'idMembers': '_id_members',
+        'pos': '_pos',
+        'shortLink': '_short_link',
+        'subscribed': '_subscribed',
+        'due': '_due',
+        'dateLastActivity': '_date_last_activity',
+    }
+
     def __init__(self, client, source_data=None):
         super(Card, self).__init__(client, source_data)
         self._populate_from_source(source_data)
@@ -19,17 +44,27 @@ class Card(TrelloObject):
         self._closed = source_data.get('closed')
         self._comments = None
         self._desc = source_data.get('desc')
-        self._id_board = source_data.get('idBoard')
-        self._id_labels = source_data.get('idLabels')
-        self._id_list = source_data.get('idList')
-        self._id_members = source_data.get('idMembers')
-        self._labels = [Label(client=self.client,
-                              source_data=label)
-                        for label in source_data.get('labels')]
+        self._id_board = intern_ids(source_data.get('idBoard'))
+        self._id_labels = intern_ids(source_data.get('idLabels'))
+        self._id_list = intern_ids(source_data.get('idList'))
+        self._id_members = intern_ids(source_data.get('idMembers'))
+        self._labels = [self.client.intern_label(label)
+                        for label in source_data.get('labels') or []]
+        self._checklists = source_data.get('checklists')
         self._pos = source_data.get('pos')
         self._short_link = source_data.get('shortLink')
         self._subscribed = source_data.get('subscribed')
+        self._due = source_data.get('due')
+        self._date_last_activity = source_data.get('dateLastActivity')
         self._full_data_cache = None
+        self._list = None
+        self._board = None
+
+    def _update_from_source(self, source_data):
+        super(Card, self)._update_from_source(source_data)
+        if 'labels' in source_data:
+            self._labels = [self.client.intern_label(label)
+                            for label in source_data['labels'] or []]
 
     @property
     def id(self):
@@ -37,16 +72,16 @@ class Card(TrelloObject):
 
     @property
     def name(self):
+        self._ensure_loaded('name')
         return self._name
 
     @name.setter
     def name(self, value):
-        response = self.put(['cards', self.id], params={'name': value})
-        if response['name'] == value:
-            self._name = value
+        self._write({'name': value})
 
     @property
     def closed(self):
+        self._ensure_loaded('closed')
         return self._closed
 
     @closed.setter
@@ -67,20 +102,42 @@ class Card(TrelloObject):
 
     @property
     def desc(self):
+        self._ensure_loaded('desc')
         return self._desc
 
     @desc.setter
     def desc(self, value):
-        response = self.put(['cards', self.id], params={'desc': value})
-        if response['desc'] == value:
-            self._desc = value
+        self._write({'desc': value})
+
+    @property
+    def due(self):
+        """Due date as an ISO 8601 string, or None."""
+        self._ensure_loaded('due')
+        return self._due
+
+    @property
+    def date_last_activity(self):
+        self._ensure_loaded('dateLastActivity')
+        return self._date_last_activity
+
+    @property
+    def pos(self):
+        self._ensure_loaded('pos')
+        return self._pos
+
+    @property
+    def short_link(self):
+        self._ensure_loaded('shortLink')
+        return self._short_link
 
     @property
     def id_board(self):
+        self._ensure_loaded('idBoard')
         return self._id_board
 
     @property
     def id_list(self):
+        self._ensure_loaded('idList')
         return self._id_list
 
     @id_list.setter
@@ -89,12 +146,37 @@ class Card(TrelloObject):
 
     @property
     def id_labels(self):
+        self._ensure_loaded('idLabels')
         return self._id_labels
 
     @property
     def labels(self):
+        self._ensure_loaded('labels')
         return self._labels
 
+    @property
+    def checklists(self):
+        """Checklists on the card, as dicts returned by the API."""
+        if self._checklists is None:
+            self._checklists = self.get(['cards', self.id, 'checklists'])
+        return self._checklists
+
+    @property
+    def list(self):
+        """The <List> this card is in."""
+        self._ensure_loaded('idList')
+        if self._list is None or self._list.id != self._id_list:
+            self._list = self.client.get_list(self._id_list)
+        return self._list
+
+    @property
+    def board(self):
+        """The <Board> this card is on."""
+        self._ensure_loaded('idBoard')
+        if self._board is None or self._board.id != self._id_board:
+            self._board = self.client.get_board(self._id_board)
+        return self._board
+
     @property
     def id_members(self):
         raise NotImplementedError
@@ -105,21 +187,13 @@ class Card(TrelloObject):
             self._comments.append(new_comment)
 
     def archive(self):
-        response = self.put(['cards', self.id], params={'closed': 'true'})
-        if response['closed'] is True:
-            self._closed = True
+        self._write({'closed': 'true'})
 
     def unarchive(self):
-        response = self.put(['cards', self.id], params={'closed': 'false'})
-        if response['closed'] is False:
-            self._closed = False
+        self._write({'closed': 'false'})
 
     def move_to_list(self, list_id):
-        response = self.put(['cards', self.id],
-                            params={'idList': list_id})
-        if response['idList'] == list_id:
-            self._id_list = list_id
-            self.id_board = response['idBoard']
+        self._write({'idList': list_id})
 
     def __repr__(self):
-        return('<simpletrello.cardobject.Card ({}, {})>'.format(self.name, self.id))
+        return('<simpletrello.cardobject.Card ({}, {})>'.format(self._name, self.id))
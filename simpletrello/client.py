@@ -6,24 +6,191 @@ from __future__ import print_function, unicode_literals
 import logging
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from simpletrello.batch import Batch
 from simpletrello.boardobject import Board
+from simpletrello.bulk import bulk_create_cards, bulk_update_cards
+from simpletrello.cache import ResponseCache, ValidatorStore
 from simpletrello.cardobject import Card
 from simpletrello.commentobject import Comment
+from simpletrello.decoding import STREAM_CHUNK_SIZE, get_decoder, iter_json_array
 from simpletrello.exceptions import AuthenticationError, RateLimitExceeded
+from simpletrello.export import export_workspace
+from simpletrello.fanout import DEFAULT_MAX_WORKERS, imap_bounded
+from simpletrello.identitymap import IdentityMap
 from simpletrello.labelobject import Label
 from simpletrello.listobject import List
+from simpletrello.lookup import NameIndex
+from simpletrello.metrics import RequestRecord, clock, find_caller, template_path
+from simpletrello.ratelimit import RateLimiter
+from simpletrello.snapshot import SNAPSHOT_PARAMS, hydrate_board
+from simpletrello.trace import DEFAULT_THRESHOLD, Tracer
 from simpletrello.utils import listify, combine_values, is_stringy
 
 API_VERSION = '1'
 TRELLO_URL = 'https://api.trello.com/{}'.format(API_VERSION)
 logger = logging.getLogger(__name__)
 
+# Connection pool defaults. Every Board/List/Card/etc. created from a client
+# issues its requests through that client, so they all share one pool.
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+DEFAULT_RATE_LIMIT_RETRIES = 5
+
+# Trello returns at most 1000 items per page of actions, cards or search results.
+PAGE_LIMIT = 1000
+
+# Seconds before a name missing from board_directory() may reload it again.
+DIRECTORY_REFRESH_INTERVAL = 60
+
+# First path part of each model -> its class.
+MODELS_BY_PATH = dict((cls._api_path, cls) for cls in (Board, List, Card, Label))
+
+
+def _retry_after(response):
+    """Return the Retry-After header of <response> in seconds, if usable."""
+    try:
+        return float(response.headers['Retry-After'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
 
 class TrelloClient():
 
-    def __init__(self, api_key=None, token=None):
+    def __init__(
+            self,
+            api_key=None,
+            token=None,
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+            max_retries=DEFAULT_MAX_RETRIES,
+            timeout=None,
+            session=None,
+            rate_limit=True,
+            max_rate_limit_retries=DEFAULT_RATE_LIMIT_RETRIES,
+            base_url=TRELLO_URL,
+            cache=None,
+            keep_source_data=True,
+            default_fields=None,
+            json_decoder='auto'):
+        """Params
+        ------
+        api_key, token: str
+            Trello credentials. Fall back to environment variables if not passed.
+
+        pool_connections: int
+            Number of host connection pools to cache.
+
+        pool_maxsize: int
+            Maximum number of keep-alive connections kept per host.
+
+        max_retries: int
+            Retries for connection errors and 5xx responses on idempotent methods.
+
+        timeout: float | tuple
+            Passed through to requests for every call. None means no timeout.
+
+        session: requests.Session
+            Use an existing session instead of building one. The client will not
+            mount adapters on it, and will not close it.
+
+        rate_limit: bool | simpletrello.ratelimit.RateLimiter
+            Pace requests to stay under Trello's per key and per token limits.
+            Pass False to disable, or a RateLimiter to customize.
+
+        max_rate_limit_retries: int
+            How many times to back off and resend after a 429 before raising
+            RateLimitExceeded.
+
+        base_url: str
+            Root of the API, e.g. to point the client at a local stand-in server.
+
+        cache: bool | simpletrello.cache.ResponseCache
+            Cache GET responses. Pass True for the defaults, or a ResponseCache
+            to choose TTLs and size limits. Off by default.
+
+        keep_source_data: bool
+            Keep the raw API dict on each object as <source_data>. Pass False to
+            save memory when holding many objects.
+
+        default_fields: dict
+            Fields to request by default for 'boards', 'lists' and 'cards', e.g.
+            {'cards': ['name', 'idList', 'idLabels']}. Other fields are loaded
+            on first access. See _projection().
+
+        json_decoder: str | callable
+            'auto' (the default) decodes responses with orjson or ujson if
+            installed, else the standard library. Pass 'json', 'orjson' or
+            'ujson' to choose, or a callable taking the body as bytes.
+        """
         self.set_credentials(api_key=api_key, token=token)
+        self.keep_source_data = keep_source_data
+        self.default_fields = dict(default_fields or {})
+        self.json_decoder, self._loads = get_decoder(json_decoder)
+        self.identity_map = IdentityMap()
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        if rate_limit is True:
+            self.rate_limiter = RateLimiter(self._api_key, self._token)
+        elif rate_limit:
+            self.rate_limiter = rate_limit
+        else:
+            self.rate_limiter = None
+        self.max_rate_limit_retries = max_rate_limit_retries
+        if cache is True:
+            self.cache = ResponseCache()
+        elif cache:
+            self.cache = cache
+        else:
+            self.cache = None
+        self.validators = ValidatorStore()
+        self._listeners = []
+        self._request_hooks = []
+        self._tracers = []
+        self._board_directory = None
+        self._board_directory_loaded = None
+        if session is None:
+            self.session = self._create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries)
+            self._owns_session = True
+        else:
+            self.session = session
+            self._owns_session = False
+
+    @staticmethod
+    def _create_session(pool_connections, pool_maxsize, max_retries):
+        """Return a <requests.Session> with a keep-alive pool and retry adapter."""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=DEFAULT_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            raise_on_status=False)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """Release pooled connections. Only closes a session the client created."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def set_credentials(self, api_key, token):
         if api_key is not None:
@@ -42,11 +209,164 @@ class TrelloClient():
                 raise AuthenticationError('No token param or SIMPLETRELLO_TOKEN found.')
 
     def define_url(self, path_parts):
-        path_parts = listify(path_parts)
-        path_parts.insert(0, TRELLO_URL)
+        path_parts = [self.base_url] + listify(path_parts)
         url = '/'.join(path_parts)
         return url
 
+    def _hydrate(self, cls, source_data, fields=None, **kwargs):
+        """Return the one live <cls> object for <source_data>, updating it if it
+        already exists. All model objects built by the client come from here.
+
+        <fields> is the projection <source_data> was requested with, from
+        _projection(), so fields left out can be loaded later. None or 'all'
+        means <source_data> is a full record.
+        """
+        obj, new = self.identity_map.hydrate(self, cls, source_data, **kwargs)
+        obj._set_loaded(None if fields in (None, 'all') else fields, new=new)
+        if new:
+            self._notify('loaded', obj)
+        return obj
+
+    def _projection(self, kind, fields=None):
+        """Return the fields to request for <kind> ('boards', 'lists' or 'cards'):
+        <fields> if given, else default_fields[kind], as a list, or 'all'.
+
+        Objects built from a projected response load the other fields in one
+        request, the first time one of them is read.
+        """
+        if fields is None:
+            fields = self.default_fields.get(kind)
+        if fields is None or fields == 'all':
+            return 'all'
+        if is_stringy(fields):
+            fields = fields.split(',')
+        return list(fields)
+
+    def intern_label(self, source_data):
+        """Return the shared <Label> for <source_data>, creating it on first sight.
+        Cards embed their labels, so this keeps one Label per label id instead of
+        one per card.
+        """
+        return self._hydrate(Label, source_data)
+
+    ### CHANGE EVENTS
+
+    def add_listener(self, listener):
+        """Call listener(event, obj) whenever a model object changes.
+
+        <event> is 'loaded' for a new object, 'updated' when an object's fields
+        change (from a response, a setter or a sync), and 'removed' when it is
+        deleted, or removed from its board by a sync.
+        """
+        # Copy on write, so _notify() can iterate without a lock.
+        self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener):
+        self._listeners = [fn for fn in self._listeners if fn != listener]
+
+    def _notify(self, event, obj):
+        self._update_lookups(event, obj)
+        for listener in self._listeners:
+            listener(event, obj)
+
+    def _update_lookups(self, event, obj):
+        """Keep the board name directory and the boards' lookup tables current."""
+        if isinstance(obj, Board):
+            directory = self._board_directory
+            if directory is not None:
+                if event == 'removed':
+                    directory.discard(obj)
+                else:
+                    directory.add(obj)
+        elif isinstance(obj, (List, Card, Label)) and obj._id_board is not None:
+            # Private fields, so projected objects are not loaded by this.
+            board = self.identity_map.get(Board, obj._id_board)
+            if board is not None:
+                board._lookups = None
+
+    def _attach_created(self, obj):
+        """Add a just created <List> or <Card> to the loaded collections of its
+        board and list, if they are live, so lookups see it without a refetch.
+        """
+        board = self.identity_map.get(Board, obj._id_board)
+        parents = []
+        if isinstance(obj, List) and board is not None:
+            parents.append(board._lists)
+        elif isinstance(obj, Card):
+            board_list = self.identity_map.get(List, obj._id_list)
+            if board is not None:
+                parents.append(board._cards)
+            if board_list is not None:
+                parents.append(board_list._cards)
+        for objects in parents:
+            if objects is not None and obj not in objects:
+                objects.append(obj)
+        if board is not None:
+            board._lookups = None
+
+    ### REQUEST HOOKS
+
+    def add_request_hook(self, hook):
+        """Call hook(record) after every request, with a
+        simpletrello.metrics.RequestRecord, e.g. a MetricsAggregator.
+        """
+        self._request_hooks = self._request_hooks + [hook]
+
+    def remove_request_hook(self, hook):
+        self._request_hooks = [fn for fn in self._request_hooks if fn != hook]
+
+    def _emit_request(self, method, path_parts, started, response=None, retries=0, error=None,
+                      stream=False):
+        hooks = self._request_hooks
+        if not hooks:
+            return
+        caller, via, lazy = find_caller()
+        size = None
+        if response is not None:
+            size = response.headers.get('Content-Length')
+            if size is not None:
+                size = int(size)
+            elif not stream:
+                # A streamed body is not read yet, and its size not known.
+                size = len(response.content)
+        record = RequestRecord(
+            method=method,
+            path=template_path(path_parts),
+            status=response.status_code if response is not None else None,
+            latency=clock() - started,
+            bytes=size,
+            retries=retries,
+            caller=caller,
+            via=via,
+            lazy=lazy,
+            error=error)
+        for hook in hooks:
+            hook(record)
+
+    ### TRACING
+
+    def trace(self, strict=False, threshold=DEFAULT_THRESHOLD, report=True):
+        """Return a <Tracer> context recording implicit fetches, the requests
+        model properties such as List.cards or Card.comments make on first
+        access, and reporting N+1 patterns among them. See simpletrello.trace.
+
+        >>> with trello.trace(strict=True):
+        ...     board.lists[0].cards   # raises ImplicitFetchError
+        """
+        return Tracer(self, strict=strict, threshold=threshold, report=report)
+
+    def _add_tracer(self, tracer):
+        self._tracers = self._tracers + [tracer]
+
+    def _remove_tracer(self, tracer):
+        self._tracers = [other for other in self._tracers if other is not tracer]
+
+    def _trace_request(self, method, path_parts):
+        caller, via, lazy = find_caller()
+        path = template_path(path_parts)
+        for tracer in self._tracers:
+            tracer.on_request(method, path, caller, via, lazy)
+
     ### HTTP METHODS ###
 
     def _http_request(
@@ -54,7 +374,9 @@ class TrelloClient():
             method,
             path_parts,
             as_json=True,
-            params=None):
+            params=None,
+            headers=None,
+            stream=False):
         """Make http request to Trello API.
 
         Params
@@ -66,6 +388,13 @@ class TrelloClient():
 
         as_json: bool
 
+        headers: dict
+            Extra request headers.
+
+        stream: bool
+            Return before the body is downloaded, see _stream_get(). Implies
+            as_json=False.
+
         Returns
         -------
         response: JSON by default
@@ -78,40 +407,119 @@ class TrelloClient():
         url = self.define_url(path_parts)
         payload = {'key': self._api_key, 'token': self._token}
         payload.update(params)
-        if method == 'get':
-            response = requests.get(url, params=payload)
-        elif method == 'post':
-            response = requests.post(url, params=payload)
-        elif method == 'put':
-            response = requests.put(url, params=payload)
-        elif method == 'delete':
-            response = requests.delete(url, params=payload)
+        assert method in ('get', 'post', 'put', 'delete')
+        if self._tracers:
+            self._trace_request(method, path_parts)
+        attempt = 0
+        started = clock()
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.request(
+                    method, url, params=payload, headers=headers, timeout=self.timeout,
+                    stream=stream)
+            except Exception as error:
+                self._emit_request(method, path_parts, started, retries=attempt, error=error)
+                raise
+            # Trello API returns 429 for rate limit exceeded.
+            if response.status_code != 429:
+                break
+            if self.rate_limiter is None or attempt >= self.max_rate_limit_retries:
+                error = RateLimitExceeded()
+                self._emit_request(method, path_parts, started, response, attempt, error)
+                raise error
+            self.rate_limiter.backoff(attempt, _retry_after(response))
+            attempt += 1
 
         # Check for response errors before returning anything
         if response.ok is False:
-            if response.status_code == 429:
-                # Trello API returns 429 for rate limit exceeded.
-                raise RateLimitExceeded
             # All other status errors
             log_text = 'Status code {}: {} on URL {}'.format(
                 response.status_code, response.text, response.url)
             logger.error(log_text)
-            response.raise_for_status()
+            try:
+                response.raise_for_status()
+            except Exception as error:
+                self._emit_request(method, path_parts, started, response, attempt, error)
+                raise
+        self._emit_request(method, path_parts, started, response, attempt, stream=stream)
 
-        if as_json is True:
-            _json = response.json()
+        if as_json is True and not stream:
+            _json = self._decode(response)
             return _json
         else:
             return response
 
-    def _get(self, path_parts, as_json=True, params=None):
-        """Perform a GET request against Trello API."""
+    def _get(self, path_parts, as_json=True, params=None, conditional=False):
+        """Perform a GET request against Trello API.
+        JSON responses are served from and stored in the cache, if enabled.
+
+        With <conditional>, the cache is bypassed and the request carries the
+        ETag / Last-Modified validators of the previous response, if any.
+        A 304 returns the previously decoded body.
+        """
+        if conditional and as_json is True:
+            return self._conditional_get(path_parts, params)
+        if self.cache is None or as_json is not True:
+            return self._http_request(
+                method='get',
+                path_parts=path_parts,
+                as_json=as_json,
+                params=params)
+        hit, value = self.cache.get(path_parts, params)
+        if hit:
+            return value
         response = self._http_request(
             method='get',
             path_parts=path_parts,
-            as_json=as_json,
+            as_json=False,
             params=params)
-        return response
+        value = self._decode(response)
+        self.cache.set(path_parts, params, value, len(response.content))
+        return value
+
+    def _conditional_get(self, path_parts, params):
+        headers = self.validators.headers(path_parts, params)
+        response = self._http_request(
+            method='get',
+            path_parts=path_parts,
+            as_json=False,
+            params=params,
+            headers=headers)
+        if response.status_code == 304:
+            found, body = self.validators.body(path_parts, params)
+            if found:
+                return body
+            response = self._http_request(
+                method='get',
+                path_parts=path_parts,
+                as_json=False,
+                params=params)
+        value = self._decode(response)
+        self.validators.set(path_parts, params, response.headers, value, len(response.content))
+        if self.cache is not None:
+            self.cache.set(path_parts, params, value, len(response.content))
+        return value
+
+    def _decode(self, response):
+        return self._loads(response.content)
+
+    def _stream_get(self, path_parts, params=None):
+        """Yield the elements of a JSON array response as they are downloaded,
+        so neither the whole body nor the whole decoded list is held at once.
+        Bypasses the cache.
+        """
+        response = self._http_request(
+            method='get',
+            path_parts=path_parts,
+            params=params,
+            stream=True)
+        try:
+            for item in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE)):
+                yield item
+        finally:
+            response.close()
 
     def _post(self, path_parts, as_json=True, params=None):
         response = self._http_request(
@@ -119,6 +527,7 @@ class TrelloClient():
             path_parts=path_parts,
             as_json=as_json,
             params=params)
+        self._invalidate_cache(path_parts, params, response)
         return response
 
     def _put(self, path_parts, as_json=True, params=None):
@@ -128,6 +537,7 @@ class TrelloClient():
             path_parts=path_parts,
             as_json=as_json,
             params=params)
+        self._invalidate_cache(path_parts, params, response)
         return response
 
     def _delete(self, path_parts, as_json=True, params=None):
@@ -137,27 +547,133 @@ class TrelloClient():
             path_parts=path_parts,
             as_json=as_json,
             params=params)
+        self._invalidate_cache(path_parts, params, response)
         assert response['_value'] is None
         return response
 
+    def _invalidate_cache(self, path_parts, params, response):
+        if self.cache is not None:
+            body = response if isinstance(response, dict) else None
+            self.cache.invalidate(path_parts, params, body, self._previous_ids(path_parts))
+
+    def _previous_ids(self, path_parts):
+        """Ids the live object at <path_parts> still holds from before a write to
+        it, e.g. the list of a card just moved away from it.
+        """
+        path_parts = listify(path_parts)
+        cls = MODELS_BY_PATH.get(path_parts[0])
+        obj = self.identity_map.get(cls, path_parts[1]) if len(path_parts) > 1 else None
+        if obj is None:
+            return set()
+        return set(getattr(obj, attr) for name, attr in obj._source_fields.items()
+                   if name.startswith('id') and is_stringy(getattr(obj, attr)))
+
+    ### BATCH ###
+
+    def batch(self):
+        """Return a Batch that coalesces GETs into /batch calls of up to 10 urls.
+
+        >>> with trello.batch() as batch:
+        ...     board = batch.get(['boards', board_id])
+        ...     lists = batch.get(['boards', board_id, 'lists'])
+        >>> board.result['name']
+        """
+        return Batch(self)
+
+    def batch_get(self, requests_to_send, raise_errors=True):
+        """Perform several GET requests through /batch.
+
+        Params
+        ------
+        requests_to_send: list
+            Each item is path_parts, or a (path_parts, params) tuple.
+
+        raise_errors: bool
+            If False, a failed request puts its BatchRequestError in the results
+            instead of raising.
+
+        Returns
+        -------
+        results: list
+            Decoded bodies, in the same order as <requests_to_send>.
+        """
+        with self.batch() as batch:
+            items = []
+            for request in requests_to_send:
+                if isinstance(request, tuple):
+                    items.append(batch.get(*request))
+                else:
+                    items.append(batch.get(request))
+        if raise_errors:
+            return [item.result for item in items]
+        return [item.error if item.error else item.result for item in items]
+
+    ### PARALLEL FAN-OUT ###
+
+    def fetch_many(self, items, fn, max_workers=DEFAULT_MAX_WORKERS):
+        """Run fn(item) for every item on a bounded pool of threads.
+
+        The workers share this client, so its connection pool, rate limiter,
+        cache and identity map. Size pool_maxsize to at least <max_workers>.
+
+        >>> results = trello.fetch_many(card_ids, trello.get_card_comments)
+        >>> [r.value for r in results if r.ok]
+
+        Returns
+        -------
+        results: list of simpletrello.fanout.ItemResult
+            (item, value, error), in the order of <items>. A failing item has
+            its exception in <error> and does not stop the others.
+        """
+        return list(imap_bounded(fn, items, max_workers=max_workers))
+
+    def map_get(self, requests_to_send, max_workers=DEFAULT_MAX_WORKERS):
+        """Perform many GETs in parallel, see fetch_many().
+
+        Params
+        ------
+        requests_to_send: list
+            Each item is path_parts, or a (path_parts, params) tuple.
+        """
+        def get(request):
+            if isinstance(request, tuple):
+                path_parts, params = request
+                return self._get(path_parts, params=params)
+            return self._get(request)
+        return self.fetch_many(requests_to_send, get, max_workers=max_workers)
+
     def get_all_boards(self):
         """Return a list of Board objects."""
         response = self._get(['members', 'me', 'boards'], as_json=True)
         boards = []
         for board_json in response:
-            boards.append(Board(self, board_json))
+            boards.append(self._hydrate(Board, board_json))
         return boards
 
+    def board_directory(self, refresh=False):
+        """Return a <NameIndex> of your boards by id and by name.
+
+        Built from get_all_boards() on first use, then kept current as boards
+        are loaded, created, renamed, archived or deleted through the client.
+        """
+        if refresh or self._board_directory is None:
+            boards = self.get_all_boards()
+            self._board_directory = NameIndex(boards)
+            self._board_directory_loaded = clock()
+        return self._board_directory
+
     def get_board_by_name(self, board_name, partial=False):
         """Return a single board instance. Expect exactly one board to have <board_name>.
         If no boards or multiple boards have <board_name>, raise a ValueError.
-        Case insensitive.
+        Case insensitive. Archived boards are ignored.
+
+        Names are looked up in board_directory(). On a miss, the directory is
+        reloaded, in case the board was created elsewhere, unless it was loaded
+        less than DIRECTORY_REFRESH_INTERVAL seconds ago.
         """
-        boards = self.search_boards_by_name(board_name)
-        matches = []
-        for board in boards:
-            if board.name.lower().strip() == board_name.lower().strip():
-                matches.append(board)
+        matches = self.board_directory().find(board_name)
+        if not matches and clock() - self._board_directory_loaded >= DIRECTORY_REFRESH_INTERVAL:
+            matches = self.board_directory(refresh=True).find(board_name)
         if len(matches) == 0:
             raise ValueError('No boards with matching name.')
         if len(matches) > 1:
@@ -166,68 +682,132 @@ class TrelloClient():
 
     def search_boards_by_name(self, name_to_search):
         result = self.search(name_to_search, model_types='boards')
-        boards = [Board(self, info) for info in result['boards']]
+        boards = [self._hydrate(Board, info) for info in result['boards']]
         return boards
 
-    def get_board(self, board_id, fields=None, raw=False):
-        # if fields:
-        #     params = {'fields': combine_values(fields)}
+    def get_board(self, board_id, fields=None, raw=False, conditional=False):
+        """Return a <Board>, or the API's dict with <raw>.
+        <fields> defaults to default_fields['boards'], see _projection().
+        <conditional> sends a conditional request, see _get().
+        """
         params = {'labels': 'all'}
-        if fields:
-            params['fields'] = combine_values(fields)
-        response = self._get(['boards', board_id], params=params)
+        projection = self._projection('boards', fields)
+        if fields or projection != 'all':
+            params['fields'] = combine_values(projection)
+        response = self._get(['boards', board_id], params=params, conditional=conditional)
         if raw:
             # Return a dict of data as returned by API
             return response
-        board = Board(self, source_data=response)
+        board = self._hydrate(Board, response, fields=projection)
         return board
 
-    def get_board_lists(self, board_id, with_cards=False):
+    def load_board_snapshot(self, board_id):
+        """Return a <Board> with its lists, cards, labels, comments and checklists
+        all loaded from a single request.
+
+        Back-references (list.board, card.list, card.board, comment.card,
+        label.board) point at the objects in the same snapshot.
+        """
+        response = self._get(['boards', board_id], params=dict(SNAPSHOT_PARAMS))
+        return hydrate_board(self, response)
+
+    def get_board_lists(self, board_id, with_cards=False, fields=None, card_fields=None):
         """Return a list of <List>s from <board_id>.
         Each <List> is an instance of listobject.List
+
+        With <with_cards>, the cards of every list are fetched through /batch,
+        10 lists per request.
+
+        <fields> and <card_fields> default to default_fields['lists'] and
+        ['cards'], see _projection().
         """
-        response = self._get(['board', board_id, 'lists'], params={'fields': 'all'})
-        board_lists = [List(self, source_data=list_source, with_cards=with_cards)
-                       for list_source in response]
+        fields = self._projection('lists', fields)
+        response = self._get(['board', board_id, 'lists'],
+                             params={'fields': combine_values(fields)})
+        board_lists = [self._hydrate(List, list_source, fields=fields) for list_source in response]
+        if with_cards:
+            cards_by_list = self.get_cards_by_lists(
+                [board_list.id for board_list in board_lists], fields=card_fields)
+            for board_list in board_lists:
+                board_list._cards = cards_by_list[board_list.id]
         return board_lists
 
-    def get_list(self, list_id, fields='all', raw=False):
-        params = {'fields': combine_values(fields)} if fields else None
-        response = self._get(['lists', list_id], params=params)
+    def get_list(self, list_id, fields=None, raw=False, conditional=False):
+        """<fields> defaults to default_fields['lists'], see _projection()."""
+        fields = self._projection('lists', fields)
+        params = {'fields': combine_values(fields)}
+        response = self._get(['lists', list_id], params=params, conditional=conditional)
 
         if raw:
             # Return a dict of data as returned by API
             return response
-        return List(self, source_data=response)
+        return self._hydrate(List, response, fields=fields)
+
+    def _card_params(self, fields):
+        """Params for a card request with <fields> from _projection()."""
+        return None if fields == 'all' else {'fields': combine_values(fields)}
 
-    def get_card(self, card_id):
-        response = self._get(['cards', card_id])
-        return Card(self, source_data=response)
+    def get_card(self, card_id, fields=None):
+        """<fields> defaults to default_fields['cards'], see _projection()."""
+        fields = self._projection('cards', fields)
+        response = self._get(['cards', card_id], params=self._card_params(fields))
+        return self._hydrate(Card, response, fields=fields)
 
-    def get_cards(self, board_id=None, list_id=None):
+    def get_cards(self, board_id=None, list_id=None, fields=None):
+        fields = self._projection('cards', fields)
+        params = self._card_params(fields)
         if board_id:
             if list_id:
                 raise ValueError('Pass only one of board_id or list_id')
-            response = self._get(['boards', board_id, 'cards'])
+            response = self._get(['boards', board_id, 'cards'], params=params)
         elif list_id:
-            response = self._get(['lists', list_id, 'cards'])
+            response = self._get(['lists', list_id, 'cards'], params=params)
         else:
             raise ValueError('Pass either board_id or list_id.')
-        cards = [Card(self, card_source) for card_source in response]
+        cards = [self._hydrate(Card, card_source, fields=fields) for card_source in response]
         return cards
 
-    def get_cards_by_board(self, board_id):
-        response = self._get(['boards', board_id, 'cards'])
-        return [Card(self, card_source) for card_source in response]
+    def get_cards_by_board(self, board_id, fields=None, stream=False):
+        """With <stream>, cards are built as the response downloads, see _stream_get()."""
+        fields = self._projection('cards', fields)
+        path_parts = ['boards', board_id, 'cards']
+        if stream:
+            response = self._stream_get(path_parts, params=self._card_params(fields))
+        else:
+            response = self._get(path_parts, params=self._card_params(fields))
+        return [self._hydrate(Card, card_source, fields=fields) for card_source in response]
+
+    def get_cards_by_lists(self, list_ids, fields=None):
+        """Return a dict of {list_id: [<Card>, ...]}, fetched through /batch."""
+        fields = self._projection('cards', fields)
+
+        def make_cards(response):
+            return [self._hydrate(Card, card_source, fields=fields) for card_source in response]
+        with self.batch() as batch:
+            items = [batch.get(['lists', list_id, 'cards'], params=self._card_params(fields),
+                               factory=make_cards)
+                     for list_id in list_ids]
+        return dict((list_id, item.result) for list_id, item in zip(list_ids, items))
+
+    def get_comments_by_cards(self, card_ids):
+        """Return a dict of {card_id: [<Comment>, ...]}, fetched through /batch."""
+        def make_comments(response):
+            return [self._hydrate(Comment, comment_source) for comment_source in response]
+        params = {'filter': 'commentCard'}
+        with self.batch() as batch:
+            items = [batch.get(['cards', card_id, 'actions'], params=params,
+                               factory=make_comments)
+                     for card_id in card_ids]
+        return dict((card_id, item.result) for card_id, item in zip(card_ids, items))
 
     def get_card_comments(self, card_id):
         params = {'filter': 'commentCard'}
         response = self._get(['cards', card_id, 'actions'], params=params)
-        return [Comment(self, comment_source) for comment_source in response]
+        return [self._hydrate(Comment, comment_source) for comment_source in response]
 
     def get_comment_by_id(self, comment_id):
         response = self._get(['actions', comment_id])
-        return Comment(self, response)
+        return self._hydrate(Comment, response)
 
     def get_label(self, label_id):
         raise NotImplementedError
@@ -235,12 +815,145 @@ class TrelloClient():
     def get_board_labels(self, board_id):
         params = {'fields': 'id', 'labels': 'all'}
         response = self._get(['boards', board_id], params=params)
-        labels = [Label(self, label_source) for label_source in response['labels']]
+        labels = [self.intern_label(label_source) for label_source in response['labels']]
         return labels
 
     def get_card_labels(self, card_id):
         pass
 
+    ### PAGINATION
+
+    def _paginate(self, path_parts, params=None, page_size=PAGE_LIMIT, stream=False,
+                  conditional=False):
+        """Yield the items of a collection, one page at a time.
+
+        Pages are requested with limit=<page_size>, then before=<oldest id seen>,
+        until a short page comes back. Trello ids start with a timestamp, so the
+        oldest item of a page has the smallest id whatever order it is sorted in.
+
+        With <stream>, items are yielded while each page downloads.
+        With <conditional>, pages are conditional requests, see _get().
+        """
+        params = dict(params or {})
+        params['limit'] = page_size
+        while True:
+            if stream:
+                page = self._stream_get(path_parts, params=params)
+            else:
+                page = self._get(path_parts, params=params, conditional=conditional)
+            count = 0
+            oldest = None
+            for item in page:
+                count += 1
+                if oldest is None or item['id'] < oldest:
+                    oldest = item['id']
+                yield item
+            if count < page_size:
+                return
+            params['before'] = oldest
+
+    def iter_actions(self, board_id=None, card_id=None, list_id=None, filter=None,
+                     since=None, page_size=PAGE_LIMIT, stream=False, conditional=False):
+        """Yield action dicts for a board, card or list, newest first,
+        paging transparently. Pass exactly one of the ids.
+
+        Params
+        ------
+        filter: str | list
+            Action types, e.g. 'commentCard' or ['createCard', 'updateCard'].
+
+        since: str
+            Only yield actions newer than this action id or date.
+
+        stream: bool
+            Decode each page as it downloads instead of all at once, which
+            keeps memory flat for large pages. Bypasses the cache.
+
+        conditional: bool
+            Send conditional requests instead of reading the cache, so a
+            polled feed is never stale. See _get().
+        """
+        ids = [('boards', board_id), ('cards', card_id), ('lists', list_id)]
+        ids = [(model, model_id) for model, model_id in ids if model_id]
+        if len(ids) != 1:
+            raise ValueError('Pass exactly one of board_id, card_id or list_id.')
+        params = {}
+        if filter:
+            params['filter'] = combine_values(filter)
+        if since:
+            params['since'] = since
+        model, model_id = ids[0]
+        return self._paginate([model, model_id, 'actions'], params=params, page_size=page_size,
+                              stream=stream, conditional=conditional)
+
+    def iter_comments(self, card_id=None, board_id=None, page_size=PAGE_LIMIT, stream=False):
+        """Yield the <Comment>s on a card, or on every card of a board, newest first.
+        For <stream>, see iter_actions().
+        """
+        actions = self.iter_actions(board_id=board_id, card_id=card_id,
+                                    filter='commentCard', page_size=page_size, stream=stream)
+        for action in actions:
+            yield self._hydrate(Comment, action)
+
+    def iter_cards(self, board_id=None, list_id=None, filter='open', page_size=PAGE_LIMIT,
+                   fields=None, stream=False):
+        """Yield the <Card>s of a board or list, paging transparently.
+
+        Params
+        ------
+        filter: str
+            'open' (the default, as for get_cards), 'closed' or 'all'.
+
+        fields: list
+            Defaults to default_fields['cards'], see _projection().
+
+        stream: bool
+            See iter_actions().
+        """
+        if board_id and list_id:
+            raise ValueError('Pass only one of board_id or list_id')
+        if board_id:
+            path_parts = ['boards', board_id, 'cards']
+        elif list_id:
+            path_parts = ['lists', list_id, 'cards']
+        else:
+            raise ValueError('Pass either board_id or list_id.')
+        fields = self._projection('cards', fields)
+        params = dict(self._card_params(fields) or {}, filter=filter)
+        cards = self._paginate(path_parts, params=params, page_size=page_size, stream=stream)
+        for card_source in cards:
+            yield self._hydrate(Card, card_source, fields=fields)
+
+    def iter_search(self, query, model_type='cards', page_size=PAGE_LIMIT, max_pages=None):
+        """Yield search results as objects, paging transparently.
+
+        Params
+        ------
+        model_type: str
+            'cards' pages with cards_page. 'boards' is a single page, as the
+            API does not page board results.
+
+        max_pages: int
+            Stop after this many pages of cards.
+        """
+        if model_type == 'boards':
+            params = {'query': query, 'modelTypes': 'boards', 'boards_limit': page_size}
+            for board_source in self._get(['search'], params=params)['boards']:
+                yield self._hydrate(Board, board_source)
+            return
+        if model_type != 'cards':
+            raise ValueError('iter_search supports model_type cards or boards.')
+        page = 0
+        while max_pages is None or page < max_pages:
+            params = {'query': query, 'modelTypes': 'cards',
+                      'cards_limit': page_size, 'cards_page': page}
+            cards = self._get(['search'], params=params)['cards']
+            for card_source in cards:
+                yield self._hydrate(Card, card_source)
+            if len(cards) < page_size:
+                return
+            page += 1
+
     ### CREATE NEW ITEMS
 
     def create_board(self, params=None):
@@ -248,7 +961,7 @@ class TrelloClient():
             # Allow for a single string to be passed in , and use it as the board name.
             params = {'name': params}
         response = self._post(['boards'], params=params)
-        new_board = Board(self, response)
+        new_board = self._hydrate(Board, response)
         return new_board
 
     def create_list(self, list_name, id_board, pos='bottom', list_id_to_copy=None):
@@ -260,7 +973,11 @@ class TrelloClient():
         if list_id_to_copy:
             params['idListSource'] = list_id_to_copy
         response = self._post(['lists'], params=params)
-        new_list = List(self, response)
+        new_list = self._hydrate(List, response)
+        if not list_id_to_copy:
+            # A new list is empty, so its cards are known without a request.
+            new_list._cards = []
+        self._attach_created(new_list)
         return new_list
 
     def create_card(self, card_name, id_list, desc=None, pos='bottom', card_id_to_copy=None):
@@ -273,14 +990,15 @@ class TrelloClient():
         if card_id_to_copy:
             params['idCardSource'] = card_id_to_copy
         response = self._post(['cards'], params=params)
-        new_card = Card(self, response)
+        new_card = self._hydrate(Card, response)
+        self._attach_created(new_card)
         return new_card
 
     def create_comment(self, text, id_card):
         """Add new comment to card."""
         params = {'text': text}
         response = self._post(['cards', id_card, 'actions', 'comments'], params=params)
-        new_comment = Comment(self, response)
+        new_comment = self._hydrate(Comment, response)
         return new_comment
 
     def create_label(self, name, color, id_board):
@@ -296,9 +1014,85 @@ class TrelloClient():
         params = {'name': name, 'color': color, 'idBoard': id_board}
         response = self._post(['labels'], params=params)
         # TODO build Label object
-        new_label = Label(self, response)
+        new_label = self._hydrate(Label, response)
         return new_label
 
+    def bulk_create_cards(self, list_id, cards, max_workers=DEFAULT_MAX_WORKERS):
+        """Create many cards in <list_id>, several requests at a time.
+
+        Each create is retried as any client request is: 429s and connect
+        errors are, timeouts and 5xx responses are not, since the card may
+        exist. Those end up in report.failed, to check and resend.
+
+        Params
+        ------
+        cards: iterable
+            Card names, or dicts of card params such as
+            {'name': ..., 'desc': ..., 'idLabels': ...}. Read lazily, so a
+            generator over a large import file is fine. Cards without a
+            'pos' are placed after the list's last card, in input order.
+
+        Returns
+        -------
+        report: simpletrello.bulk.BulkReport
+            One ItemResult per input, in order, holding the new <Card> or the error.
+        """
+        return bulk_create_cards(self, list_id, cards, max_workers=max_workers)
+
+    def bulk_update_cards(self, updates, max_workers=DEFAULT_MAX_WORKERS):
+        """Update many cards, several requests at a time.
+
+        Updates are PUTs, so the client also retries them after 5xx
+        responses and read errors, up to <max_retries>.
+
+        Params
+        ------
+        updates: iterable
+            (card_id, params) tuples, or param dicts including 'id', e.g.
+            {'id': card_id, 'name': 'New name', 'idList': list_id}.
+
+        Returns
+        -------
+        report: simpletrello.bulk.BulkReport
+        """
+        return bulk_update_cards(self, updates, max_workers=max_workers)
+
+    ### EXPORT
+
+    def export_workspace(self, path, format='jsonl', compression=None, board_ids=None,
+                         resume=True, page_size=PAGE_LIMIT):
+        """Export your boards, with their labels, lists, cards and comments, to
+        the directory <path>: one file per kind and board, such as
+        path/cards/<board_id>.jsonl. Cards and comments are streamed page by
+        page, so memory use does not grow with the workspace.
+
+        Params
+        ------
+        format: str
+            'jsonl' writes each API record whole, one per line. 'csv' and
+            'parquet' write the columns in simpletrello.export.COLUMNS.
+            Parquet needs pyarrow.
+
+        compression: str
+            None or 'gzip' or 'bz2' for jsonl and csv. For parquet, a codec
+            such as 'zstd', defaulting to snappy.
+
+        board_ids: iterable
+            Only export these boards.
+
+        resume: bool
+            Skip boards a previous export to <path> completed, as listed in
+            its _manifest.jsonl. False exports everything again.
+
+        Returns
+        -------
+        report: simpletrello.export.ExportReport
+        """
+        if board_ids is not None:
+            board_ids = set(board_ids)
+        return export_workspace(self, path, format=format, compression=compression,
+                                board_ids=board_ids, resume=resume, page_size=page_size)
+
     ### DELETE ITEMS
 
     def delete_board(self, board_id):
@@ -308,8 +1102,34 @@ class TrelloClient():
         """
         response = self._delete(['boards', board_id])
         assert response['_value'] is None
+        board = self.identity_map.get(Board, board_id)
+        if board is not None:
+            self._notify('removed', board)
         return response
 
+    ### WEBHOOKS
+
+    def create_webhook(self, callback_url, id_model, description=None):
+        """Ask Trello to POST actions on <id_model> (a board, list or card id)
+        to <callback_url>. Trello sends a HEAD to the URL first, and only
+        creates the webhook if it answers 200. See simpletrello.webhooks.
+
+        Returns
+        -------
+        webhook: dict
+        """
+        params = {'callbackURL': callback_url, 'idModel': id_model}
+        if description is not None:
+            params['description'] = description
+        return self._post(['webhooks'], params=params)
+
+    def get_webhooks(self):
+        """Return the webhooks of the client's token, as dicts."""
+        return self._get(['tokens', self._token, 'webhooks'])
+
+    def delete_webhook(self, webhook_id):
+        return self._delete(['webhooks', webhook_id])
+
     ### SEARCH
 
     def search(self, query, model_types=None):
@@ -4,24 +4,37 @@
 from __future__ import print_function, unicode_literals
 
 from simpletrello.trelloobject import TrelloObject
+from simpletrello.utils import intern_ids
 
 
 class Comment(TrelloObject):
 
+    _api_path = 'actions'
+
+    __slots__ = ('_id', '_id_board', '_id_member_creator', '_id_card', '_id_list',
+                 '_text', '_date', '_card')
+
     def __init__(self, client, source_data=None):
         super(Comment, self).__init__(client, source_data)
+        self._card = None
         self.populate_from_source(source_data)
 
     def populate_from_source(self, source_data):
         _data = source_data.get('data')
         self._id = source_data.get('id')
-        self._id_board = _data.get('board', {}).get('id')
-        self._id_member_creator = source_data.get('idMemberCreator')
-        self._id_card = _data.get('card', {}).get('id')
-        self._id_list = _data.get('list', {}).get('id')
+        self._id_board = intern_ids(_data.get('board', {}).get('id'))
+        self._id_member_creator = intern_ids(source_data.get('idMemberCreator'))
+        self._id_card = intern_ids(_data.get('card', {}).get('id'))
+        self._id_list = intern_ids(_data.get('list', {}).get('id'))
         self._text = _data.get('text')
         self._date = source_data.get('date')
 
+    def _update_from_source(self, source_data):
+        if 'data' in source_data:
+            self.populate_from_source(source_data)
+            self._merge_source_data(source_data)
+            self._changed()
+
     @property
     def id(self):
         return self._id
@@ -34,9 +47,16 @@ class Comment(TrelloObject):
     def id_card(self):
         return self._id_card
 
+    @property
+    def card(self):
+        """The <Card> this comment is on."""
+        if self._card is None:
+            self._card = self.client.get_card(self._id_card)
+        return self._card
+
     @property
     def id_member_creator(self):
-        return self._id_creator
+        return self._id_member_creator
 
     @property
     def id_list(self):
@@ -58,7 +78,7 @@ class Comment(TrelloObject):
         response = self.put(['actions', self.id], params=params)
         if response['data']['text'] == value:
             # self._text = value
-            self.populate_from_source(response)
+            self._update_from_source(response)
 
     def __repr__(self):
         if len(self.text) > 10:
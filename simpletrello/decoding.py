@@ -0,0 +1,123 @@
+# coding: utf-8
+"""decoding.py"""
+
+from __future__ import print_function, unicode_literals
+
+import codecs
+import json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Tried in this order by get_decoder('auto').
+FAST_DECODERS = ('orjson', 'ujson')
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _json_loads(data):
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def get_decoder(decoder='auto'):
+    """Return (name, loads) for a JSON decoder taking bytes.
+
+    Params
+    ------
+    decoder: str | callable
+        'auto' picks the first of orjson and ujson that is installed, else
+        the standard library. 'json', 'orjson' or 'ujson' ask for one by name,
+        and a callable is used as is.
+    """
+    if callable(decoder):
+        return getattr(decoder, '__name__', 'custom'), decoder
+    if decoder == 'json':
+        return 'json', _json_loads
+    names = FAST_DECODERS if decoder == 'auto' else (decoder,)
+    for name in names:
+        try:
+            module = __import__(name)
+        except ImportError:
+            if decoder != 'auto':
+                raise
+            continue
+        return name, module.loads
+    return 'json', _json_loads
+
+
+class _ChunkReader(object):
+    """File-like view of an iterable of byte chunks, for ijson."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def iter_json_array(chunks):
+    """Yield the elements of a JSON array arriving as byte <chunks>, each as
+    soon as it is complete, so the whole body is never held at once.
+
+    Uses ijson if it is installed, else an incremental parser on the standard
+    library's raw_decode.
+    """
+    if ijson is not None:
+        return ijson.items(_ChunkReader(chunks), 'item', use_float=True)
+    return _iter_json_array(chunks)
+
+
+def _iter_json_array(chunks):
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    started = False
+    done = False
+    while True:
+        # Skip whitespace and separators up to the next element.
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError('Expected a JSON array.')
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                end = None
+            # An element ending with the buffer may be a cut off number.
+            if end is not None and (end < len(buffer) or done):
+                yield element
+                pos = end
+                continue
+            if done:
+                raise ValueError('Truncated JSON array.')
+        elif done:
+            raise ValueError('Truncated JSON array.')
+        chunk = next(chunks, None)
+        if chunk is None:
+            done = True
+            buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
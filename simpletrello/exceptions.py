@@ -9,6 +9,9 @@ class RateLimitExceeded(Exception):
     There is a limit of 300 requests per 10 seconds for each API key
     and no more than 100 requests per 10 second interval for each token.
     If a request exceeds the limit, Trello will return a 429 error.
+
+    TrelloClient paces requests and backs off on 429 by default, so this is only
+    raised once the client has run out of rate limit retries.
     """
     pass
 
@@ -16,3 +19,24 @@ class RateLimitExceeded(Exception):
 class AuthenticationError(Exception):
     """Raise when expected API credentials are not found."""
     pass
+
+
+class BatchRequestError(Exception):
+    """Raise when one GET inside a /batch call fails.
+    The other requests in the same batch are unaffected.
+    """
+    def __init__(self, message=None, status_code=None):
+        super(BatchRequestError, self).__init__(message)
+        self.status_code = status_code
+
+
+class ImplicitFetchError(Exception):
+    """Raise when a model property would make a request inside a strict
+    client.trace() block. Nothing has been sent when this is raised.
+    """
+    pass
+
+
+class CassetteMiss(Exception):
+    """Raise when a ReplayTransport has no recorded response for a request."""
+    pass
@@ -0,0 +1,278 @@
+# coding: utf-8
+"""export.py"""
+
+from __future__ import print_function, unicode_literals
+
+import bz2
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from simpletrello.utils import is_stringy
+
+FORMATS = ('jsonl', 'csv', 'parquet')
+TEXT_COMPRESSIONS = {None: '', 'gzip': '.gz', 'bz2': '.bz2'}
+
+MANIFEST = '_manifest.jsonl'
+PARTIAL_SUFFIX = '.partial'
+
+# Rows buffered per parquet row group.
+ROW_GROUP_SIZE = 10000
+
+# Columns written to csv and parquet, per kind: (name, type). jsonl keeps
+# the whole API record.
+COLUMNS = {
+    'boards': [('id', 'string'), ('name', 'string'), ('desc', 'string'), ('closed', 'bool'),
+               ('idOrganization', 'string'), ('url', 'string'),
+               ('dateLastActivity', 'string')],
+    'lists': [('id', 'string'), ('idBoard', 'string'), ('name', 'string'), ('closed', 'bool'),
+              ('pos', 'float')],
+    'labels': [('id', 'string'), ('idBoard', 'string'), ('name', 'string'),
+               ('color', 'string')],
+    'cards': [('id', 'string'), ('idBoard', 'string'), ('idList', 'string'), ('name', 'string'),
+              ('desc', 'string'), ('closed', 'bool'), ('pos', 'float'), ('due', 'string'),
+              ('dateLastActivity', 'string'), ('shortLink', 'string'), ('idLabels', 'list'),
+              ('idMembers', 'list')],
+    'comments': [('id', 'string'), ('idBoard', 'string'), ('idList', 'string'),
+                 ('idCard', 'string'), ('idMemberCreator', 'string'), ('date', 'string'),
+                 ('text', 'string')],
+}
+KINDS = ('boards', 'lists', 'labels', 'cards', 'comments')
+
+# Python 2's csv module only writes byte strings.
+CSV_WRITES_BYTES = sys.version_info[0] == 2
+
+
+def flatten_comment(action):
+    """Columns of a commentCard action, which nests them under 'data'."""
+    data = action.get('data') or {}
+    return {'id': action.get('id'), 'idBoard': data.get('board', {}).get('id'),
+            'idList': data.get('list', {}).get('id'), 'idCard': data.get('card', {}).get('id'),
+            'idMemberCreator': action.get('idMemberCreator'), 'date': action.get('date'),
+            'text': data.get('text')}
+
+
+def _open_binary(path, compression):
+    if compression == 'gzip':
+        return gzip.open(path, 'wb')
+    if compression == 'bz2':
+        return bz2.BZ2File(path, 'wb')
+    return io.open(path, 'wb')
+
+
+class _JsonLinesWriter(object):
+
+    def __init__(self, path, kind, compression):
+        self._file = _open_binary(path, compression)
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False, sort_keys=True) + '\n'
+        self._file.write(line.encode('utf-8'))
+
+    def close(self):
+        self._file.close()
+
+
+class _CsvWriter(object):
+
+    def __init__(self, path, kind, compression):
+        self._columns = COLUMNS[kind]
+        if CSV_WRITES_BYTES:
+            self._file = _open_binary(path, compression)
+        else:
+            self._file = io.TextIOWrapper(_open_binary(path, compression), encoding='utf-8',
+                                          newline='')
+        self._writer = csv.writer(self._file)
+        self._writerow([name for name, kind in self._columns])
+
+    def write(self, record):
+        row = []
+        for name, column_type in self._columns:
+            value = record.get(name)
+            if value is None:
+                value = ''
+            elif column_type == 'list':
+                value = ','.join(value)
+            elif column_type == 'bool':
+                value = 'true' if value else 'false'
+            row.append(value)
+        self._writerow(row)
+
+    def _writerow(self, row):
+        if CSV_WRITES_BYTES:
+            row = [value.encode('utf-8') if is_stringy(value) else value for value in row]
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter(object):
+
+    def __init__(self, path, kind, compression):
+        types = {'string': pyarrow.string(), 'bool': pyarrow.bool_(),
+                 'float': pyarrow.float64(), 'list': pyarrow.list_(pyarrow.string())}
+        self._columns = COLUMNS[kind]
+        self._schema = pyarrow.schema([(name, types[column_type])
+                                       for name, column_type in self._columns])
+        self._writer = pyarrow.parquet.ParquetWriter(
+            path, self._schema, compression=compression or 'snappy')
+        self._rows = []
+
+    def write(self, record):
+        self._rows.append(record)
+        if len(self._rows) >= ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        columns = dict((name, [row.get(name) for row in self._rows])
+                       for name, column_type in self._columns)
+        for name, column_type in self._columns:
+            if column_type == 'float':
+                columns[name] = [None if value is None else float(value)
+                                 for value in columns[name]]
+        self._writer.write_table(pyarrow.Table.from_pydict(columns, schema=self._schema))
+        self._rows = []
+
+    def close(self):
+        if self._rows:
+            self._flush()
+        self._writer.close()
+
+
+WRITERS = {'jsonl': _JsonLinesWriter, 'csv': _CsvWriter, 'parquet': _ParquetWriter}
+
+
+def part_path(path, kind, board_id, format, compression=None):
+    """Where the <kind> records of <board_id> go, e.g. path/cards/<board_id>.jsonl.gz"""
+    extension = '.' + format
+    if format != 'parquet':
+        extension += TEXT_COMPRESSIONS[compression]
+    return os.path.join(path, kind, board_id + extension)
+
+
+class ExportReport(object):
+    """Outcome of export_workspace().
+
+    <exported> and <skipped> are board ids, <skipped> being those a previous
+    run had already exported. <counts> is {kind: records written}.
+    """
+
+    def __init__(self):
+        self.exported = []
+        self.skipped = []
+        self.counts = dict((kind, 0) for kind in KINDS)
+
+    def __repr__(self):
+        return '<simpletrello.export.ExportReport ({} boards exported, {} skipped)>'.format(
+            len(self.exported), len(self.skipped))
+
+
+def read_manifest(path):
+    """{board_id: manifest entry} for the boards already exported to <path>."""
+    manifest = os.path.join(path, MANIFEST)
+    if not os.path.exists(manifest):
+        return {}
+    done = {}
+    with io.open(manifest, encoding='utf-8') as f:
+        for line in f:
+            # A line cut short by a crash is ignored, and its board exported again.
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            done[entry['board']] = entry
+    return done
+
+
+def _board_records(client, board, page_size):
+    """Yield (kind, record) for one board, paging through cards and comments."""
+    board_id = board['id']
+    yield 'boards', board
+    for label in client._get(['boards', board_id, 'labels'], params={'limit': 1000}):
+        yield 'labels', label
+    for board_list in client._get(['boards', board_id, 'lists'], params={'filter': 'all'}):
+        yield 'lists', board_list
+    cards = client._paginate(['boards', board_id, 'cards'], params={'filter': 'all'},
+                             page_size=page_size, stream=True)
+    for card in cards:
+        yield 'cards', card
+    comments = client._paginate(['boards', board_id, 'actions'],
+                                params={'filter': 'commentCard'},
+                                page_size=page_size, stream=True)
+    for action in comments:
+        yield 'comments', action
+
+
+def _export_board(client, board, path, format, compression, page_size):
+    """Write the parts of one board under temporary names, then move them into
+    place. Returns {kind: records written}.
+    """
+    paths = dict((kind, part_path(path, kind, board['id'], format, compression))
+                 for kind in KINDS)
+    writers = {}
+    counts = dict((kind, 0) for kind in KINDS)
+    try:
+        for kind in KINDS:
+            writers[kind] = WRITERS[format](paths[kind] + PARTIAL_SUFFIX, kind, compression)
+        for kind, record in _board_records(client, board, page_size):
+            if format != 'jsonl' and kind == 'comments':
+                record = flatten_comment(record)
+            writers[kind].write(record)
+            counts[kind] += 1
+    finally:
+        for writer in writers.values():
+            writer.close()
+    for kind in KINDS:
+        os.rename(paths[kind] + PARTIAL_SUFFIX, paths[kind])
+    return counts
+
+
+def export_workspace(client, path, format='jsonl', compression=None, board_ids=None,
+                     resume=True, page_size=1000):
+    """Export boards with their labels, lists, cards and comments to <path>.
+    See TrelloClient.export_workspace.
+    """
+    if format not in FORMATS:
+        raise ValueError('format must be one of {}.'.format(', '.join(FORMATS)))
+    if format == 'parquet' and pyarrow is None:
+        raise ImportError('Exporting to parquet needs pyarrow.')
+    if format != 'parquet' and compression not in TEXT_COMPRESSIONS:
+        raise ValueError('compression must be None, gzip or bz2 for {}.'.format(format))
+    for kind in KINDS:
+        directory = os.path.join(path, kind)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    done = read_manifest(path) if resume else {}
+    for entry in done.values():
+        if (entry['format'], entry.get('compression')) != (format, compression):
+            raise ValueError('{} holds a {} export. Pass resume=False to start over.'.format(
+                path, entry['format']))
+    report = ExportReport()
+    with io.open(os.path.join(path, MANIFEST), 'a' if resume else 'w', encoding='utf-8') as f:
+        for board in client._get(['members', 'me', 'boards']):
+            if board_ids is not None and board['id'] not in board_ids:
+                continue
+            if board['id'] in done:
+                report.skipped.append(board['id'])
+                continue
+            counts = _export_board(client, board, path, format, compression, page_size)
+            entry = {'board': board['id'], 'name': board.get('name'), 'format': format,
+                     'compression': compression, 'counts': counts}
+            f.write(json.dumps(entry, sort_keys=True) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+            report.exported.append(board['id'])
+            for kind, count in counts.items():
+                report.counts[kind] += count
+    return report
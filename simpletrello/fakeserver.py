@@ -0,0 +1,1131 @@
+# coding: utf-8
+"""fakeserver.py
+
+An in-memory stand-in for the parts of api.trello.com that TrelloClient uses,
+for load, concurrency and caching tests without the network.
+
+Boards come from a Workspace, generated one board at a time when first
+requested, so a workspace of millions of cards costs nothing until used:
+
+>>> fake = FakeTrello(Workspace(boards=1000, lists_per_board=10, cards_per_list=100),
+...                   latency=(0.05, 0.2), error_rate=0.01)
+>>> trello = TrelloClient(api_key='key', token='token', session=fake.session())
+
+or over HTTP, e.g. for the asyncio client or other processes:
+
+>>> with fake.serve() as server:
+...     trello = TrelloClient(api_key='key', token='token', base_url=server.base_url)
+"""
+
+from __future__ import print_function, unicode_literals
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+
+from simpletrello.batch import BATCH_LIMIT
+from simpletrello.ratelimit import KEY_LIMIT, TOKEN_LIMIT
+from simpletrello.transport import make_response
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qsl, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Generated ids are the creation time, then kind, board index and index, so
+# they sort by creation like real ids and tell where to find the object.
+GENERATED_TIME = 1514764800
+GENERATED_DATE = '2018-01-01T00:00:00.000Z'
+KIND_CODES = {'boards': 1, 'lists': 2, 'labels': 3, 'cards': 4, 'actions': 5}
+
+MEMBER_ID = '{:08x}{:016x}'.format(GENERATED_TIME, 0)
+LABEL_COLORS = ('green', 'yellow', 'orange', 'red', 'purple', 'blue')
+DEFAULT_LISTS = ('To Do', 'Doing', 'Done')
+WORDS = ('release', 'deploy', 'bug', 'design', 'review', 'customer', 'invoice', 'backlog',
+         'meeting', 'report', 'migration', 'onboarding', 'metrics', 'budget', 'roadmap',
+         'feedback', 'security', 'refactor', 'support', 'launch', 'api', 'mobile')
+
+# Trello's default and largest page sizes.
+DEFAULT_ACTIONS_LIMIT = 50
+MAX_LIMIT = 1000
+
+POS_STEP = 16384
+
+NOT_FOUND = 'The requested resource was not found.'
+
+
+def generated_id(kind, board_index, index=0):
+    """Id of the <index>th object of <kind> on generated board <board_index>."""
+    return '{:08x}{:02x}{:06x}{:08x}'.format(
+        GENERATED_TIME, KIND_CODES[kind], board_index, index)
+
+
+def _parse_generated_id(object_id):
+    """(kind code, board index, index) of a generated id, else None."""
+    if len(object_id) != 24 or not object_id.startswith('{:08x}'.format(GENERATED_TIME)):
+        return None
+    try:
+        return int(object_id[8:10], 16), int(object_id[10:16], 16), int(object_id[16:], 16)
+    except ValueError:
+        return None
+
+
+def _bool(value):
+    return '{}'.format(value).lower() in ('true', '1')
+
+
+def _project(source, fields):
+    """Copy of <source> with only <fields>, a comma separated str, or all of them."""
+    if fields is None or fields == 'all':
+        return dict(source)
+    result = dict((field, source[field]) for field in fields.split(',') if field in source)
+    result['id'] = source['id']
+    return result
+
+
+def _filtered(objects, status):
+    """<objects> matching an 'all', 'open', 'visible', 'closed' or 'none' filter."""
+    if status is None or status == 'all':
+        return list(objects)
+    if status == 'none':
+        return []
+    closed = status == 'closed'
+    return [obj for obj in objects if obj['closed'] == closed]
+
+
+def _limit(params, default=None):
+    limit = params.get('limit', default)
+    if limit is None:
+        return None
+    limit = int(limit)
+    if not 0 <= limit <= MAX_LIMIT:
+        raise _Error(400, 'invalid value for limit')
+    return limit
+
+
+def _color(value):
+    return None if value == 'null' else value
+
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+
+
+class _Error(Exception):
+
+    def __init__(self, status, message):
+        super(_Error, self).__init__(message)
+        self.status = status
+        self.message = message
+
+
+class _Board(object):
+    """One board's objects, as the API returns them.
+
+    Cards keep idLabels only, and get their label dicts on the way out.
+    Actions are kept oldest first.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.lists = OrderedDict()
+        self.labels = OrderedDict()
+        self.cards = OrderedDict()
+        self.list_cards = {}
+        self.actions = []
+        self.action_ids = []
+        self.action_index = {}
+        self.card_actions = {}
+        # Changed since generated, so never dropped from memory.
+        self.dirty = False
+
+    def add_list(self, board_list):
+        self.lists[board_list['id']] = board_list
+        self.list_cards[board_list['id']] = []
+
+    def add_card(self, card):
+        self.cards[card['id']] = card
+        self.list_cards[card['idList']].append(card)
+
+    def move_card(self, card, list_id):
+        self.list_cards[card['idList']].remove(card)
+        card['idList'] = list_id
+        self.list_cards[list_id].append(card)
+
+    def remove_card(self, card):
+        del self.cards[card['id']]
+        self.list_cards[card['idList']].remove(card)
+
+    def add_action(self, action):
+        # New ids are always the largest, so appending keeps the order.
+        self.actions.append(action)
+        self.action_ids.append(action['id'])
+        self.action_index[action['id']] = action
+        card_id = action['data'].get('card', {}).get('id')
+        if card_id is not None and action['type'] == 'commentCard':
+            self.card_actions.setdefault(card_id, []).append(action)
+
+    def remove_action(self, action):
+        position = bisect_left(self.action_ids, action['id'])
+        del self.actions[position]
+        del self.action_ids[position]
+        del self.action_index[action['id']]
+        card_id = action['data'].get('card', {}).get('id')
+        if action in self.card_actions.get(card_id, []):
+            self.card_actions[card_id].remove(action)
+
+    def card_out(self, card, fields=None):
+        result = _project(card, fields)
+        if fields is None or fields == 'all' or 'labels' in fields.split(','):
+            result['labels'] = [dict(self.labels[label_id]) for label_id in card['idLabels']
+                                if label_id in self.labels]
+        return result
+
+    def ref(self):
+        return {'id': self.board['id'], 'name': self.board['name']}
+
+
+class Workspace(object):
+    """Deterministic synthetic boards. Each board is generated only when first
+    requested, from <seed> and its index, so any board looks the same every time.
+
+    Params
+    ------
+    boards, lists_per_board, cards_per_list: int
+        Size of the workspace. Every card has 0 to 2 of the board's labels.
+
+    comments_per_card: int
+        commentCard actions per card.
+
+    labels_per_board: int
+    """
+
+    def __init__(self, boards=10, lists_per_board=10, cards_per_list=100, comments_per_card=1,
+                 labels_per_board=6, seed=0):
+        self.boards = boards
+        self.lists_per_board = lists_per_board
+        self.cards_per_list = cards_per_list
+        self.comments_per_card = comments_per_card
+        self.labels_per_board = labels_per_board
+        self.seed = seed
+
+    @property
+    def num_cards(self):
+        return self.boards * self.lists_per_board * self.cards_per_list
+
+    def board_id(self, index):
+        return generated_id('boards', index)
+
+    def board_source(self, index):
+        """The board's own fields, without generating its contents."""
+        board_id = self.board_id(index)
+        return {'id': board_id, 'name': 'Board {}'.format(index), 'desc': '',
+                'closed': False, 'idOrganization': None, 'pinned': False,
+                'shortLink': board_id[-8:], 'url': 'https://trello.com/b/' + board_id[-8:],
+                'dateLastActivity': GENERATED_DATE}
+
+    def generate(self, index, contents=True):
+        """The board's state. Without <contents>, only the board and its labels."""
+        rng = random.Random(self.seed * 1000003 + index)
+        state = _Board(self.board_source(index))
+        for i in range(self.labels_per_board):
+            label_id = generated_id('labels', index, i)
+            state.labels[label_id] = {
+                'id': label_id, 'idBoard': state.board['id'], 'name': rng.choice(WORDS),
+                'color': LABEL_COLORS[i % len(LABEL_COLORS)]}
+        if not contents:
+            return state
+        label_ids = list(state.labels)
+        card_index = 0
+        for i in range(self.lists_per_board):
+            list_id = generated_id('lists', index, i)
+            state.add_list({'id': list_id, 'idBoard': state.board['id'],
+                            'name': 'List {}'.format(i), 'closed': False,
+                            'pos': (i + 1) * POS_STEP, 'subscribed': False})
+            for j in range(self.cards_per_list):
+                card_id = generated_id('cards', index, card_index)
+                words = [rng.choice(WORDS) for word in range(3)]
+                card = {
+                    'id': card_id, 'idBoard': state.board['id'], 'idList': list_id,
+                    'name': '{} {}'.format(' '.join(words).capitalize(), card_index),
+                    'desc': ' '.join(rng.choice(WORDS) for word in range(12)),
+                    'closed': False, 'pos': (j + 1) * POS_STEP, 'due': None,
+                    'idLabels': rng.sample(label_ids, min(len(label_ids), rng.randint(0, 2))),
+                    'idMembers': [], 'subscribed': False,
+                    'shortLink': hashlib.md5(card_id.encode('ascii')).hexdigest()[:8],
+                    'dateLastActivity': GENERATED_DATE,
+                    'badges': {'comments': self.comments_per_card}}
+                state.add_card(card)
+                for n in range(self.comments_per_card):
+                    action_id = generated_id(
+                        'actions', index, card_index * self.comments_per_card + n)
+                    state.add_action({
+                        'id': action_id, 'type': 'commentCard', 'date': GENERATED_DATE,
+                        'idMemberCreator': MEMBER_ID,
+                        'data': {'text': ' '.join(rng.choice(WORDS) for word in range(6)),
+                                 'card': {'id': card_id, 'name': card['name'],
+                                          'shortLink': card['shortLink']},
+                                 'list': {'id': list_id, 'name': 'List {}'.format(i)},
+                                 'board': state.ref()}})
+                card_index += 1
+        return state
+
+    def __repr__(self):
+        return '<simpletrello.fakeserver.Workspace ({} boards, {} cards)>'.format(
+            self.boards, self.num_cards)
+
+
+class _Window(object):
+    """Requests in the last <period> seconds, for one key or token."""
+
+    def __init__(self, limit, period):
+        self.limit = limit
+        self.period = period
+        self.times = deque()
+
+    def remaining(self, now):
+        while self.times and self.times[0] <= now - self.period:
+            self.times.popleft()
+        return self.limit - len(self.times)
+
+
+# (method, path pattern, FakeTrello method). '*' matches any id.
+ROUTES = [
+    ('GET', ('members', '*', 'boards'), '_get_member_boards'),
+    ('GET', ('boards', '*'), '_get_board'),
+    ('GET', ('boards', '*', 'lists'), '_get_board_lists'),
+    ('GET', ('board', '*', 'lists'), '_get_board_lists'),
+    ('GET', ('boards', '*', 'cards'), '_get_board_cards'),
+    ('GET', ('boards', '*', 'labels'), '_get_board_labels'),
+    ('GET', ('boards', '*', 'actions'), '_get_board_actions'),
+    ('GET', ('lists', '*'), '_get_list'),
+    ('GET', ('lists', '*', 'cards'), '_get_list_cards'),
+    ('GET', ('lists', '*', 'actions'), '_get_list_actions'),
+    ('GET', ('cards', '*'), '_get_card'),
+    ('GET', ('cards', '*', 'actions'), '_get_card_actions'),
+    ('GET', ('cards', '*', 'checklists'), '_get_card_checklists'),
+    ('GET', ('actions', '*'), '_get_action'),
+    ('GET', ('labels', '*'), '_get_label'),
+    ('GET', ('search',), '_search'),
+    ('GET', ('batch',), '_batch'),
+    ('GET', ('tokens', '*', 'webhooks'), '_get_webhooks'),
+    ('POST', ('boards',), '_create_board'),
+    ('POST', ('lists',), '_create_list'),
+    ('POST', ('cards',), '_create_card'),
+    ('POST', ('cards', '*', 'actions', 'comments'), '_create_comment'),
+    ('POST', ('labels',), '_create_label'),
+    ('POST', ('webhooks',), '_create_webhook'),
+    ('PUT', ('boards', '*'), '_update_board'),
+    ('PUT', ('lists', '*'), '_update_list'),
+    ('PUT', ('cards', '*'), '_update_card'),
+    ('PUT', ('labels', '*'), '_update_label'),
+    ('PUT', ('actions', '*'), '_update_comment'),
+    ('DELETE', ('boards', '*'), '_delete_board'),
+    ('DELETE', ('cards', '*'), '_delete_card'),
+    ('DELETE', ('labels', '*'), '_delete_label'),
+    ('DELETE', ('actions', '*'), '_delete_comment'),
+    ('DELETE', ('webhooks', '*'), '_delete_webhook'),
+]
+
+
+def _match(method, parts):
+    for route_method, pattern, name in ROUTES:
+        if route_method != method or len(pattern) != len(parts):
+            continue
+        if all(p == '*' or p == part for p, part in zip(pattern, parts)):
+            return name, [part for p, part in zip(pattern, parts) if p == '*']
+    return None, None
+
+
+class FakeTrello(object):
+    """In-memory Trello API, answering requests with handle().
+
+    Use it through session() in the same process, or serve() over HTTP.
+
+    Params
+    ------
+    workspace: Workspace
+        Generated boards to serve. Defaults to none; boards can still be
+        created through the API.
+
+    latency: float | tuple | callable
+        Seconds before each response: a constant, a (low, high) range drawn
+        from uniformly, or a function returning them.
+
+    error_rate: float
+        Fraction of requests answered with a 500, without being applied.
+
+    rate_limit: bool | tuple
+        Answer 429 over Trello's limits of 300 requests per 10 seconds for each
+        key and 100 for each token. Pass ((key_requests, seconds),
+        (token_requests, seconds)) for other limits, or False for none.
+
+    max_cached_boards: int
+        Unchanged generated boards kept in memory. Others are dropped and
+        generated again when needed. Changed boards are always kept.
+
+    Webhooks are stored and listed, but nothing is ever delivered to them.
+    """
+
+    def __init__(self, workspace=None, latency=0.0, error_rate=0.0, rate_limit=True,
+                 max_cached_boards=16, seed=0, clock=time.time, sleep=time.sleep):
+        self.workspace = workspace if workspace is not None else Workspace(boards=0)
+        self.latency = latency
+        self.error_rate = error_rate
+        if rate_limit is True:
+            rate_limit = (KEY_LIMIT, TOKEN_LIMIT)
+        self.rate_limit = rate_limit
+        self.max_cached_boards = max_cached_boards
+        self.request_count = 0
+        self.status_counts = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._windows = {}
+        self._boards = OrderedDict()
+        self._created = {}
+        self._deleted = set()
+        self._webhooks = OrderedDict()
+        self._id_count = 0
+
+    def session(self):
+        """A session calling this fake in process, for TrelloClient(session=...)."""
+        return FakeTrelloSession(self)
+
+    def serve(self, host='127.0.0.1', port=0):
+        """A FakeTrelloServer for this fake. Start it, or use it as a context manager."""
+        return FakeTrelloServer(self, host=host, port=port)
+
+    ### REQUESTS
+
+    def handle(self, method, path, params=None, headers=None):
+        """Answer one request to <path>, e.g. '/1/boards/abc', with str <params>.
+
+        Returns
+        -------
+        status, headers, body: int, dict, bytes
+        """
+        method = method.upper()
+        params = dict(params or {})
+        headers = dict((k.lower(), v) for k, v in (headers or {}).items())
+        with self._lock:
+            self.request_count += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            latency = self.latency
+            if isinstance(latency, tuple):
+                latency = self._random.uniform(*latency)
+            fail = self.error_rate and self._random.random() < self.error_rate
+        try:
+            if callable(latency):
+                latency = latency()
+            if latency:
+                self._sleep(latency)
+            status, response_headers, body = self._respond(method, path, params, headers, fail)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        return status, response_headers, body
+
+    def _respond(self, method, path, params, headers, fail):
+        key, token = params.pop('key', None), params.pop('token', None)
+        if not key or not token:
+            return 401, {'Content-Type': 'text/plain'}, b'invalid key'
+        response_headers = {}
+        if self.rate_limit:
+            exceeded = self._check_rate_limit(key, token, response_headers)
+            if exceeded:
+                body = json.dumps({'error': exceeded, 'message': 'Rate limit exceeded'})
+                response_headers['Content-Type'] = 'application/json; charset=utf-8'
+                return 429, response_headers, body.encode('utf-8')
+        if fail:
+            return 500, {'Content-Type': 'text/plain'}, b'Internal server error'
+        parts = [part for part in path.split('/') if part]
+        if parts and parts[0] == '1':
+            parts = parts[1:]
+        try:
+            value = self._route(method, parts, params, token)
+        except _Error as error:
+            response_headers['Content-Type'] = 'text/plain; charset=utf-8'
+            return error.status, response_headers, error.message.encode('utf-8')
+        except Exception:
+            logger.exception('Fake Trello failed to answer %s %s', method, path)
+            return 500, {'Content-Type': 'text/plain'}, b'Internal server error'
+        body = json.dumps(value).encode('utf-8')
+        response_headers['Content-Type'] = 'application/json; charset=utf-8'
+        if method == 'GET':
+            etag = 'W/"{}"'.format(hashlib.md5(body).hexdigest())
+            response_headers['ETag'] = etag
+            if headers.get('if-none-match') == etag:
+                return 304, response_headers, b''
+        return 200, response_headers, body
+
+    def _check_rate_limit(self, key, token, response_headers):
+        """Count a request, or return the Trello error name if over a limit."""
+        now = self._clock()
+        (key_requests, key_period), (token_requests, token_period) = self.rate_limit
+        with self._lock:
+            key_window = self._window(('key', key), key_requests, key_period)
+            token_window = self._window(('token', token), token_requests, token_period)
+            key_remaining = key_window.remaining(now)
+            token_remaining = token_window.remaining(now)
+            if key_remaining <= 0:
+                return 'API_KEY_LIMIT_EXCEEDED'
+            if token_remaining <= 0:
+                return 'API_TOKEN_LIMIT_EXCEEDED'
+            key_window.times.append(now)
+            token_window.times.append(now)
+        response_headers['X-Rate-Limit-Api-Key-Remaining'] = '{}'.format(key_remaining - 1)
+        response_headers['X-Rate-Limit-Api-Token-Remaining'] = '{}'.format(token_remaining - 1)
+        return None
+
+    def _window(self, name, limit, period):
+        window = self._windows.get(name)
+        if window is None:
+            window = self._windows[name] = _Window(limit, period)
+        return window
+
+    def _route(self, method, parts, params, token):
+        name, ids = _match(method, parts)
+        if name is None:
+            raise _Error(404, 'Cannot {} /1/{}'.format(method, '/'.join(parts)))
+        with self._lock:
+            if name == '_get_webhooks' or name == '_create_webhook':
+                return getattr(self, name)(params, token)
+            return getattr(self, name)(*ids, params=params)
+
+    ### STATE
+
+    def _new_id(self):
+        # Later objects must sort after earlier ones, as real ids do.
+        self._id_count += 1
+        return '{:08x}{:016x}'.format(max(int(time.time()), GENERATED_TIME + 1), self._id_count)
+
+    def _board_state(self, board_id, cache=True, contents=True):
+        """The state of <board_id>, generating it if needed. Without <cache>, a
+        generated state is not kept. Without <contents>, the state may only have
+        the board and its labels, and is not kept either.
+        """
+        state = self._boards.get(board_id)
+        if state is not None:
+            self._boards[board_id] = self._boards.pop(board_id)
+            return state
+        parsed = _parse_generated_id(board_id)
+        if parsed is None or parsed[0] != KIND_CODES['boards'] or board_id in self._deleted:
+            raise _Error(404, NOT_FOUND)
+        if parsed[1] >= self.workspace.boards:
+            raise _Error(404, NOT_FOUND)
+        state = self.workspace.generate(parsed[1], contents=contents)
+        if cache and contents:
+            self._boards[board_id] = state
+            clean = [key for key, other in self._boards.items() if not other.dirty]
+            for key in clean[:max(0, len(clean) - self.max_cached_boards)]:
+                del self._boards[key]
+        return state
+
+    def _changed(self, board_id):
+        state = self._board_state(board_id)
+        state.dirty = True
+        return state
+
+    def _find(self, kind, object_id):
+        """Return (board state, object) for <object_id> of <kind>."""
+        board_id = self._created.get(object_id)
+        if board_id is None:
+            parsed = _parse_generated_id(object_id)
+            if parsed is None or parsed[0] != KIND_CODES[kind]:
+                raise _Error(404, NOT_FOUND)
+            board_id = generated_id('boards', parsed[1])
+        state = self._board_state(board_id)
+        objects = {'lists': state.lists, 'cards': state.cards, 'labels': state.labels,
+                   'actions': state.action_index}[kind]
+        obj = objects.get(object_id)
+        if obj is None:
+            raise _Error(404, NOT_FOUND)
+        return state, obj
+
+    def _all_boards(self):
+        """Board dicts of the workspace, without generating their contents."""
+        for index in range(self.workspace.boards):
+            board_id = self.workspace.board_id(index)
+            if board_id in self._deleted:
+                continue
+            state = self._boards.get(board_id)
+            yield state.board if state is not None else self.workspace.board_source(index)
+        for board_id, state in list(self._boards.items()):
+            if _parse_generated_id(board_id) is None:
+                yield state.board
+
+    def _add_action(self, state, action_type, data):
+        data.setdefault('board', state.ref())
+        action = {'id': self._new_id(), 'type': action_type, 'date': _now(),
+                  'idMemberCreator': MEMBER_ID, 'data': data}
+        state.add_action(action)
+        state.dirty = True
+        return action
+
+    @staticmethod
+    def _pos(value, siblings):
+        positions = [sibling['pos'] for sibling in siblings]
+        if value is None or value == 'bottom':
+            return max(positions or [0]) + POS_STEP
+        if value == 'top':
+            return min(positions or [POS_STEP * 2]) / 2.0
+        try:
+            return float(value)
+        except ValueError:
+            raise _Error(400, 'invalid value for pos')
+
+    ### READS
+
+    def _get_member_boards(self, member_id, params):
+        boards = _filtered(self._all_boards(), params.get('filter', 'all'))
+        return [_project(board, params.get('fields')) for board in boards]
+
+    def _get_board(self, board_id, params):
+        nested = [params.get(name, 'none') for name in ('lists', 'cards', 'checklists')]
+        contents = params.get('actions') or any(value != 'none' for value in nested)
+        state = self._board_state(board_id, contents=contents)
+        result = _project(state.board, params.get('fields'))
+        if params.get('labels', 'none') != 'none':
+            labels = list(state.labels.values())[:int(params.get('labels_limit', 50))]
+            result['labels'] = [_project(label, params.get('label_fields')) for label in labels]
+        if params.get('lists', 'none') != 'none':
+            result['lists'] = [_project(board_list, params.get('list_fields'))
+                               for board_list in _filtered(state.lists.values(), params['lists'])]
+        if params.get('cards', 'none') != 'none':
+            result['cards'] = [state.card_out(card, params.get('card_fields'))
+                               for card in _filtered(state.cards.values(), params['cards'])]
+        if params.get('actions'):
+            limit = int(params.get('actions_limit', DEFAULT_ACTIONS_LIMIT))
+            result['actions'] = self._actions(state.actions, state.action_ids,
+                                              {'filter': params['actions'], 'limit': limit})
+        if params.get('checklists', 'none') != 'none':
+            result['checklists'] = []
+        return result
+
+    def _get_board_lists(self, board_id, params):
+        state = self._board_state(board_id)
+        lists = _filtered(state.lists.values(), params.get('filter', 'open'))
+        result = [_project(board_list, params.get('fields')) for board_list in lists]
+        if params.get('cards', 'none') != 'none':
+            for board_list in result:
+                board_list['cards'] = [
+                    state.card_out(card, params.get('card_fields'))
+                    for card in _filtered(state.list_cards[board_list['id']], params['cards'])]
+        return result
+
+    def _cards(self, state, cards, params):
+        cards = _filtered(cards, params.get('filter', 'open'))
+        limit = _limit(params)
+        before, since = params.get('before'), params.get('since')
+        if limit is not None or before or since:
+            # Paged requests get the newest cards first, as for actions.
+            cards = [card for card in cards
+                     if (not before or card['id'] < before) and (not since or card['id'] > since)]
+            cards.sort(key=lambda card: card['id'], reverse=True)
+            cards = cards[:limit]
+        else:
+            cards.sort(key=lambda card: card['pos'])
+        return [state.card_out(card, params.get('fields')) for card in cards]
+
+    def _get_board_cards(self, board_id, params):
+        state = self._board_state(board_id)
+        params.setdefault('filter', 'visible')
+        return self._cards(state, state.cards.values(), params)
+
+    def _get_board_labels(self, board_id, params):
+        state = self._board_state(board_id, contents=False)
+        return [_project(label, params.get('fields')) for label in state.labels.values()]
+
+    def _actions(self, actions, action_ids, params, match=None):
+        """Newest first, as Trello pages actions. <action_ids> are the ids of
+        <actions>, oldest first, for bisecting on before and since.
+        """
+        types = params.get('filter', 'all')
+        types = None if types == 'all' else set(types.split(','))
+        limit = _limit(params, DEFAULT_ACTIONS_LIMIT)
+        end = len(actions)
+        if params.get('before'):
+            end = bisect_left(action_ids, params['before'])
+        since = params.get('since')
+        result = []
+        for position in range(end - 1, -1, -1):
+            action = actions[position]
+            if since and (action['id'] <= since if len(since) == 24 else action['date'] < since):
+                break
+            if types is not None and action['type'] not in types:
+                continue
+            if match is not None and not match(action):
+                continue
+            result.append(_project(action, params.get('fields')))
+            if len(result) >= limit:
+                break
+        return result
+
+    def _get_board_actions(self, board_id, params):
+        state = self._board_state(board_id)
+        return self._actions(state.actions, state.action_ids, params)
+
+    def _get_list(self, list_id, params):
+        state, board_list = self._find('lists', list_id)
+        return _project(board_list, params.get('fields'))
+
+    def _get_list_cards(self, list_id, params):
+        state, board_list = self._find('lists', list_id)
+        return self._cards(state, state.list_cards[list_id], params)
+
+    def _get_list_actions(self, list_id, params):
+        state, board_list = self._find('lists', list_id)
+
+        def on_list(action):
+            return action['data'].get('list', {}).get('id') == list_id
+        return self._actions(state.actions, state.action_ids, params, match=on_list)
+
+    def _get_card(self, card_id, params):
+        state, card = self._find('cards', card_id)
+        return state.card_out(card, params.get('fields'))
+
+    def _get_card_actions(self, card_id, params):
+        state, card = self._find('cards', card_id)
+        types = params.get('filter', 'commentCard')
+        if types == 'commentCard':
+            actions = state.card_actions.get(card_id, [])
+            return self._actions(actions, [action['id'] for action in actions], params)
+
+        def on_card(action):
+            return action['data'].get('card', {}).get('id') == card_id
+        return self._actions(state.actions, state.action_ids, params, match=on_card)
+
+    def _get_card_checklists(self, card_id, params):
+        self._find('cards', card_id)
+        return []
+
+    def _get_action(self, action_id, params):
+        state, action = self._find('actions', action_id)
+        return _project(action, params.get('fields'))
+
+    def _get_label(self, label_id, params):
+        state, label = self._find('labels', label_id)
+        return _project(label, params.get('fields'))
+
+    def _search(self, params):
+        terms = params.get('query', '').lower().split()
+        if not terms:
+            raise _Error(400, 'invalid query')
+        model_types = params.get('modelTypes', 'all')
+        model_types = ('boards', 'cards') if model_types == 'all' else model_types.split(',')
+        result = {'options': {'terms': [{'text': term} for term in terms]}}
+        if 'boards' in model_types:
+            limit = int(params.get('boards_limit', 10))
+            boards = [board for board in self._all_boards()
+                      if all(term in board['name'].lower() for term in terms)]
+            result['boards'] = [_project(board, params.get('board_fields'))
+                                for board in boards[:limit]]
+        if 'cards' in model_types:
+            limit = int(params.get('cards_limit', 10))
+            skip = limit * int(params.get('cards_page', 0))
+            result['cards'] = cards = []
+            for board in list(self._all_boards()):
+                # Searching must not pin every board of a large workspace in memory.
+                state = self._board_state(board['id'], cache=False)
+                for card in state.cards.values():
+                    text = '{} {}'.format(card['name'], card['desc']).lower()
+                    if not all(term in text for term in terms):
+                        continue
+                    if skip:
+                        skip -= 1
+                        continue
+                    cards.append(state.card_out(card, params.get('card_fields')))
+                    if len(cards) >= limit:
+                        return result
+        return result
+
+    def _batch(self, params):
+        urls = [url for url in params.get('urls', '').split(',') if url]
+        if not urls or len(urls) > BATCH_LIMIT:
+            raise _Error(400, 'invalid value for urls')
+        results = []
+        for url in urls:
+            parsed = urlparse(url)
+            parts = [part for part in parsed.path.split('/') if part]
+            if parts and parts[0] == '1':
+                parts = parts[1:]
+            try:
+                results.append({'200': self._route('GET', parts, dict(parse_qsl(parsed.query)),
+                                                   None)})
+            except _Error as error:
+                results.append({'statusCode': error.status, 'name': 'Error',
+                                'message': error.message})
+        return results
+
+    def _get_webhooks(self, params, token):
+        return [dict(webhook) for webhook in self._webhooks.values()
+                if webhook['_token'] == token]
+
+    ### WRITES
+
+    def _create_board(self, params):
+        if not params.get('name'):
+            raise _Error(400, 'invalid value for name')
+        board_id = self._new_id()
+        state = _Board({'id': board_id, 'name': params['name'], 'desc': params.get('desc', ''),
+                        'closed': False, 'idOrganization': params.get('idOrganization'),
+                        'pinned': False, 'shortLink': board_id[-8:],
+                        'url': 'https://trello.com/b/' + board_id[-8:],
+                        'dateLastActivity': _now()})
+        state.dirty = True
+        self._boards[board_id] = state
+        self._created[board_id] = board_id
+        if _bool(params.get('defaultLabels', 'true')):
+            for color in LABEL_COLORS:
+                label_id = self._new_id()
+                state.labels[label_id] = {'id': label_id, 'idBoard': board_id, 'name': '',
+                                          'color': color}
+                self._created[label_id] = board_id
+        if _bool(params.get('defaultLists', 'true')):
+            for i, name in enumerate(DEFAULT_LISTS):
+                self._new_list(state, name, (i + 1) * POS_STEP)
+        self._add_action(state, 'createBoard', {})
+        return dict(state.board)
+
+    def _new_list(self, state, name, pos):
+        board_list = {'id': self._new_id(), 'idBoard': state.board['id'], 'name': name,
+                      'closed': False, 'pos': pos, 'subscribed': False}
+        state.add_list(board_list)
+        self._created[board_list['id']] = state.board['id']
+        return board_list
+
+    def _create_list(self, params):
+        if not params.get('name'):
+            raise _Error(400, 'invalid value for name')
+        state = self._changed(params.get('idBoard', ''))
+        pos = self._pos(params.get('pos'), state.lists.values())
+        board_list = self._new_list(state, params['name'], pos)
+        if params.get('idListSource'):
+            source_state, source = self._find('lists', params['idListSource'])
+            for card in list(source_state.list_cards[source['id']]):
+                self._new_card(state, board_list, dict(card, idLabels=list(card['idLabels'])))
+        self._add_action(state, 'createList', {'list': {'id': board_list['id'],
+                                                        'name': board_list['name']}})
+        return dict(board_list)
+
+    def _new_card(self, state, board_list, params):
+        card_id = self._new_id()
+        card = {'id': card_id, 'idBoard': state.board['id'], 'idList': board_list['id'],
+                'name': params.get('name', ''), 'desc': params.get('desc') or '',
+                'closed': False, 'pos': self._pos(params.get('pos'),
+                                                  state.list_cards[board_list['id']]),
+                'due': params.get('due'),
+                'idLabels': [label_id for label_id in params.get('idLabels', [])
+                             if label_id in state.labels],
+                'idMembers': [], 'subscribed': False,
+                'shortLink': hashlib.md5(card_id.encode('ascii')).hexdigest()[:8],
+                'dateLastActivity': _now(), 'badges': {'comments': 0}}
+        state.add_card(card)
+        self._created[card_id] = state.board['id']
+        return card
+
+    def _create_card(self, params):
+        try:
+            state, board_list = self._find('lists', params.get('idList', ''))
+        except _Error:
+            raise _Error(400, 'invalid value for idList')
+        state.dirty = True
+        card_params = dict(params)
+        card_params['idLabels'] = [i for i in params.get('idLabels', '').split(',') if i]
+        action_type = 'createCard'
+        if params.get('idCardSource'):
+            source_state, source = self._find('cards', params['idCardSource'])
+            card_params.setdefault('name', source['name'])
+            card_params.setdefault('desc', source['desc'])
+            if not card_params['idLabels']:
+                card_params['idLabels'] = list(source['idLabels'])
+            action_type = 'copyCard'
+        card = self._new_card(state, board_list, card_params)
+        self._add_action(state, action_type, {
+            'card': {'id': card['id'], 'name': card['name'], 'shortLink': card['shortLink']},
+            'list': {'id': board_list['id'], 'name': board_list['name']}})
+        return state.card_out(card)
+
+    def _create_comment(self, card_id, params):
+        state, card = self._find('cards', card_id)
+        if not params.get('text'):
+            raise _Error(400, 'invalid value for text')
+        card['badges']['comments'] += 1
+        board_list = state.lists[card['idList']]
+        return self._add_action(state, 'commentCard', {
+            'text': params['text'],
+            'card': {'id': card['id'], 'name': card['name'], 'shortLink': card['shortLink']},
+            'list': {'id': board_list['id'], 'name': board_list['name']}})
+
+    def _create_label(self, params):
+        state = self._changed(params.get('idBoard', ''))
+        color = params.get('color')
+        if color not in LABEL_COLORS + ('null', None):
+            raise _Error(400, 'invalid value for color')
+        label = {'id': self._new_id(), 'idBoard': state.board['id'],
+                 'name': params.get('name', ''), 'color': _color(color)}
+        state.labels[label['id']] = label
+        self._created[label['id']] = state.board['id']
+        self._add_action(state, 'createLabel', {'label': dict(label)})
+        return dict(label)
+
+    def _create_webhook(self, params, token):
+        if not params.get('callbackURL') or not params.get('idModel'):
+            raise _Error(400, 'invalid value for callbackURL or idModel')
+        webhook = {'id': self._new_id(), 'description': params.get('description', ''),
+                   'idModel': params['idModel'], 'callbackURL': params['callbackURL'],
+                   'active': True, '_token': token}
+        self._webhooks[webhook['id']] = webhook
+        return dict(webhook)
+
+    @staticmethod
+    def _apply(obj, params, fields):
+        """Set <fields> of <obj> from <params>. Returns (new, old) values."""
+        new, old = {}, {}
+        for field, convert in fields.items():
+            if field not in params:
+                continue
+            value = convert(params[field])
+            if obj.get(field) != value:
+                old[field] = obj.get(field)
+                obj[field] = new[field] = value
+        return new, old
+
+    def _update_board(self, board_id, params):
+        state = self._changed(board_id)
+        new, old = self._apply(state.board, params, {'name': '{}'.format,
+                                                     'desc': '{}'.format, 'closed': _bool})
+        if new:
+            board = dict(state.ref(), **new)
+            self._add_action(state, 'updateBoard', {'board': board, 'old': old})
+        return dict(state.board)
+
+    def _update_list(self, list_id, params):
+        state, board_list = self._find('lists', list_id)
+        state.dirty = True
+        new, old = self._apply(board_list, params, {'name': '{}'.format, 'closed': _bool,
+                                                    'subscribed': _bool})
+        if 'pos' in params:
+            old['pos'] = board_list['pos']
+            board_list['pos'] = new['pos'] = self._pos(params['pos'], state.lists.values())
+        if new:
+            data = {'list': dict(new, id=list_id, name=board_list['name']), 'old': old}
+            self._add_action(state, 'updateList', data)
+        return dict(board_list)
+
+    def _update_card(self, card_id, params):
+        state, card = self._find('cards', card_id)
+        state.dirty = True
+        old_list = state.lists[card['idList']]
+        new, old = self._apply(card, params, {
+            'name': '{}'.format, 'desc': '{}'.format, 'closed': _bool, 'subscribed': _bool,
+            'due': lambda value: value or None})
+        if 'pos' in params:
+            old['pos'] = card['pos']
+            card['pos'] = new['pos'] = self._pos(params['pos'], state.list_cards[card['idList']])
+        ref = {'id': card_id, 'name': card['name'], 'shortLink': card['shortLink']}
+        data = {'card': dict(ref, **new), 'old': old}
+        list_id = params.get('idList')
+        if list_id and list_id != card['idList']:
+            if list_id not in state.lists:
+                raise _Error(400, 'invalid value for idList')
+            state.move_card(card, list_id)
+            new_list = state.lists[list_id]
+            data['card']['idList'] = list_id
+            data['old']['idList'] = old_list['id']
+            data['listBefore'] = {'id': old_list['id'], 'name': old_list['name']}
+            data['listAfter'] = {'id': new_list['id'], 'name': new_list['name']}
+        if len(data['card']) > len(ref):
+            card['dateLastActivity'] = _now()
+            self._add_action(state, 'updateCard', data)
+        if 'idLabels' in params:
+            label_ids = [i for i in params['idLabels'].split(',') if i in state.labels]
+            for label_id in label_ids:
+                if label_id not in card['idLabels']:
+                    self._add_action(state, 'addLabelToCard', {
+                        'card': dict(ref), 'label': dict(state.labels[label_id])})
+            for label_id in card['idLabels']:
+                if label_id not in label_ids:
+                    self._add_action(state, 'removeLabelFromCard', {
+                        'card': dict(ref), 'label': dict(state.labels[label_id])})
+            card['idLabels'] = label_ids
+        return state.card_out(card)
+
+    def _update_label(self, label_id, params):
+        state, label = self._find('labels', label_id)
+        state.dirty = True
+        new, old = self._apply(label, params, {'name': '{}'.format, 'color': _color})
+        if new:
+            self._add_action(state, 'updateLabel', {'label': dict(new, id=label_id),
+                                                    'old': old})
+        return dict(label)
+
+    def _update_comment(self, action_id, params):
+        state, action = self._find('actions', action_id)
+        if action['type'] != 'commentCard':
+            raise _Error(400, 'Only comments can be edited')
+        state.dirty = True
+        old_text = action['data']['text']
+        action['data']['text'] = '{}'.format(params.get('text', ''))
+        self._add_action(state, 'updateComment', {
+            'action': {'id': action_id, 'text': action['data']['text']},
+            'card': dict(action['data']['card']), 'old': {'text': old_text}})
+        return dict(action)
+
+    def _delete_board(self, board_id, params):
+        self._board_state(board_id, contents=False)
+        self._boards.pop(board_id, None)
+        self._deleted.add(board_id)
+        return {'_value': None}
+
+    def _delete_card(self, card_id, params):
+        state, card = self._find('cards', card_id)
+        state.dirty = True
+        for action in list(state.card_actions.get(card_id, [])):
+            state.remove_action(action)
+        state.remove_card(card)
+        self._add_action(state, 'deleteCard', {'card': {'id': card_id},
+                                               'list': {'id': card['idList']}})
+        return {'limits': {}}
+
+    def _delete_label(self, label_id, params):
+        state, label = self._find('labels', label_id)
+        state.dirty = True
+        del state.labels[label_id]
+        for card in state.cards.values():
+            if label_id in card['idLabels']:
+                card['idLabels'].remove(label_id)
+        self._add_action(state, 'deleteLabel', {'label': {'id': label_id}})
+        return {'limits': {}}
+
+    def _delete_comment(self, action_id, params):
+        state, action = self._find('actions', action_id)
+        if action['type'] != 'commentCard':
+            raise _Error(400, 'Only comments can be deleted')
+        state.dirty = True
+        state.remove_action(action)
+        card = state.cards.get(action['data']['card']['id'])
+        if card is not None:
+            card['badges']['comments'] -= 1
+        self._add_action(state, 'deleteComment', {'action': {'id': action_id},
+                                                  'card': dict(action['data']['card'])})
+        return {'limits': {}}
+
+    def _delete_webhook(self, webhook_id, params):
+        if self._webhooks.pop(webhook_id, None) is None:
+            raise _Error(404, NOT_FOUND)
+        return {'_value': None}
+
+    def __repr__(self):
+        return '<simpletrello.fakeserver.FakeTrello ({}, {} requests)>'.format(
+            self.workspace, self.request_count)
+
+
+class FakeTrelloSession(object):
+    """Session-like object answering from a FakeTrello in the same process,
+    for TrelloClient(session=...). Skips HTTP entirely.
+    """
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        parsed = urlparse(url)
+        # As requests does: values are sent as strings, and None leaves a param out.
+        params = dict((k, '{}'.format(v)) for k, v in (params or {}).items() if v is not None)
+        params.update(parse_qsl(parsed.query))
+        status, response_headers, body = self.fake.handle(method, parsed.path, params, headers)
+        return make_response(status, body, response_headers, url)
+
+    def close(self):
+        pass
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeTrelloServer(object):
+    """Serve a FakeTrello over HTTP on a background thread, one thread per
+    connection. Point clients at <base_url>.
+    """
+
+    def __init__(self, fake, host='127.0.0.1', port=0):
+        self.fake = fake
+        self.host = host
+        self.port = port
+        self.server = None
+        self._thread = None
+
+    def start(self):
+        """Listen on a background thread. Returns self."""
+        self.server = _ThreadingHTTPServer((self.host, self.port), _FakeTrelloHandler)
+        self.server.fake = self.fake
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self._thread.join()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return 'http://{}:{}/1'.format(self.host, self.port)
+
+    def __repr__(self):
+        return '<simpletrello.fakeserver.FakeTrelloServer ({})>'.format(self.base_url)
+
+
+class _FakeTrelloHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled client connections are reused as with Trello.
+    protocol_version = 'HTTP/1.1'
+
+    def _handle(self):
+        parsed = urlparse(self.path)
+        params = dict(parse_qsl(parsed.query, keep_blank_values=True))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            params.update(parse_qsl(self.rfile.read(length).decode('utf-8')))
+        status, headers, body = self.server.fake.handle(
+            self.command, parsed.path, params, dict(self.headers.items()))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
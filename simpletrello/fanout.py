@@ -0,0 +1,45 @@
+# coding: utf-8
+"""fanout.py"""
+
+from __future__ import print_function, unicode_literals
+
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class ItemResult(namedtuple('ItemResult', ['item', 'value', 'error'])):
+    """Outcome of running a function on one input item.
+    Exactly one of <value> and <error> is meaningful, according to <ok>.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _call(fn, item):
+    try:
+        return ItemResult(item, fn(item), None)
+    except Exception as error:
+        return ItemResult(item, None, error)
+
+
+def imap_bounded(fn, items, max_workers=DEFAULT_MAX_WORKERS, window=None):
+    """Yield an ItemResult for fn(item) for each of <items>, in input order.
+
+    Runs on <max_workers> threads, reading <items> lazily so that at most
+    <window> calls (default: twice the workers) are queued or running at once.
+    Exceptions are caught per item and returned in ItemResult.error.
+    """
+    window = window or max_workers * 2
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            pending.append(executor.submit(_call, fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,75 @@
+# coding: utf-8
+"""identitymap.py"""
+
+from __future__ import print_function, unicode_literals
+
+import threading
+import weakref
+
+
+class IdentityMap(object):
+    """Map (model class, Trello id) to the one live object for it.
+
+    Values are held weakly, so objects disappear from the map once nothing
+    else references them.
+    """
+
+    def __init__(self):
+        self._objects = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, key):
+        return key in self._objects
+
+    def get(self, cls, obj_id):
+        """Return the live <cls> instance with <obj_id>, or None."""
+        return self._objects.get((cls, obj_id))
+
+    def add(self, obj):
+        """Register <obj>, unless an object with its class and id already is.
+
+        Returns
+        -------
+        obj: TrelloObject
+            The registered object, which may be an older one.
+        """
+        if obj.id is None:
+            return obj
+        with self._lock:
+            return self._objects.setdefault((type(obj), obj.id), obj)
+
+    def hydrate(self, client, cls, source_data, **kwargs):
+        """Return the <cls> instance for <source_data>.
+
+        If one is already live, its fields are updated from <source_data> and
+        it is returned; otherwise a new instance is built with <kwargs>. The
+        lookup and the insert happen under one lock, so two threads hydrating
+        the same id get the same object, and only one of them sees it as new.
+
+        Returns
+        -------
+        (obj, new): (TrelloObject, bool)
+        """
+        obj_id = source_data.get('id')
+        with self._lock:
+            existing = self._objects.get((cls, obj_id))
+            if existing is None:
+                obj = cls(client, source_data, **kwargs)
+                if obj.id is not None:
+                    self._objects[(cls, obj.id)] = obj
+                return obj, True
+        existing._update_from_source(source_data)
+        return existing, False
+
+    def discard(self, obj):
+        with self._lock:
+            key = (type(obj), obj.id)
+            if self._objects.get(key) is obj:
+                del self._objects[key]
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
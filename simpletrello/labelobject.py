@@ -7,15 +7,27 @@ from simpletrello.trelloobject import TrelloObject
 
 class Label(TrelloObject):
 
+    __slots__ = ('_id', '_id_board', '_name', '_color', '_board')
+
+    _api_path = 'labels'
+
+    _source_fields = {
+        'id': '_id',
+        'idBoard': '_id_board',
+        'name': '_name',
+        'color': '_color',
+    }
+
     def __init__(self, client, source_data=None):
         super(Label, self).__init__(client, source_data)
-        self._populate_from_source(self.source_data)
+        self._populate_from_source(source_data)
 
     def _populate_from_source(self, source_data):
         self._id = source_data.get('id')
         self._id_board = source_data.get('idBoard')
         self._name = source_data.get('name')
         self._color = source_data.get('color')
+        self._board = None
 
     @property
     def id(self):
@@ -25,15 +37,20 @@ class Label(TrelloObject):
     def id_board(self):
         return self._id_board
 
+    @property
+    def board(self):
+        """The <Board> this label belongs to."""
+        if self._board is None:
+            self._board = self.client.get_board(self._id_board)
+        return self._board
+
     @property
     def name(self):
         return self._name
 
     @name.setter
     def name(self, value):
-        response = self.put(['labels', self.id], params={'name': value})
-        if response['name'] == value:
-            self._name = value
+        self._write({'name': value})
 
     @property
     def color(self):
@@ -41,9 +58,7 @@ class Label(TrelloObject):
 
     @color.setter
     def color(self, value):
-        response = self.put(['labels', self.id], params={'color': value})
-        if response['color'] == value:
-            self._color = value
+        self._write({'color': value})
 
     def __repr__(self):
         name = self.name if len(self.name) > 0 else '<unnamed>'
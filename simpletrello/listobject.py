@@ -4,21 +4,39 @@
 from __future__ import print_function, unicode_literals
 
 from simpletrello.trelloobject import TrelloObject
+from simpletrello.utils import intern_ids
 
 
 class List(TrelloObject):
+
+    __slots__ = ('_id', '_id_board', '_name', '_pos', '_subscribed', '_closed',
+                 '_cards', '_board', '_full_data_cache')
+
+    _api_path = 'lists'
+
+    _source_fields = {
+        'id': '_id',
+        'idBoard': '_id_board',
+        'name': '_name',
+        'pos': '_pos',
+        'subscribed': '_subscribed',
+        'closed': '_closed',
+    }
+
     def __init__(self, client, source_data=None, with_cards=False):
-        super(List, self).__init__(client, source_data=None)
+        super(List, self).__init__(client, source_data=source_data)
+        self._full_data_cache = None
         self._populate_from_source(source_data=source_data, with_cards=with_cards)
 
     def _populate_from_source(self, source_data, with_cards):
         self._id = source_data.get('id')
-        self._id_board = source_data.get('idBoard')
+        self._id_board = intern_ids(source_data.get('idBoard'))
         self._name = source_data.get('name')
         self._pos = source_data.get('pos')
         self._subscribed = source_data.get('subscribed')
         self._closed = source_data.get('closed')
         self._cards = None
+        self._board = None
         if with_cards:
             self._get_cards()
 
@@ -28,6 +46,7 @@ class List(TrelloObject):
 
     @property
     def id_board(self):
+        self._ensure_loaded('idBoard')
         return self._id_board
 
     @id_board.setter
@@ -36,16 +55,16 @@ class List(TrelloObject):
 
     @property
     def name(self):
+        self._ensure_loaded('name')
         return self._name
 
     @name.setter
     def name(self, value):
-        response = self.put(['lists', self.id], params={'name': value})
-        if response['name'] == value:
-            self._name = value
+        self._write({'name': value})
 
     @property
     def closed(self):
+        self._ensure_loaded('closed')
         return self._closed
 
     @closed.setter
@@ -59,28 +78,40 @@ class List(TrelloObject):
 
     @property
     def pos(self):
+        self._ensure_loaded('pos')
         return self._pos
 
     @pos.setter
     def pos(self, value):
         raise NotImplementedError
 
+    @property
+    def board(self):
+        """The <Board> this list belongs to."""
+        self._ensure_loaded('idBoard')
+        if self._board is None:
+            self._board = self.client.get_board(self.id_board)
+        return self._board
+
     @property
     def cards(self):
-        if not self._cards:
+        if self._cards is None:
             self._get_cards()
         return self._cards
 
     @property
     def subscribed(self):
+        self._ensure_loaded('subscribed')
         if self._subscribed is not None:
             return self._subscribed
         self.refresh_full_data()
         return self._subscribed
 
     def refresh_full_data(self):
-        self._full_data_cache = self.client.get_list(self.id, fields='all', raw=True)
-        self._populate_from_source(self._full_data_cache)
+        self._full_data_cache = self.client.get_list(
+            self.id, fields='all', raw=True, conditional=True)
+        self._update_from_source(self._full_data_cache)
+        self._loaded = None
 
     def create_card(
             self,
@@ -90,6 +121,12 @@ class List(TrelloObject):
         response = self.client.create_card(card_name, self.id)
         return response
 
+    def archive(self):
+        self._write({'closed': 'true'})
+
+    def unarchive(self):
+        self._write({'closed': 'false'})
+
     def _get_cards(self):
         self._cards = self.client.get_cards(list_id=self.id)
 
@@ -101,4 +138,4 @@ class List(TrelloObject):
         return new_list
 
     def __repr__(self):
-        return('<simpletrello.listobject.List ({}, {})>'.format(self.name, self.id))
+        return('<simpletrello.listobject.List ({}, {})>'.format(self._name, self.id))
@@ -0,0 +1,76 @@
+# coding: utf-8
+"""lookup.py"""
+
+from __future__ import print_function, unicode_literals
+
+import threading
+
+
+def normalize_name(name):
+    """Case and whitespace insensitive form of <name>, for lookups."""
+    return ' '.join((name or '').split()).lower()
+
+
+def only_one(matches, kind, name):
+    """The single item of <matches>. Raise ValueError if there is none, or more than one."""
+    if not matches:
+        raise ValueError('No {} named {!r}.'.format(kind, name))
+    if len(matches) > 1:
+        raise ValueError('More than one {} named {!r}.'.format(kind, name))
+    return matches[0]
+
+
+class NameIndex(object):
+    """Objects by id, and open objects by normalized name.
+
+    Objects are added and re-keyed one at a time, so the index can follow
+    renames and archiving without being rebuilt.
+    """
+
+    def __init__(self, objects=()):
+        self._by_id = {}
+        self._by_name = {}
+        self._keys = {}
+        self._lock = threading.RLock()
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, obj):
+        """Add <obj>, or re-key it under its current name."""
+        with self._lock:
+            self.discard(obj)
+            self._by_id[obj.id] = obj
+            # Read _closed and _name rather than closed and name, which may
+            # make a request. An object without its name yet is re-keyed when
+            # the name loads.
+            if not getattr(obj, '_closed', None) and obj._name is not None:
+                key = normalize_name(obj._name)
+                self._keys[obj.id] = key
+                self._by_name.setdefault(key, []).append(obj)
+
+    def discard(self, obj):
+        with self._lock:
+            self._by_id.pop(obj.id, None)
+            key = self._keys.pop(obj.id, None)
+            if key is None:
+                return
+            matches = [other for other in self._by_name[key] if other.id != obj.id]
+            if matches:
+                self._by_name[key] = matches
+            else:
+                del self._by_name[key]
+
+    def get(self, obj_id):
+        """The object with <obj_id>, or None."""
+        return self._by_id.get(obj_id)
+
+    def find(self, name):
+        """Open objects named <name>, ignoring case and extra whitespace."""
+        return list(self._by_name.get(normalize_name(name), ()))
+
+    def one(self, name, kind='object'):
+        """The single open object named <name>. See only_one()."""
+        return only_one(self.find(name), kind, name)
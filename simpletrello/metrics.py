@@ -0,0 +1,233 @@
+# coding: utf-8
+"""metrics.py"""
+
+from __future__ import print_function, unicode_literals
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+
+from simpletrello.utils import listify
+
+# time.perf_counter is Python 3 only.
+clock = getattr(time, 'perf_counter', time.time)
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+# Modules whose methods and properties are reported as RequestRecord.via.
+MODEL_FILES = ('boardobject.py', 'cardobject.py', 'commentobject.py', 'labelobject.py',
+               'listobject.py', 'trelloobject.py')
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+
+class RequestRecord(namedtuple('RequestRecord', [
+        'method', 'path', 'status', 'latency', 'bytes', 'retries', 'caller', 'via', 'lazy',
+        'error'])):
+    """One request sent by the client, passed to request hooks.
+
+    method: 'get' | 'post' | 'put' | 'delete'
+    path: templated path with ids replaced, e.g. '/boards/{id}/cards'
+    status: HTTP status, or None if no response was received
+    latency: seconds, including rate limit waits and 429 retries
+    bytes: size of the response body
+    retries: times the request was resent after a 429
+    caller: 'file.py:line in function' of the first frame outside simpletrello
+    via: 'Class.member' of the model method or property that made the request,
+        e.g. 'Board.closed', or None for direct client calls
+    lazy: True if <via> is a property, i.e. the request was an implicit fetch
+    error: the exception raised, if the request failed
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400
+
+
+def template_path(path_parts):
+    """'/boards/{id}/cards' for ['boards', '5a1...', 'cards'].
+    Every second part is an id, as in define_url().
+    """
+    parts = listify(path_parts)
+    return '/' + '/'.join('{id}' if i % 2 else part for i, part in enumerate(parts))
+
+
+def find_caller():
+    """Return (caller, via, lazy) for the current request, see RequestRecord."""
+    frame = sys._getframe(1)
+    via, lazy = None, False
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not os.path.abspath(filename).startswith(PACKAGE_DIR):
+            caller = '{}:{} in {}'.format(
+                os.path.basename(filename), frame.f_lineno, frame.f_code.co_name)
+            return caller, via, lazy
+        if os.path.basename(filename) in MODEL_FILES and 'self' in frame.f_locals:
+            # Keep the outermost model frame: Board.closed, not TrelloObject.get.
+            cls = type(frame.f_locals['self'])
+            name = frame.f_code.co_name
+            via = '{}.{}'.format(cls.__name__, name)
+            lazy = isinstance(getattr(cls, name, None), property)
+        frame = frame.f_back
+    return None, via, lazy
+
+
+class _PathStats(object):
+
+    __slots__ = ('count', 'errors', 'bytes', 'retries', 'latency_sum', 'buckets', 'statuses')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.retries = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.statuses = Counter()
+
+    def add(self, record):
+        self.count += 1
+        self.errors += not record.ok
+        self.bytes += record.bytes or 0
+        self.retries += record.retries
+        self.latency_sum += record.latency
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if record.latency <= bound:
+                self.buckets[i] += 1
+                break
+        self.statuses[record.status] += 1
+
+
+def _percentile(buckets, q):
+    """Estimate the <q> quantile (0-1) from bucket counts, interpolating
+    linearly within the bucket it falls in.
+    """
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    lower = 0.0
+    for count, upper in zip(buckets, LATENCY_BUCKETS):
+        if count and seen + count >= rank:
+            if upper == float('inf'):
+                return lower
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+        lower = upper
+    return lower
+
+
+def _escape(value):
+    return '{}'.format(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join('{}="{}"'.format(name, _escape(value))
+                          for name, value in sorted(labels.items())) + '}'
+
+
+class MetricsAggregator(object):
+    """Request hook collecting counts, bytes, retries and a latency histogram
+    per method and templated path, and counts per caller.
+
+    >>> metrics = MetricsAggregator()
+    >>> trello.add_request_hook(metrics)
+    >>> metrics.summary()[0]
+    {'method': 'get', 'path': '/boards/{id}', 'count': 120, 'p50': 0.08, ...}
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._callers = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        with self._lock:
+            stats = self._stats.get((record.method, record.path))
+            if stats is None:
+                stats = self._stats[(record.method, record.path)] = _PathStats()
+            stats.add(record)
+            self._callers[record.via or record.caller] += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._callers.clear()
+
+    def percentile(self, q, method=None, path=None):
+        """Latency in seconds at quantile <q> (e.g. 0.99), over all requests or
+        those matching <method> and <path>. None if there are none.
+        """
+        with self._lock:
+            buckets = [0] * len(LATENCY_BUCKETS)
+            for (stats_method, stats_path), stats in self._stats.items():
+                if method in (None, stats_method) and path in (None, stats_path):
+                    buckets = [a + b for a, b in zip(buckets, stats.buckets)]
+        return _percentile(buckets, q)
+
+    def summary(self):
+        """One dict per method and path, most total time first."""
+        with self._lock:
+            rows = [{
+                'method': method,
+                'path': path,
+                'count': stats.count,
+                'errors': stats.errors,
+                'bytes': stats.bytes,
+                'retries': stats.retries,
+                'total_latency': stats.latency_sum,
+                'p50': _percentile(stats.buckets, 0.5),
+                'p90': _percentile(stats.buckets, 0.9),
+                'p99': _percentile(stats.buckets, 0.99),
+            } for (method, path), stats in self._stats.items()]
+        rows.sort(key=lambda row: -row['total_latency'])
+        return rows
+
+    def top_callers(self, n=10):
+        """[(via or caller, requests)] for the <n> callers making the most requests."""
+        with self._lock:
+            return self._callers.most_common(n)
+
+    def to_prometheus(self, prefix='simpletrello'):
+        """The metrics in Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines.append('# HELP {}_requests_total Requests sent to the Trello API.'.format(prefix))
+            lines.append('# TYPE {}_requests_total counter'.format(prefix))
+            for (method, path), stats in items:
+                for status, count in sorted(stats.statuses.items(),
+                                            key=lambda item: '{}'.format(item[0])):
+                    labels = _labels(method=method, path=path,
+                                     status='none' if status is None else status)
+                    lines.append('{}_requests_total{} {}'.format(prefix, labels, count))
+            for name, attr, help_text in (
+                    ('response_bytes_total', 'bytes', 'Bytes received from the Trello API.'),
+                    ('request_retries_total', 'retries', 'Requests resent after a 429.')):
+                lines.append('# HELP {}_{} {}'.format(prefix, name, help_text))
+                lines.append('# TYPE {}_{} counter'.format(prefix, name))
+                for (method, path), stats in items:
+                    lines.append('{}_{}{} {}'.format(
+                        prefix, name, _labels(method=method, path=path), getattr(stats, attr)))
+            name = '{}_request_duration_seconds'.format(prefix)
+            lines.append('# HELP {} Trello API request latency.'.format(name))
+            lines.append('# TYPE {} histogram'.format(name))
+            for (method, path), stats in items:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append('{}_bucket{} {}'.format(
+                        name, _labels(method=method, path=path, le=le), cumulative))
+                labels = _labels(method=method, path=path)
+                lines.append('{}_sum{} {!r}'.format(name, labels, stats.latency_sum))
+                lines.append('{}_count{} {}'.format(name, labels, stats.count))
+        return '\n'.join(lines) + '\n'
+
+    def __repr__(self):
+        return '<simpletrello.metrics.MetricsAggregator ({} paths)>'.format(len(self._stats))
@@ -0,0 +1,159 @@
+# coding: utf-8
+"""ratelimit.py"""
+
+from __future__ import print_function, unicode_literals
+
+import hashlib
+import random
+import threading
+import time
+
+# Trello allows 300 requests per 10 seconds for each API key
+# and 100 requests per 10 seconds for each token.
+KEY_LIMIT = (300, 10.0)
+TOKEN_LIMIT = (100, 10.0)
+
+# Fraction of the published limits to actually use.
+DEFAULT_HEADROOM = 0.95
+
+# Fraction of the limit that may go out back to back. The rest is spread
+# evenly over the period.
+DEFAULT_BURST = 0.1
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class TokenBucket(object):
+    """Thread safe token bucket.
+
+    At most capacity + rate * t tokens are taken in any t seconds.
+
+    Params
+    ------
+    capacity: float
+        Maximum number of tokens, i.e. the allowed burst.
+
+    rate: float
+        Tokens added per second.
+    """
+
+    def __init__(self, capacity, rate, clock=_clock):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens=1):
+        """Take <tokens> from the bucket, going into debt if needed.
+
+        Returns
+        -------
+        wait: float
+            Seconds the caller must wait before the tokens are really available.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def drain(self):
+        """Empty the bucket, e.g. after the server says we are over the limit."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiter(object):
+    """Paces requests against both the per key and the per token limits.
+
+    Each bucket holds a burst of <burst> times the limit and refills so
+    that burst and refill together stay within <headroom> times the limit
+    over any window of the limit's period.
+
+    Buckets are shared between every limiter created for the same key or
+    token in this process, so several clients using one key still stay under
+    the key limit together. They are looked up by a hash of the credential,
+    and limiters sharing one must agree on headroom, burst and clock.
+    """
+
+    _buckets = {}
+    _buckets_lock = threading.Lock()
+
+    def __init__(
+            self,
+            api_key,
+            token,
+            headroom=DEFAULT_HEADROOM,
+            burst=DEFAULT_BURST,
+            max_backoff=30.0,
+            clock=_clock,
+            sleep=time.sleep):
+        if not 0 <= burst < headroom:
+            raise ValueError('burst must be at least 0 and below headroom.')
+        self.headroom = headroom
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self.key_bucket = self._shared_bucket('key', api_key, KEY_LIMIT, clock)
+        self.token_bucket = self._shared_bucket('token', token, TOKEN_LIMIT, clock)
+
+    def _shared_bucket(self, kind, credential, limit, clock):
+        requests_allowed, period = limit
+        allowed = requests_allowed * self.headroom
+        capacity = min(max(1.0, requests_allowed * self.burst), allowed)
+        rate = (allowed - capacity) / period
+        name = hashlib.sha256('{}:{}'.format(kind, credential).encode('utf-8')).hexdigest()
+        with self._buckets_lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                bucket = TokenBucket(capacity, rate, clock=clock)
+                self._buckets[name] = bucket
+            elif (bucket.capacity, bucket.rate, bucket._clock) != (capacity, rate, clock):
+                raise ValueError(
+                    'A RateLimiter with another headroom, burst or clock already paces this '
+                    '{}. Pass that limiter to the client instead.'.format(kind))
+            return bucket
+
+    def acquire(self):
+        """Block until one request may be sent under both limits.
+
+        Returns
+        -------
+        waited: float
+            Seconds spent sleeping.
+        """
+        wait = max(self.key_bucket.reserve(), self.token_bucket.reserve())
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def backoff(self, attempt, retry_after=None):
+        """Sleep after a 429 response, with full jitter.
+
+        Params
+        ------
+        attempt: int
+            Zero based count of 429s already seen for this request.
+
+        retry_after: float
+            Value of a Retry-After header, if the server sent one.
+        """
+        self.key_bucket.drain()
+        self.token_bucket.drain()
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            ceiling = min(self.max_backoff, 2 ** attempt)
+            delay = random.uniform(ceiling / 2.0, ceiling)
+        self._sleep(delay)
+        return delay
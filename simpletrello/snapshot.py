@@ -0,0 +1,82 @@
+# coding: utf-8
+"""snapshot.py"""
+
+from __future__ import print_function, unicode_literals
+
+from simpletrello.boardobject import Board
+from simpletrello.cardobject import Card
+from simpletrello.commentobject import Comment
+from simpletrello.listobject import List
+
+# Trello returns at most 1000 nested actions.
+ACTIONS_LIMIT = 1000
+
+SNAPSHOT_PARAMS = {
+    'fields': 'all',
+    'lists': 'all',
+    'list_fields': 'all',
+    'cards': 'all',
+    'card_fields': 'all',
+    'labels': 'all',
+    'label_fields': 'all',
+    'labels_limit': 1000,
+    'actions': 'commentCard',
+    'actions_limit': ACTIONS_LIMIT,
+    'checklists': 'all',
+}
+
+
+def hydrate_board(client, source_data):
+    """Build the Board -> List -> Card -> Comment/Label graph from one nested
+    board response, setting back-references so no further requests are needed.
+
+    Cards share the Label instances of their board.
+
+    Comments come from the nested actions, which Trello caps at ACTIONS_LIMIT.
+    If the cap was hit, cards whose comment count does not match what was
+    returned keep their comments unloaded, to be fetched on first access.
+    """
+    board = client._hydrate(Board, source_data)
+
+    if board._labels is None:
+        board._labels = []
+    labels_by_id = {}
+    for label in board._labels:
+        label._board = board
+        labels_by_id[label.id] = label
+
+    comments_by_card = {}
+    for action in source_data.get('actions') or []:
+        comment = client._hydrate(Comment, action)
+        comments_by_card.setdefault(comment.id_card, []).append(comment)
+    truncated = len(source_data.get('actions') or []) >= ACTIONS_LIMIT
+
+    checklists_by_card = {}
+    for checklist in source_data.get('checklists') or []:
+        checklists_by_card.setdefault(checklist.get('idCard'), []).append(checklist)
+
+    lists = [client._hydrate(List, list_source) for list_source in source_data.get('lists') or []]
+    lists_by_id = {}
+    for board_list in lists:
+        board_list._board = board
+        board_list._cards = []
+        lists_by_id[board_list.id] = board_list
+    board._lists = lists
+
+    for card_source in source_data.get('cards') or []:
+        card = client._hydrate(Card, card_source)
+        card._board = board
+        card._labels = [labels_by_id.get(label.id, label) for label in card.labels]
+        card._checklists = checklists_by_card.get(card.id, [])
+        comments = comments_by_card.get(card.id, [])
+        expected = card_source.get('badges', {}).get('comments')
+        if not truncated or expected == len(comments):
+            card._comments = comments
+            for comment in comments:
+                comment._card = card
+        board_list = lists_by_id.get(card.id_list)
+        if board_list is not None:
+            card._list = board_list
+            board_list._cards.append(card)
+
+    return board
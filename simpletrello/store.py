@@ -0,0 +1,389 @@
+# coding: utf-8
+"""store.py"""
+
+from __future__ import print_function, unicode_literals
+
+import sqlite3
+import threading
+
+from simpletrello.boardobject import Board
+from simpletrello.cardobject import Card
+from simpletrello.listobject import List
+from simpletrello.snapshot import hydrate_board
+from simpletrello.sync import BoardSyncer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    closed INTEGER
+);
+CREATE TABLE IF NOT EXISTS lists (
+    id TEXT PRIMARY KEY,
+    id_board TEXT NOT NULL,
+    name TEXT,
+    closed INTEGER,
+    pos REAL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    id_board TEXT NOT NULL,
+    id_list TEXT,
+    name TEXT,
+    desc TEXT,
+    closed INTEGER,
+    pos REAL,
+    due TEXT,
+    date_last_activity TEXT,
+    short_link TEXT,
+    comments_loaded INTEGER
+);
+CREATE TABLE IF NOT EXISTS labels (
+    id TEXT PRIMARY KEY,
+    id_board TEXT NOT NULL,
+    name TEXT,
+    color TEXT
+);
+CREATE TABLE IF NOT EXISTS card_labels (
+    id_card TEXT NOT NULL,
+    id_label TEXT NOT NULL,
+    id_board TEXT NOT NULL,
+    PRIMARY KEY (id_card, id_label)
+);
+CREATE TABLE IF NOT EXISTS comments (
+    id TEXT PRIMARY KEY,
+    id_board TEXT NOT NULL,
+    id_card TEXT,
+    id_member_creator TEXT,
+    text TEXT,
+    date TEXT
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    id_board TEXT PRIMARY KEY,
+    since TEXT
+);
+CREATE INDEX IF NOT EXISTS lists_board ON lists (id_board);
+CREATE INDEX IF NOT EXISTS cards_board ON cards (id_board);
+CREATE INDEX IF NOT EXISTS cards_list ON cards (id_list);
+CREATE INDEX IF NOT EXISTS cards_due ON cards (due);
+CREATE INDEX IF NOT EXISTS cards_activity ON cards (date_last_activity);
+CREATE INDEX IF NOT EXISTS card_labels_label ON card_labels (id_label);
+CREATE INDEX IF NOT EXISTS card_labels_board ON card_labels (id_board);
+CREATE INDEX IF NOT EXISTS labels_board ON labels (id_board);
+CREATE INDEX IF NOT EXISTS comments_card ON comments (id_card);
+CREATE INDEX IF NOT EXISTS comments_board_date ON comments (id_board, date);
+"""
+
+BOARD_TABLES = ('lists', 'cards', 'labels', 'card_labels', 'comments')
+
+
+def _as_dicts(rows):
+    return [dict(row) for row in rows]
+
+
+def _action_targets(action):
+    """Yield (kind, id) for the objects <action> may have changed. Comments are
+    rewritten with their card, so a comment action yields its card.
+    """
+    data = action.get('data') or {}
+    if action.get('type') == 'updateBoard':
+        yield 'boards', (data.get('board') or {}).get('id')
+    for kind, key in (('lists', 'list'), ('cards', 'card'), ('labels', 'label')):
+        obj_id = (data.get(key) or {}).get('id')
+        if obj_id is not None:
+            yield kind, obj_id
+
+
+class LocalStore(object):
+    """SQLite replica of boards, lists, cards, labels and comments, for
+    reporting without spending API budget.
+
+    Boards are written from the model objects already in memory, so nothing
+    here triggers requests except sync_board().
+
+    Params
+    ------
+    path: str
+        Database file. ':memory:' for a throwaway store. File databases use
+        WAL mode, so readers in other processes are not blocked by syncs.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(SCHEMA)
+        self._syncers = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    ### WRITING
+
+    def save_board(self, board, since=None):
+        """Replace everything stored for <board> with its loaded graph.
+
+        Lists and labels are read from <board>, cards from its lists.
+        Comments are only written for cards whose comments are loaded.
+        Only fields already in memory are read, so no requests are made.
+        <since> is the last action id reflected, used by sync_board().
+        """
+        lists = board._lists or []
+        cards = [card for board_list in lists for card in board_list._cards or []]
+        with self._lock, self.conn:
+            for table in BOARD_TABLES:
+                self.conn.execute('DELETE FROM {} WHERE id_board = ?'.format(table), (board.id,))
+            self._write_board(board)
+            self._write_lists(board.id, lists)
+            self._write_labels(board.id, board._labels or [])
+            self._write_cards(board.id, cards)
+            self._write_since(board.id, since)
+
+    def save_actions(self, board, actions, since=None):
+        """Write the changes <actions> made to <board>, already applied by a
+        BoardSyncer, touching only the rows of the objects they name.
+
+        Objects an action names but that are no longer on <board> are
+        deleted, along with the cards of a removed list and the uses of a
+        removed label.
+        """
+        targets = {}
+        for action in actions:
+            for kind, obj_id in _action_targets(action):
+                targets.setdefault(kind, set()).add(obj_id)
+        lists = dict((l_.id, l_) for l_ in board._lists or [])
+        cards = dict((c.id, c) for l_ in lists.values() for c in l_._cards or [])
+        labels = dict((label.id, label) for label in board._labels or [])
+        with self._lock, self.conn:
+            if 'boards' in targets:
+                self._write_board(board)
+            for list_id in targets.get('lists', ()):
+                if list_id in lists:
+                    self._write_lists(board.id, [lists[list_id]])
+                    continue
+                self.conn.execute('DELETE FROM lists WHERE id = ?', (list_id,))
+                rows = self.conn.execute(
+                    'SELECT id FROM cards WHERE id_list = ? AND id_board = ?', (list_id, board.id))
+                targets.setdefault('cards', set()).update(
+                    row['id'] for row in rows if row['id'] not in cards)
+            for label_id in targets.get('labels', ()):
+                if label_id in labels:
+                    self._write_labels(board.id, [labels[label_id]])
+                else:
+                    self.conn.execute('DELETE FROM labels WHERE id = ?', (label_id,))
+                    self.conn.execute('DELETE FROM card_labels WHERE id_label = ?', (label_id,))
+            for card_id in targets.get('cards', ()):
+                card = cards.get(card_id)
+                self.conn.execute('DELETE FROM card_labels WHERE id_card = ?', (card_id,))
+                # Stored comments stay until the card's comments are loaded.
+                if card is None or card._comments is not None:
+                    self.conn.execute('DELETE FROM comments WHERE id_card = ?', (card_id,))
+                if card is not None:
+                    self._write_cards(board.id, [card])
+                else:
+                    self.conn.execute('DELETE FROM cards WHERE id = ?', (card_id,))
+            self._write_since(board.id, since)
+
+    def _write_board(self, board):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO boards (id, name, closed) VALUES (?, ?, ?)',
+            (board.id, board._name, bool(board._closed)))
+
+    def _write_lists(self, board_id, lists):
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO lists (id, id_board, name, closed, pos) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [(l_.id, board_id, l_._name, bool(l_._closed), l_._pos) for l_ in lists])
+
+    def _write_labels(self, board_id, labels):
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO labels (id, id_board, name, color) VALUES (?, ?, ?, ?)',
+            [(label.id, board_id, label._name, label._color) for label in labels])
+
+    def _write_cards(self, board_id, cards):
+        """Write <cards> with their labels and loaded comments."""
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO cards (id, id_board, id_list, name, desc, closed, pos, '
+            'due, date_last_activity, short_link, comments_loaded) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(c.id, board_id, c._id_list, c._name, c._desc, bool(c._closed), c._pos, c._due,
+              c._date_last_activity, c._short_link, c._comments is not None) for c in cards])
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO card_labels (id_card, id_label, id_board) VALUES (?, ?, ?)',
+            [(c.id, label_id, board_id) for c in cards for label_id in c._id_labels or []])
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO comments (id, id_board, id_card, id_member_creator, '
+            'text, date) VALUES (?, ?, ?, ?, ?, ?)',
+            [(comment.id, board_id, c.id, comment._id_member_creator, comment._text,
+              comment._date) for c in cards for comment in c._comments or []])
+
+    def _write_since(self, board_id, since):
+        if since is not None:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO sync_state (id_board, since) VALUES (?, ?)',
+                (board_id, since))
+
+    def load_board(self, client, board_id):
+        """Rebuild the Board graph for <board_id> from the store, without requests.
+
+        <client> must not have the board, its lists or its cards loaded: the
+        stored copy would overwrite fresher objects in memory. Raises a
+        ValueError if it does.
+
+        Returns
+        -------
+        (board, since): (Board, str)
+            None for board if it was never saved.
+        """
+        with self._lock:
+            board_row = self.conn.execute(
+                'SELECT * FROM boards WHERE id = ?', (board_id,)).fetchone()
+            if board_row is None:
+                return None, None
+            since = self.conn.execute(
+                'SELECT since FROM sync_state WHERE id_board = ?', (board_id,)).fetchone()
+            lists = self._select('lists', board_id, order='pos')
+            labels = self._select('labels', board_id)
+            cards = self._select('cards', board_id, order='pos')
+            card_labels = self._select('card_labels', board_id)
+            comments = self._select('comments', board_id, order='date DESC')
+        live = [(Board, board_id)]
+        live.extend((List, l_['id']) for l_ in lists)
+        live.extend((Card, c['id']) for c in cards)
+        if any(client.identity_map.get(cls, obj_id) is not None for cls, obj_id in live):
+            raise ValueError('Board {} is already loaded on this client.'.format(board_id))
+        label_sources = dict((l_['id'], {'id': l_['id'], 'idBoard': board_id, 'name': l_['name'],
+                                         'color': l_['color']}) for l_ in labels)
+        id_labels = {}
+        for row in card_labels:
+            id_labels.setdefault(row['id_card'], []).append(row['id_label'])
+        source = {
+            'id': board_id, 'name': board_row['name'], 'closed': bool(board_row['closed']),
+            'labels': list(label_sources.values()),
+            'lists': [{'id': l_['id'], 'idBoard': board_id, 'name': l_['name'],
+                       'closed': bool(l_['closed']), 'pos': l_['pos']} for l_ in lists],
+            'cards': [{'id': c['id'], 'idBoard': board_id, 'idList': c['id_list'],
+                       'name': c['name'], 'desc': c['desc'], 'closed': bool(c['closed']),
+                       'pos': c['pos'], 'due': c['due'],
+                       'dateLastActivity': c['date_last_activity'],
+                       'shortLink': c['short_link'], 'idLabels': id_labels.get(c['id'], []),
+                       'labels': [label_sources[i] for i in id_labels.get(c['id'], [])
+                                  if i in label_sources]}
+                      for c in cards],
+            'actions': [{'id': c['id'], 'type': 'commentCard', 'date': c['date'],
+                         'idMemberCreator': c['id_member_creator'],
+                         'data': {'text': c['text'], 'card': {'id': c['id_card']},
+                                  'board': {'id': board_id}}}
+                        for c in comments],
+        }
+        board = hydrate_board(client, source)
+        # Checklists are not stored, and comments only for some cards: leave
+        # those unloaded so they are fetched on first access.
+        not_loaded = set(c['id'] for c in cards if not c['comments_loaded'])
+        for board_list in board.lists:
+            for card in board_list._cards:
+                card._checklists = None
+                if card.id in not_loaded:
+                    card._comments = None
+        return board, since['since'] if since else None
+
+    def sync_board(self, client, board_id):
+        """Bring the stored copy of <board_id> up to date, and return its Board.
+
+        The first time, the board is loaded with one snapshot request. After
+        that, including in later processes, only actions newer than the last
+        sync are requested and applied. A client that already has the board
+        loaded starts again from a snapshot, see load_board().
+        """
+        syncer = self._syncers.get(board_id)
+        if syncer is None:
+            try:
+                board, since = self.load_board(client, board_id)
+            except ValueError:
+                board, since = None, None
+            if board is None or since is None:
+                syncer = BoardSyncer.from_snapshot(client, board_id)
+                self._syncers[board_id] = syncer
+                self.save_board(syncer.board, since=syncer.since)
+                return syncer.board
+            syncer = BoardSyncer(board, since=since)
+            self._syncers[board_id] = syncer
+        actions = syncer.sync()
+        self.save_actions(syncer.board, actions, since=syncer.since)
+        return syncer.board
+
+    def _select(self, table, board_id, order=None):
+        sql = 'SELECT * FROM {} WHERE id_board = ?'.format(table)
+        if order:
+            sql += ' ORDER BY {}'.format(order)
+        return _as_dicts(self.conn.execute(sql, (board_id,)))
+
+    ### QUERIES
+
+    def query(self, sql, params=()):
+        """Run any read query against the store, returning a list of dicts."""
+        with self._lock:
+            return _as_dicts(self.conn.execute(sql, params))
+
+    def cards_by_list(self, list_id, include_closed=False):
+        sql = 'SELECT * FROM cards WHERE id_list = ?'
+        if not include_closed:
+            sql += ' AND closed = 0'
+        return self.query(sql + ' ORDER BY pos', (list_id,))
+
+    def cards_by_label(self, label_id=None, label_name=None, board_id=None,
+                       include_closed=False):
+        """Cards carrying a label, given by id, or by name (optionally within a board)."""
+        if label_id is None and label_name is None:
+            raise ValueError('Pass label_id or label_name.')
+        sql = ('SELECT cards.* FROM cards '
+               'JOIN card_labels ON card_labels.id_card = cards.id '
+               'JOIN labels ON labels.id = card_labels.id_label WHERE 1 = 1')
+        params = []
+        if label_id is not None:
+            sql += ' AND labels.id = ?'
+            params.append(label_id)
+        if label_name is not None:
+            sql += ' AND lower(labels.name) = lower(?)'
+            params.append(label_name)
+        if board_id is not None:
+            sql += ' AND cards.id_board = ?'
+            params.append(board_id)
+        if not include_closed:
+            sql += ' AND cards.closed = 0'
+        return self.query(sql + ' ORDER BY cards.due', params)
+
+    def cards_due_between(self, start=None, end=None, board_id=None, include_closed=False):
+        """Cards with a due date in [start, end). Dates are ISO 8601 strings,
+        as Trello returns them, and either bound may be left open.
+        """
+        sql = 'SELECT * FROM cards WHERE due IS NOT NULL'
+        params = []
+        if start is not None:
+            sql += ' AND due >= ?'
+            params.append(start)
+        if end is not None:
+            sql += ' AND due < ?'
+            params.append(end)
+        if board_id is not None:
+            sql += ' AND id_board = ?'
+            params.append(board_id)
+        if not include_closed:
+            sql += ' AND closed = 0'
+        return self.query(sql + ' ORDER BY due', params)
+
+    def comments_for_card(self, card_id):
+        return self.query('SELECT * FROM comments WHERE id_card = ? ORDER BY date', (card_id,))
+
+    def __repr__(self):
+        return '<simpletrello.store.LocalStore ({})>'.format(self.path)
@@ -0,0 +1,307 @@
+# coding: utf-8
+"""sync.py"""
+
+from __future__ import print_function, unicode_literals
+
+from simpletrello.cardobject import Card
+from simpletrello.commentobject import Comment
+from simpletrello.labelobject import Label
+from simpletrello.listobject import List
+
+# Action type -> BoardSyncer method applying it.
+ACTION_HANDLERS = {
+    'updateBoard': '_update_board',
+    'createList': '_create_list',
+    'moveListToBoard': '_create_list',
+    'updateList': '_update_list',
+    'moveListFromBoard': '_remove_list',
+    'createCard': '_create_card',
+    'copyCard': '_create_card',
+    'convertToCardFromCheckItem': '_create_card',
+    'moveCardToBoard': '_create_card',
+    'updateCard': '_update_card',
+    'deleteCard': '_remove_card',
+    'moveCardFromBoard': '_remove_card',
+    'commentCard': '_create_comment',
+    'updateComment': '_update_comment',
+    'deleteComment': '_remove_comment',
+    'createLabel': '_create_label',
+    'updateLabel': '_update_label',
+    'deleteLabel': '_remove_label',
+    'addLabelToCard': '_add_card_label',
+    'removeLabelFromCard': '_remove_card_label_action',
+}
+
+# Default since of BoardSyncer: the board's newest action.
+LATEST = object()
+
+
+def latest_action_id(client, board_id):
+    """Id of the newest action on <board_id>, or None if it has none."""
+    # Conditional, so a client cache never answers with an old newest action.
+    latest = client._get(['boards', board_id, 'actions'], params={'limit': 1, 'fields': 'id'},
+                         conditional=True)
+    return latest[0]['id'] if latest else None
+
+
+class BoardSyncer(object):
+    """Keep an in-memory board graph current from the board's actions feed.
+
+    Start from a fully loaded board, usually with from_snapshot(), then call
+    sync() as often as needed. Each sync only requests actions newer than the
+    last one seen, and applies them to the Board/List/Card/Comment/Label
+    objects already in memory.
+
+    Params
+    ------
+    board: Board
+        A board whose lists, cards and labels are loaded, e.g. from
+        TrelloClient.load_board_snapshot().
+
+    since: str
+        Id of the last action already reflected in <board>. By default, the
+        board's newest action is read, taking <board> as current, so the
+        first sync does not replay the board's whole history. None replays
+        all of it.
+    """
+
+    def __init__(self, board, since=LATEST):
+        self.board = board
+        self.client = board.client
+        if since is LATEST:
+            since = latest_action_id(self.client, board.id)
+        self.since = since
+        self._lists = {}
+        self._cards = {}
+        self._index()
+
+    @classmethod
+    def from_snapshot(cls, client, board_id):
+        """Load <board_id> with load_board_snapshot() and return a syncer for it.
+
+        The latest action id is read before the snapshot, so actions racing
+        with the snapshot are applied again on the next sync, rather than lost.
+        """
+        since = latest_action_id(client, board_id)
+        board = client.load_board_snapshot(board_id)
+        return cls(board, since=since)
+
+    def _index(self):
+        self._lists = dict((board_list.id, board_list) for board_list in self.board.lists)
+        self._cards = {}
+        for board_list in self.board.lists:
+            for card in board_list._cards or []:
+                self._cards[card.id] = card
+
+    def fetch_new_actions(self):
+        """Return actions newer than <since>, oldest first."""
+        actions = list(self.client.iter_actions(
+            board_id=self.board.id, filter='all', since=self.since, conditional=True))
+        actions.reverse()
+        return actions
+
+    def sync(self):
+        """Fetch and apply new actions.
+
+        Returns
+        -------
+        actions: list
+            The actions applied, oldest first.
+        """
+        actions = self.fetch_new_actions()
+        for action in actions:
+            self.apply(action)
+        if actions:
+            self.since = actions[-1]['id']
+        return actions
+
+    def apply(self, action):
+        """Apply one action dict to the in-memory board. Unknown types are ignored.
+
+        Returns
+        -------
+        applied: bool
+        """
+        name = ACTION_HANDLERS.get(action.get('type'))
+        if name is None:
+            return False
+        getattr(self, name)(action.get('data', {}), action)
+        return True
+
+    ### BOARD
+
+    def _update_board(self, data, action):
+        self.board._update_from_source(data.get('board', {}))
+
+    ### LISTS
+
+    def _create_list(self, data, action):
+        list_data = data.get('list', {})
+        if list_data.get('id') in self._lists:
+            return
+        source = {'idBoard': self.board.id, 'closed': False}
+        source.update(list_data)
+        board_list = self.client._hydrate(List, source)
+        board_list._board = self.board
+        board_list._cards = []
+        self._lists[board_list.id] = board_list
+        self.board._lists.append(board_list)
+
+    def _update_list(self, data, action):
+        board_list = self._lists.get(data.get('list', {}).get('id'))
+        if board_list is not None:
+            board_list._update_from_source(data['list'])
+
+    def _remove_list(self, data, action):
+        board_list = self._lists.pop(data.get('list', {}).get('id'), None)
+        if board_list is None:
+            return
+        self.board._lists.remove(board_list)
+        for card in board_list._cards or []:
+            self._cards.pop(card.id, None)
+            self.client._notify('removed', card)
+        self.client._notify('removed', board_list)
+
+    ### CARDS
+
+    def _create_card(self, data, action):
+        card_data = data.get('card', {})
+        if card_data.get('id') in self._cards:
+            return
+        source = {'idBoard': self.board.id, 'closed': False, 'labels': [], 'idLabels': []}
+        if 'list' in data:
+            source['idList'] = data['list'].get('id')
+        source.update(card_data)
+        card = self.client._hydrate(Card, source)
+        card._board = self.board
+        card._comments = []
+        self._cards[card.id] = card
+        self._attach(card)
+
+    def _update_card(self, data, action):
+        card = self._cards.get(data.get('card', {}).get('id'))
+        if card is None:
+            return
+        old_list_id = card.id_list
+        card._update_from_source(data['card'])
+        if 'listAfter' in data:
+            card._id_list = data['listAfter'].get('id')
+        if card.id_list != old_list_id:
+            self._detach(card, old_list_id)
+            self._attach(card)
+
+    def _remove_card(self, data, action):
+        card = self._cards.pop(data.get('card', {}).get('id'), None)
+        if card is not None:
+            self._detach(card, card.id_list)
+            self.client._notify('removed', card)
+
+    def _attach(self, card):
+        board_list = self._lists.get(card.id_list)
+        card._list = board_list
+        if board_list is not None and board_list._cards is not None:
+            board_list._cards.append(card)
+
+    def _detach(self, card, list_id):
+        board_list = self._lists.get(list_id)
+        if board_list is not None and card in (board_list._cards or []):
+            board_list._cards.remove(card)
+
+    ### COMMENTS
+
+    def _create_comment(self, data, action):
+        card = self._cards.get(data.get('card', {}).get('id'))
+        if card is None or card._comments is None:
+            return
+        if any(comment.id == action.get('id') for comment in card._comments):
+            return
+        comment = self.client._hydrate(Comment, action)
+        comment._card = card
+        card._comments.append(comment)
+
+    def _update_comment(self, data, action):
+        comment = self._find_comment(data)
+        if comment is not None:
+            comment._text = data['action'].get('text')
+            comment._changed()
+
+    def _remove_comment(self, data, action):
+        comment = self._find_comment(data)
+        if comment is not None:
+            comment._card._comments.remove(comment)
+            self.client._notify('removed', comment)
+
+    def _find_comment(self, data):
+        card = self._cards.get(data.get('card', {}).get('id'))
+        comment_id = data.get('action', {}).get('id')
+        for comment in (card._comments or []) if card is not None else []:
+            if comment.id == comment_id:
+                comment._card = card
+                return comment
+        return None
+
+    ### LABELS
+
+    def _board_labels(self):
+        if self.board._labels is None:
+            self.board._labels = []
+        return self.board._labels
+
+    def _find_label(self, label_id):
+        for label in self._board_labels():
+            if label.id == label_id:
+                return label
+        return None
+
+    def _create_label(self, data, action):
+        label_data = data.get('label', {})
+        if self._find_label(label_data.get('id')) is not None:
+            return
+        source = {'idBoard': self.board.id}
+        source.update(label_data)
+        label = self.client._hydrate(Label, source)
+        label._board = self.board
+        self._board_labels().append(label)
+
+    def _update_label(self, data, action):
+        label = self._find_label(data.get('label', {}).get('id'))
+        if label is not None:
+            label._update_from_source(data['label'])
+
+    def _remove_label(self, data, action):
+        label = self._find_label(data.get('label', {}).get('id'))
+        if label is None:
+            return
+        self._board_labels().remove(label)
+        for card in self._cards.values():
+            self._remove_card_label(card, label.id)
+
+    def _add_card_label(self, data, action):
+        card = self._cards.get(data.get('card', {}).get('id'))
+        label_id = data.get('label', {}).get('id')
+        if card is None or label_id in (card._id_labels or []):
+            return
+        label = self._find_label(label_id)
+        if label is None:
+            self._create_label(data, action)
+            label = self._find_label(label_id)
+        card._id_labels = (card._id_labels or []) + [label_id]
+        card._labels = card._labels + [label]
+        card._changed()
+
+    def _remove_card_label_action(self, data, action):
+        card = self._cards.get(data.get('card', {}).get('id'))
+        if card is not None:
+            self._remove_card_label(card, data.get('label', {}).get('id'))
+
+    @staticmethod
+    def _remove_card_label(card, label_id):
+        labels = [label for label in card._labels if label.id != label_id]
+        if len(labels) == len(card._labels) and label_id not in (card._id_labels or []):
+            return
+        card._id_labels = [i for i in card._id_labels or [] if i != label_id]
+        card._labels = labels
+        card._changed()
+
+    def __repr__(self):
+        return '<simpletrello.sync.BoardSyncer ({}, since={})>'.format(self.board.id, self.since)
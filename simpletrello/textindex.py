@@ -0,0 +1,247 @@
+# coding: utf-8
+"""textindex.py"""
+
+from __future__ import print_function, unicode_literals
+
+import re
+import threading
+from bisect import bisect_left, insort
+
+from simpletrello.boardobject import Board
+from simpletrello.cardobject import Card
+from simpletrello.commentobject import Comment
+from simpletrello.listobject import List
+
+# Model class -> text attributes indexed for it. Values are read from the
+# private fields, so indexing never loads fields a projection left out.
+INDEXED_FIELDS = {
+    Board: ('name',),
+    List: ('name',),
+    Card: ('name', 'desc'),
+    Comment: ('text',),
+}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)', re.UNICODE)
+
+
+def tokenize(text):
+    """Lowercased word tokens of <text>."""
+    return [token.lower() for token in TOKEN_RE.findall(text or '')]
+
+
+def parse_query(query):
+    """Split <query> into terms.
+
+    Returns
+    -------
+    terms: list
+        (tokens, prefix) tuples. Quoted text and words joined by punctuation
+        become phrases of several tokens. A trailing * makes the last token of
+        a term match as a prefix.
+    """
+    terms = []
+    for phrase, word in QUERY_RE.findall(query):
+        text = phrase or word
+        prefix = text.endswith('*')
+        tokens = tokenize(text)
+        if tokens:
+            terms.append((tokens, prefix))
+    return terms
+
+
+class SearchIndex(object):
+    """In-process inverted index over board, list and card names, card
+    descriptions and comment text.
+
+    Build it from objects already loaded with add_board() or add(); nothing
+    here makes requests. Given a client, the index follows its change events,
+    so edits, syncs and deletions show up in results straight away.
+
+    >>> index = SearchIndex(trello)
+    >>> index.add_board(trello.load_board_snapshot('xJptH4LM'))
+    >>> index.search('"release notes" deploy*', types=Card)
+
+    Params
+    ------
+    client: TrelloClient
+        Client whose change events keep the index current. Optional.
+    """
+
+    def __init__(self, client=None):
+        self.client = client
+        self._lock = threading.RLock()
+        # token -> {(object key, field): [positions]}
+        self._postings = {}
+        # Every token in _postings, sorted for prefix lookups.
+        self._tokens = []
+        # object key -> (object, (token, field) pairs it was indexed under)
+        self._objects = {}
+        self._board_ids = set()
+        if client is not None:
+            client.add_listener(self._on_event)
+
+    def close(self):
+        """Stop following the client's change events."""
+        if self.client is not None:
+            self.client.remove_listener(self._on_event)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, obj):
+        return (type(obj), obj.id) in self._objects
+
+    ### BUILDING
+
+    def add_board(self, board):
+        """Index <board> and its loaded lists, cards and comments.
+
+        New objects on the board are indexed as the client loads them.
+        """
+        with self._lock:
+            self._board_ids.add(board.id)
+            self.add(board)
+            cards = list(board._cards or [])
+            for board_list in board._lists or []:
+                self.add(board_list)
+                cards.extend(board_list._cards or [])
+            for card in cards:
+                self.add(card)
+                for comment in card._comments or []:
+                    self.add(comment)
+
+    def add(self, obj):
+        """Index <obj>, replacing what was indexed for it before."""
+        fields = INDEXED_FIELDS.get(type(obj))
+        if fields is None:
+            raise TypeError('Cannot index {}.'.format(type(obj).__name__))
+        key = (type(obj), obj.id)
+        with self._lock:
+            self._remove_key(key)
+            tokens = set()
+            for field in fields:
+                doc = (key, field)
+                for position, token in enumerate(tokenize(getattr(obj, '_' + field))):
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        postings = self._postings[token] = {}
+                        insort(self._tokens, token)
+                    postings.setdefault(doc, []).append(position)
+                    tokens.add((token, field))
+            self._objects[key] = (obj, tokens)
+
+    def remove(self, obj):
+        with self._lock:
+            self._remove_key((type(obj), obj.id))
+
+    def _remove_key(self, key):
+        entry = self._objects.pop(key, None)
+        if entry is None:
+            return
+        for token, field in entry[1]:
+            postings = self._postings[token]
+            del postings[(key, field)]
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def _on_event(self, event, obj):
+        if type(obj) not in INDEXED_FIELDS:
+            return
+        if event == 'removed':
+            self.remove(obj)
+            return
+        board_id = obj.id if isinstance(obj, Board) else obj._id_board
+        if obj in self or board_id in self._board_ids:
+            self.add(obj)
+
+    ### SEARCHING
+
+    def search(self, query, types=None, fields=None, limit=None):
+        """Objects matching every term of <query>, best match first.
+
+        Matching is case insensitive. "Quoted words" match as a phrase, and a
+        trailing * matches a prefix, e.g. 'deploy*' finds 'deployment'.
+
+        Params
+        ------
+        query: str
+
+        types: class | tuple
+            Only return these model classes, e.g. Card or (Card, Comment).
+
+        fields: str | tuple
+            Only match in these attributes, e.g. 'name'.
+
+        limit: int
+            Return at most this many objects.
+
+        Returns
+        -------
+        results: list
+        """
+        if isinstance(types, type):
+            types = (types,)
+        if fields is not None and not isinstance(fields, (tuple, list, set)):
+            fields = (fields,)
+        terms = parse_query(query)
+        if not terms:
+            return []
+        with self._lock:
+            scores = None
+            for tokens, prefix in terms:
+                term_scores = self._match(tokens, prefix, types, fields)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = dict((key, score + term_scores[key])
+                                  for key, score in scores.items() if key in term_scores)
+                if not scores:
+                    return []
+            ranked = sorted(scores, key=lambda key: -scores[key])
+            return [self._objects[key][0] for key in ranked[:limit]]
+
+    def _match(self, tokens, prefix, types, fields):
+        """{object key: occurrences} for one term."""
+        candidates = None
+        for i, token in enumerate(tokens):
+            if prefix and i == len(tokens) - 1:
+                postings = self._prefix_postings(token)
+            else:
+                postings = self._postings.get(token, {})
+            docs = {}
+            for doc, positions in postings.items():
+                (cls, obj_id), field = doc
+                if types is not None and not issubclass(cls, types):
+                    continue
+                if fields is not None and field not in fields:
+                    continue
+                if candidates is None:
+                    docs[doc] = positions
+                elif doc in candidates:
+                    # Keep positions that directly follow the phrase so far.
+                    follow = candidates[doc].intersection(p - 1 for p in positions)
+                    if follow:
+                        docs[doc] = [p + 1 for p in follow]
+            candidates = dict((doc, set(positions)) for doc, positions in docs.items())
+            if not candidates:
+                return {}
+        scores = {}
+        for (key, field), positions in candidates.items():
+            scores[key] = scores.get(key, 0) + len(positions)
+        return scores
+
+    def _prefix_postings(self, prefix):
+        """Postings of every token starting with <prefix>, merged."""
+        merged = {}
+        for token in self._tokens[bisect_left(self._tokens, prefix):]:
+            if not token.startswith(prefix):
+                break
+            for doc, positions in self._postings[token].items():
+                merged.setdefault(doc, []).extend(positions)
+        return merged
+
+    def __repr__(self):
+        return '<simpletrello.textindex.SearchIndex ({} objects, {} tokens)>'.format(
+            len(self._objects), len(self._tokens))
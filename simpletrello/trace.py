@@ -0,0 +1,139 @@
+# coding: utf-8
+"""trace.py"""
+
+from __future__ import print_function, unicode_literals
+
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+from simpletrello.exceptions import ImplicitFetchError
+
+# Implicit fetches from one call site to one path, before they count as N+1.
+DEFAULT_THRESHOLD = 3
+
+SNAPSHOT = 'trello.load_board_snapshot(board_id) loads the whole board in one request'
+
+# Model property -> how to load the same data up front.
+SUGGESTIONS = {
+    'Board.lists': SNAPSHOT,
+    'Board.cards': SNAPSHOT,
+    'Board.labels': SNAPSHOT,
+    'Board.closed': 'trello.get_all_boards() returns closed with every board',
+    'Board.full_data': 'trello.fetch_many(board_ids, trello.get_board)',
+    'List.cards': 'trello.get_cards_by_lists(list_ids), or '
+                  'trello.get_board_lists(board_id, with_cards=True)',
+    'List.board': SNAPSHOT,
+    'List.subscribed': "trello.map_get([['lists', list_id] for list_id in list_ids])",
+    'Card.comments': 'trello.get_comments_by_cards(card_ids), or ' + SNAPSHOT,
+    'Card.checklists': SNAPSHOT,
+    'Card.list': SNAPSHOT,
+    'Card.board': SNAPSHOT,
+    'Comment.card': SNAPSHOT,
+    'Label.board': SNAPSHOT,
+}
+DEFAULT_SUGGESTION = 'trello.fetch_many() or trello.batch() to fetch them together'
+
+# For fields left out by a projection, loaded with a GET of the object itself.
+FIELD_SUGGESTION = 'request the field up front, with fields= or TrelloClient(default_fields=)'
+
+
+def suggest(via, path):
+    if via in SUGGESTIONS:
+        return SUGGESTIONS[via]
+    if path.count('/') == 2:
+        return FIELD_SUGGESTION
+    return DEFAULT_SUGGESTION
+
+
+ImplicitFetch = namedtuple('ImplicitFetch', ['via', 'method', 'path', 'caller'])
+
+
+class FetchPattern(namedtuple('FetchPattern', ['via', 'path', 'caller', 'count'])):
+    """Implicit fetches repeated from one call site, usually a loop."""
+    __slots__ = ()
+
+    @property
+    def suggestion(self):
+        return suggest(self.via, self.path)
+
+
+class Tracer(object):
+    """Record the requests model properties make on their own, such as
+    List.cards loading the list's cards on first access.
+
+    Use through TrelloClient.trace():
+
+    >>> with trello.trace() as tracer:
+    ...     for board_list in board.lists:
+    ...         print(len(board_list.cards))
+    Implicit fetches: 4, from 2 properties
+      List.cards: 3 x GET /lists/{id}/cards at report.py:12 in main
+        use trello.get_cards_by_lists(list_ids), or ...
+
+    Params
+    ------
+    strict: bool
+        Raise ImplicitFetchError instead of sending an implicit fetch.
+
+    threshold: int
+        Repeats from one call site to one path reported as N+1.
+
+    report: bool
+        Print report() to stderr on exit, if there were implicit fetches.
+    """
+
+    def __init__(self, client, strict=False, threshold=DEFAULT_THRESHOLD, report=True):
+        self.client = client
+        self.strict = strict
+        self.threshold = threshold
+        self.print_report = report
+        self.fetches = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.client._add_tracer(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.client._remove_tracer(self)
+        if self.print_report and self.fetches:
+            print(self.report(), file=sys.stderr)
+
+    def on_request(self, method, path, caller, via, lazy):
+        """Called by the client before each request is sent."""
+        if not lazy or method != 'get':
+            return
+        fetch = ImplicitFetch(via, method, path, caller)
+        if self.strict:
+            raise ImplicitFetchError('{} would GET {} at {}. Instead, {}.'.format(
+                via, path, caller, suggest(via, path)))
+        with self._lock:
+            self.fetches.append(fetch)
+
+    def patterns(self):
+        """FetchPatterns seen at least <threshold> times, most repeated first."""
+        counts = OrderedDict()
+        with self._lock:
+            for fetch in self.fetches:
+                key = (fetch.via, fetch.path, fetch.caller)
+                counts[key] = counts.get(key, 0) + 1
+        patterns = [FetchPattern(via, path, caller, count)
+                    for (via, path, caller), count in counts.items()
+                    if count >= self.threshold]
+        patterns.sort(key=lambda pattern: -pattern.count)
+        return patterns
+
+    def report(self):
+        """Human readable summary, with a bulk alternative for each N+1 pattern."""
+        properties = set(fetch.via for fetch in self.fetches)
+        lines = ['Implicit fetches: {}, from {} properties'.format(
+            len(self.fetches), len(properties))]
+        for pattern in self.patterns():
+            lines.append('  {}: {} x GET {} at {}'.format(
+                pattern.via, pattern.count, pattern.path, pattern.caller))
+            lines.append('    use {}'.format(pattern.suggestion))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return '<simpletrello.trace.Tracer ({} implicit fetches)>'.format(len(self.fetches))
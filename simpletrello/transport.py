@@ -0,0 +1,201 @@
+# coding: utf-8
+"""transport.py
+
+Record and replay HTTP traffic, to test and benchmark the client offline.
+
+Both transports stand in for the requests.Session a TrelloClient sends
+through, so they plug in with the session argument:
+
+>>> with RecordingTransport('board.jsonl') as recorder:
+...     TrelloClient(session=recorder).load_board_snapshot(board_id)
+>>> trello = TrelloClient(session=ReplayTransport('board.jsonl', latency=0.05))
+"""
+
+from __future__ import print_function, unicode_literals
+
+import io
+import json
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from simpletrello.exceptions import CassetteMiss
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+# Never written to a cassette, and ignored when matching requests.
+CREDENTIAL_PARAMS = ('key', 'token')
+
+# Response headers not worth keeping.
+DROPPED_HEADERS = ('set-cookie', 'content-encoding', 'transfer-encoding', 'connection')
+
+
+def _path(url):
+    """Path of <url>, so cassettes replay against any base_url."""
+    return urlparse(url).path
+
+
+def _match_params(params):
+    if params is None:
+        return None
+    params = dict((k, '' if v is None else '{}'.format(v)) for k, v in params.items()
+                  if k not in CREDENTIAL_PARAMS)
+    return tuple(sorted(params.items()))
+
+
+def make_response(status_code, body=b'', headers=None, url=''):
+    """Build a requests.Response from recorded parts."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = 'Too Many Requests' if status_code == 429 else ''
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = url
+    response.encoding = 'utf-8'
+    response._content = body if isinstance(body, bytes) else body.encode('utf-8')
+    response._content_consumed = True
+    return response
+
+
+class RecordingTransport(object):
+    """Send requests through <session> and append each interaction to the
+    cassette at <path>, one JSON object per line. Credentials are left out.
+
+    Params
+    ------
+    path: str
+        Cassette file. Appended to, so one cassette can span several runs.
+
+    session: requests.Session
+        Defaults to a new requests.Session.
+    """
+
+    def __init__(self, path, session=None):
+        self.path = path
+        self.session = session if session is not None else requests.Session()
+        self._file = io.open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        response = self.session.request(method, url, params=params, headers=headers, **kwargs)
+        record = {
+            'method': method.lower(),
+            'path': _path(url),
+            'params': dict(_match_params(params or {})),
+            'status': response.status_code,
+            'headers': dict((k, v) for k, v in response.headers.items()
+                            if k.lower() not in DROPPED_HEADERS),
+            'body': response.content.decode('utf-8'),
+        }
+        line = json.dumps(record, sort_keys=True, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+        return response
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayTransport(object):
+    """Answer requests from a cassette, without the network.
+
+    Requests match on method, path and params, ignoring credentials. Repeated
+    requests get the recorded responses in order, and then the last one
+    again. A request matching nothing raises CassetteMiss.
+
+    Params
+    ------
+    cassette: str | list
+        Path of a cassette written by RecordingTransport, or its records.
+        More can be added with add().
+
+    latency: float | callable
+        Seconds to wait before each response, or a function returning them.
+
+    throttle_every: int
+        Answer every nth request with a 429, as Trello does over its rate
+        limits. The request is not consumed, so a retry gets the real answer.
+
+    retry_after: float
+        Retry-After header of injected 429s. None to leave it out.
+    """
+
+    def __init__(self, cassette=None, latency=0.0, throttle_every=None, retry_after=1.0,
+                 sleep=time.sleep):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.throttled = 0
+        self._sleep = sleep
+        self._responses = {}
+        self._lock = threading.Lock()
+        if cassette is None:
+            cassette = []
+        elif not isinstance(cassette, list):
+            with io.open(cassette, encoding='utf-8') as f:
+                cassette = [json.loads(line) for line in f if line.strip()]
+        for record in cassette:
+            self._add_record(record)
+
+    def _add_record(self, record):
+        key = (record['method'], record['path'], _match_params(record.get('params')))
+        self._responses.setdefault(key, []).append(
+            [record['status'], record.get('headers') or {}, record['body']])
+
+    def add(self, method, path, body=None, params=None, status=200, headers=None):
+        """Answer <method> <path> with JSON <body>.
+
+        Params
+        ------
+        path: str
+            Full path, e.g. '/1/boards/abc'.
+
+        params: dict
+            Only match requests with exactly these params. None matches any.
+        """
+        self._add_record({'method': method.lower(), 'path': path, 'params': params,
+                          'status': status, 'headers': headers,
+                          'body': '' if body is None else json.dumps(body)})
+
+    def _lookup(self, method, path, params):
+        for key in ((method, path, _match_params(params)), (method, path, None)):
+            responses = self._responses.get(key)
+            if responses:
+                return responses.pop(0) if len(responses) > 1 else responses[0]
+        raise CassetteMiss('No recorded response for {} {} {}'.format(
+            method.upper(), path, dict(_match_params(params))))
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        method = method.lower()
+        with self._lock:
+            self.request_count += 1
+            throttle = bool(self.throttle_every) and \
+                self.request_count % self.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+            else:
+                status, response_headers, body = self._lookup(method, _path(url), params or {})
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            self._sleep(latency)
+        if throttle:
+            response_headers = {}
+            if self.retry_after is not None:
+                response_headers['Retry-After'] = '{}'.format(self.retry_after)
+            return make_response(429, b'', response_headers, url)
+        return make_response(status, body, response_headers, url)
+
+    def close(self):
+        pass
@@ -3,6 +3,10 @@
 
 from __future__ import print_function, unicode_literals
 
+from contextlib import contextmanager
+
+from simpletrello.utils import intern_ids
+
 
 class TrelloObject(object):
     """Parent class for the other objects.
@@ -14,9 +18,137 @@ class TrelloObject(object):
     - commentobject.Card
     - listobject.List
     """
+
+    # Subclasses declare __slots__ too, so instances have no per-instance __dict__.
+    __slots__ = ('client', 'source_data', '_pending', '_pending_original', '_loaded',
+                 '__weakref__')
+
+    # API field name -> attribute holding it, for fields that map one to one.
+    _source_fields = {}
+
+    # First path part of the object in the API, e.g. 'cards'.
+    _api_path = None
+
+    # API fields handled outside _source_fields, which a projection can leave out.
+    _extra_fields = ()
+
     def __init__(self, client, source_data=None):
         self.client = client
-        self.source_data = source_data
+        # Raw API data is only kept if the client asks for it.
+        self.source_data = source_data if client.keep_source_data else None
+        # Params held back by batch_update(), and the values they replaced.
+        self._pending = None
+        self._pending_original = None
+        # API fields loaded so far, when built from a projected response.
+        # None means every field is loaded.
+        self._loaded = None
+
+    def _update_from_source(self, source_data):
+        """Update the fields present in <source_data>, leaving the others alone.
+        Unlike _populate_from_source, partial data is fine here.
+        """
+        for key, attr in self._source_fields.items():
+            if key in source_data:
+                value = source_data[key]
+                if key.startswith('id'):
+                    value = intern_ids(value)
+                setattr(self, attr, value)
+        self._merge_source_data(source_data)
+        self._changed()
+
+    def _merge_source_data(self, source_data):
+        """Keep <source_data> current with a newer, possibly partial, record.
+        The old dict may be a cached response body, so it is copied, not changed.
+        """
+        if self.client.keep_source_data:
+            merged = dict(self.source_data or {})
+            merged.update(source_data)
+            self.source_data = merged
+
+    def _changed(self):
+        """Tell the client's listeners this object's fields changed."""
+        self.client._notify('updated', self)
+
+    def _set_loaded(self, fields, new):
+        """Record that the data just applied to this object had only <fields>,
+        or every field if <fields> is None.
+        """
+        if fields is None:
+            self._loaded = None
+        elif new:
+            self._loaded = set(fields)
+        elif self._loaded is not None:
+            self._loaded = self._loaded | set(fields)
+
+    def _ensure_loaded(self, field):
+        """Load the fields a projection left out, if <field> is one of them.
+        They are all fetched together, so reading several costs one request.
+        """
+        loaded = self._loaded
+        if loaded is None or field in loaded:
+            return
+        missing = [name for name in list(self._source_fields) + list(self._extra_fields)
+                   if name != 'id' and name not in loaded]
+        response = self.get([self._api_path, self.id], params={'fields': ','.join(sorted(missing))})
+        self._update_from_source(response)
+        self._loaded = None
+
+    def _write(self, params):
+        """PUT <params> to this object and update it from the response.
+
+        Inside batch_update(), the params are only recorded, and applied to
+        the local fields so reads see them, until save().
+        """
+        if self._pending is None:
+            response = self.put([self._api_path, self.id], params=params)
+            self._update_from_source(response)
+            return
+        for key, value in params.items():
+            attr = self._source_fields.get(key)
+            if attr is not None and key not in self._pending_original:
+                self._pending_original[key] = getattr(self, attr)
+        self._pending.update(params)
+        local = dict((key, {'true': True, 'false': False}.get(value, value))
+                     for key, value in params.items())
+        self._update_from_source(local)
+
+    def save(self):
+        """Send the changes recorded in batch_update() as a single PUT.
+
+        Returns
+        -------
+        sent: bool
+            False if there was nothing to send.
+        """
+        if not self._pending:
+            return False
+        params = self._pending
+        response = self.put([self._api_path, self.id], params=params)
+        self._pending, self._pending_original = {}, {}
+        self._update_from_source(response)
+        return True
+
+    @contextmanager
+    def batch_update(self):
+        """Hold back property writes, and send them together on exit.
+
+        >>> with card.batch_update():
+        ...     card.name = 'New name'
+        ...     card.desc = 'New description'
+        ...     card.id_list = other_list_id
+
+        sends one PUT /cards/{id} instead of three. If the block raises,
+        nothing is sent and the local fields are restored.
+        """
+        self._pending, self._pending_original = {}, {}
+        try:
+            yield self
+            self.save()
+        except Exception:
+            self._update_from_source(self._pending_original)
+            raise
+        finally:
+            self._pending, self._pending_original = None, None
 
     def get(self, *args, **kwargs):
         return self.client._get(*args, **kwargs)
@@ -2,8 +2,22 @@
 """utils.py"""
 
 from __future__ import print_function, unicode_literals
+import sys
 from random import randint
 
+try:
+    _intern = sys.intern
+except AttributeError:
+    def _intern(value):
+        # Python 2's intern() only takes byte strings. Trello ids are ASCII,
+        # so they are interned as native strs, which compare equal to unicode.
+        if isinstance(value, unicode):  # noqa: F821 (Python 2 builtin)
+            try:
+                value = value.encode('ascii')
+            except UnicodeError:
+                return value
+        return intern(value)  # noqa: F821 (Python 2 builtin)
+
 
 def listify(data):
     """Check if input is a list. If not, make it a single item list.
@@ -72,3 +86,16 @@ def create_random_text(num_chars):
     chars = (str(randint(0, 9)) for _ in range(num_chars))
     random_text = ''.join(chars)
     return random_text
+
+
+def intern_ids(value):
+    """Intern an id string, or each id in a list, so repeated ids such as a
+    card's idBoard and idList share one string object across all cards.
+    Other values, and non-ASCII strings on Python 2, are returned unchanged.
+    """
+    if isinstance(value, list):
+        return [intern_ids(item) for item in value]
+    try:
+        return _intern(value)
+    except TypeError:
+        return value
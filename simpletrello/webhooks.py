@@ -0,0 +1,272 @@
+# coding: utf-8
+"""webhooks.py"""
+
+from __future__ import print_function, unicode_literals
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from collections import deque
+
+import requests
+
+from simpletrello.boardobject import Board
+from simpletrello.cardobject import Card
+from simpletrello.labelobject import Label
+from simpletrello.listobject import List
+from simpletrello.sync import BoardSyncer
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-Trello-Webhook'
+
+# Trello retries deliveries, so remember this many action ids to drop repeats.
+SEEN_ACTIONS = 1000
+
+# Keys of action['data'] holding an object, and the model class for it.
+ACTION_MODELS = (('board', Board), ('list', List), ('card', Card), ('label', Label))
+
+
+def compute_signature(secret, body, callback_url):
+    """Trello's webhook signature: base64 HMAC-SHA1 of body + callback URL,
+    keyed with the application secret.
+    """
+    if not isinstance(body, bytes):
+        body = body.encode('utf-8')
+    digest = hmac.new(secret.encode('utf-8'), body + callback_url.encode('utf-8'),
+                      hashlib.sha1).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def verify_signature(secret, body, callback_url, signature):
+    # compare_digest wants two byte strings: on Python 2 the header is a
+    # native str and the expected value unicode, which it rejects.
+    expected = compute_signature(secret, body, callback_url).encode('ascii')
+    signature = signature or b''
+    if not isinstance(signature, bytes):
+        try:
+            signature = signature.encode('ascii')
+        except UnicodeError:
+            return False
+    return hmac.compare_digest(expected, signature)
+
+
+def action_ids(action):
+    """Ids of the objects an action touches, e.g. its card, list and board."""
+    ids = set()
+    for value in (action.get('data') or {}).values():
+        if isinstance(value, dict) and value.get('id'):
+            ids.add(value['id'])
+    return ids
+
+
+class WebhookReceiver(object):
+    """Small HTTP server receiving Trello webhook deliveries, and applying
+    their actions to objects already in memory.
+
+    For each new action:
+
+    - cached responses touching its objects are dropped from client.cache
+    - if its board is followed, the action is applied by that board's
+      BoardSyncer, exactly as a sync() would
+    - otherwise, update* actions are applied to any live Board, List, Card or
+      Label they name
+    - callbacks registered with on_action() are called with the action dict
+
+    Requests are handled one at a time, so actions are applied in order.
+
+    Params
+    ------
+    client: TrelloClient
+
+    secret: str
+        Application secret, used to verify the X-Trello-Webhook signature.
+        None skips verification, e.g. for local tests.
+
+    callback_url: str
+        The public URL registered with create_webhook(), which the signature
+        covers. Defaults to the receiver's own url.
+
+    host, port: str, int
+        Address to listen on. Port 0 picks a free port.
+    """
+
+    def __init__(self, client, secret=None, callback_url=None, host='127.0.0.1', port=0):
+        self.client = client
+        self.secret = secret
+        self.callback_url = callback_url
+        self.host = host
+        self.port = port
+        self.server = None
+        self._thread = None
+        self._syncers = {}
+        self._callbacks = []
+        self._seen = deque(maxlen=SEEN_ACTIONS)
+        self._lock = threading.RLock()
+
+    ### SETUP
+
+    def follow(self, board_or_syncer):
+        """Apply actions on a board through its BoardSyncer.
+
+        Params
+        ------
+        board_or_syncer: Board | BoardSyncer
+            A loaded board, e.g. from load_board_snapshot(), or an existing
+            syncer, which can still be polled as a fallback.
+
+        Returns
+        -------
+        syncer: BoardSyncer
+        """
+        syncer = board_or_syncer
+        if isinstance(syncer, Board):
+            syncer = BoardSyncer(syncer)
+        self._syncers[syncer.board.id] = syncer
+        return syncer
+
+    def on_action(self, callback):
+        """Call callback(action) for every new action, after it is applied."""
+        self._callbacks.append(callback)
+        return callback
+
+    def start(self):
+        """Listen on a background thread. Returns self."""
+        self.server = HTTPServer((self.host, self.port), _WebhookHandler)
+        self.server.receiver = self
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self._thread.join()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        return 'http://{}:{}/'.format(self.host, self.port)
+
+    ### HANDLING
+
+    def verify(self, body, signature):
+        if self.secret is None:
+            return True
+        return verify_signature(self.secret, body, self.callback_url or self.url, signature)
+
+    def handle(self, payload):
+        """Apply the action in one webhook <payload>.
+
+        Returns
+        -------
+        applied: bool
+            False for an action already seen.
+        """
+        action = payload.get('action') or {}
+        with self._lock:
+            action_id = action.get('id')
+            if action_id is not None and action_id in self._seen:
+                return False
+            if self.client.cache is not None:
+                self.client.cache.invalidate_ids(action_ids(action))
+            data = action.get('data') or {}
+            board_id = data.get('board', {}).get('id') or payload.get('model', {}).get('id')
+            syncer = self._syncers.get(board_id)
+            if syncer is not None:
+                syncer.apply(action)
+                # Action ids grow with time, so a later poll resumes after this one.
+                if action_id and (syncer.since is None or action_id > syncer.since):
+                    syncer.since = action_id
+            elif (action.get('type') or '').startswith('update'):
+                self._update_live_objects(data)
+            # Only once applied, so Trello's retry after a failure is not dropped.
+            if action_id is not None:
+                self._seen.append(action_id)
+        for callback in self._callbacks:
+            callback(action)
+        return True
+
+    def _update_live_objects(self, data):
+        for key, cls in ACTION_MODELS:
+            source = data.get(key)
+            obj = self.client.identity_map.get(cls, (source or {}).get('id'))
+            if obj is None:
+                continue
+            source = dict(source)
+            if cls is Card and 'listAfter' in data:
+                source['idList'] = data['listAfter'].get('id')
+            obj._update_from_source(source)
+
+    def __repr__(self):
+        return '<simpletrello.webhooks.WebhookReceiver ({}, {} boards followed)>'.format(
+            self.url, len(self._syncers))
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+
+    def do_HEAD(self):
+        # Trello checks the callback URL answers a HEAD before creating a webhook.
+        self.send_response(200)
+        self.end_headers()
+
+    def do_POST(self):
+        receiver = self.server.receiver
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if not receiver.verify(body, self.headers.get(SIGNATURE_HEADER)):
+            self._reply(401)
+            return
+        try:
+            payload = json.loads(body.decode('utf-8'))
+        except ValueError:
+            self._reply(400)
+            return
+        try:
+            receiver.handle(payload)
+        except Exception:
+            logger.exception('Failed to apply webhook action.')
+            self._reply(500)
+            return
+        self._reply(200)
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def replay(url, payload, secret=None, callback_url=None):
+    """POST a webhook <payload> to <url>, signed like Trello would sign it.
+
+    For testing receivers, e.g. with payloads captured from real deliveries.
+    <callback_url> is what the signature covers, defaulting to <url>.
+
+    Returns
+    -------
+    response: requests.Response
+    """
+    body = json.dumps(payload).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+    if secret is not None:
+        headers[SIGNATURE_HEADER] = compute_signature(secret, body, callback_url or url)
+    return requests.post(url, data=body, headers=headers)
@@ -1,10 +1,14 @@
 # coding: utf-8
 """conftest.py"""
 
+import sys
 import time
 import pytest
 from simpletrello import TrelloClient
 
+# Uses async def, which does not parse before Python 3.5.
+collect_ignore = [] if sys.version_info >= (3, 5) else ['test_asyncclient.py']
+
 
 @pytest.fixture(scope='session')
 def client():
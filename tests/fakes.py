@@ -0,0 +1,85 @@
+# coding: utf-8
+"""fakes.py
+
+Stand-ins for the network layer, so client behavior can be tested offline.
+"""
+
+import json
+
+from requests.exceptions import HTTPError
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse(object):
+
+    def __init__(self, status_code=200, body=None, headers=None, url=''):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = headers or {}
+        self.url = url
+        self._body = body
+        self.content = b'' if body is None else json.dumps(body).encode('utf-8')
+        self.text = self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise HTTPError('HTTP {}'.format(self.status_code), response=self)
+
+
+class FakeSession(object):
+    """Answer requests from a list of canned responses, or from a callable.
+
+    Every call is recorded in <calls> as (method, url, params), and its
+    headers in <headers_sent>.
+    """
+
+    def __init__(self, responses):
+        self.responses = responses if callable(responses) else list(responses)
+        self.calls = []
+        self.headers_sent = []
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        self.calls.append((method, url, dict(params or {})))
+        self.headers_sent.append(headers)
+        if callable(self.responses):
+            response = self.responses(method, url, params or {})
+        else:
+            response = self.responses.pop(0)
+        if isinstance(response, int):
+            response = FakeResponse(response)
+        elif not isinstance(response, FakeResponse):
+            response = FakeResponse(200, response)
+        response.url = url
+        return response
+
+
+def make_client(responses, **kwargs):
+    """Return (client, session): a TrelloClient answering from a FakeSession."""
+    from simpletrello import TrelloClient
+    session = FakeSession(responses)
+    kwargs.setdefault('rate_limit', False)
+    client = TrelloClient(api_key='key', token='token', session=session, **kwargs)
+    return client, session
@@ -0,0 +1,89 @@
+# coding: utf-8
+"""stubserver.py
+
+Minimal local HTTP server answering Trello API paths with canned JSON.
+"""
+
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StubServer(object):
+    """Serve <routes>, a dict of {(method, path): body or callable(params)}.
+
+    Paths are relative to /1, e.g. ('GET', '/boards/abc'). Each response is
+    delayed by <latency> seconds. Requests are recorded in <requests>.
+    """
+
+    def __init__(self, routes, latency=0.0):
+        self.routes = routes
+        self.latency = latency
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def base_url(self):
+        return 'http://127.0.0.1:{}/1'.format(self._server.server_address[1])
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def _respond(self):
+                parsed = urlparse(self.path)
+                path = parsed.path[len('/1'):]
+                params = dict((k, v[0]) for k, v in parse_qs(parsed.query).items())
+                with stub._lock:
+                    stub.requests.append((self.command, path, params))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.latency)
+                    body = stub.routes.get((self.command, path))
+                    if callable(body):
+                        body = body(params)
+                    status = 404 if body is None else 200
+                    data = json.dumps(body).encode('utf-8')
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
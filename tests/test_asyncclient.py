@@ -0,0 +1,76 @@
+# coding: utf-8
+"""test_asyncclient.py"""
+
+import asyncio
+import time
+
+import pytest
+from simpletrello import AsyncTrelloClient
+from simpletrello.asyncclient import MAX_CONCURRENCY
+from simpletrello.boardobject import Board
+from simpletrello.cardobject import Card
+
+from stubserver import StubServer
+
+
+def run(coroutine):
+    # asyncio.run() only exists from Python 3.7.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def board_routes(count):
+    routes = {}
+    for i in range(count):
+        board_id = 'board{}'.format(i)
+        routes[('GET', '/boards/' + board_id)] = {'id': board_id, 'name': 'Board {}'.format(i)}
+    return routes
+
+
+def test_get_board_returns_board():
+    with StubServer(board_routes(1)) as server:
+        async def main():
+            async with AsyncTrelloClient(api_key='key', token='token',
+                                         base_url=server.base_url) as trello:
+                return await trello.get_board('board0')
+        board = run(main())
+    assert isinstance(board, Board)
+    assert board.name == 'Board 0'
+
+
+def test_requests_overlap_up_to_max_concurrency():
+    latency = 0.2
+    with StubServer(board_routes(20), latency=latency) as server:
+        async def main():
+            async with AsyncTrelloClient(api_key='key', token='token', max_concurrency=10,
+                                         base_url=server.base_url, rate_limit=False) as trello:
+                calls = [trello.get_board('board{}'.format(i)) for i in range(20)]
+                return await trello.gather(*calls)
+        start = time.time()
+        boards = run(main())
+        elapsed = time.time() - start
+    assert [b.id for b in boards] == ['board{}'.format(i) for i in range(20)]
+    assert server.max_in_flight == 10
+    assert elapsed < 20 * latency / 2
+
+
+def test_create_card_posts_params():
+    card = {'id': 'card1', 'name': 'New', 'idList': 'list1', 'labels': []}
+    with StubServer({('POST', '/cards'): card}) as server:
+        async def main():
+            async with AsyncTrelloClient(api_key='key', token='token',
+                                         base_url=server.base_url) as trello:
+                return await trello.create_card('New', 'list1')
+        new_card = run(main())
+        method, path, params = server.requests[0]
+    assert isinstance(new_card, Card)
+    assert params['idList'] == 'list1'
+    assert params['key'] == 'key'
+
+
+def test_max_concurrency_is_capped():
+    with pytest.raises(ValueError):
+        AsyncTrelloClient(api_key='key', token='token', max_concurrency=MAX_CONCURRENCY + 1)
@@ -0,0 +1,69 @@
+# coding: utf-8
+"""test_batch.py"""
+
+import pytest
+from simpletrello.batch import batch_url
+from simpletrello.exceptions import BatchRequestError
+
+from fakes import make_client
+
+
+def batch_responder(routes):
+    """Answer /batch calls from {relative_url: body}; missing urls are 404s."""
+    def respond(method, url, params):
+        assert url.endswith('/batch')
+        results = []
+        for relative_url in params['urls'].split(','):
+            if relative_url in routes:
+                results.append({'200': routes[relative_url]})
+            else:
+                results.append({'name': 'NotFound', 'message': 'not found', 'statusCode': 404})
+        return results
+    return respond
+
+
+def test_batch_url_encodes_params():
+    assert batch_url(['lists', 'abc', 'cards'], {'fields': 'name,idList'}) == \
+        '/lists/abc/cards?fields=name%2CidList'
+
+
+def test_batch_get_chunks_by_ten_and_keeps_order():
+    routes = dict(('/boards/b{}'.format(i), {'id': 'b{}'.format(i)}) for i in range(25))
+    client, session = make_client(batch_responder(routes))
+    results = client.batch_get([['boards', 'b{}'.format(i)] for i in range(25)])
+    assert [r['id'] for r in results] == ['b{}'.format(i) for i in range(25)]
+    assert len(session.calls) == 3
+
+
+def test_batch_errors_are_per_item():
+    client, session = make_client(batch_responder({'/boards/ok': {'id': 'ok'}}))
+    with client.batch() as batch:
+        good = batch.get(['boards', 'ok'])
+        bad = batch.get(['boards', 'missing'])
+    assert good.result == {'id': 'ok'}
+    with pytest.raises(BatchRequestError) as excinfo:
+        bad.result
+    assert excinfo.value.status_code == 404
+    results = client.batch_get([['boards', 'ok'], ['boards', 'missing']], raise_errors=False)
+    assert isinstance(results[1], BatchRequestError)
+
+
+def test_get_board_lists_with_cards_uses_batch():
+    lists = [{'id': 'l{}'.format(i), 'name': 'List {}'.format(i)} for i in range(12)]
+    routes = dict(('/lists/l{}/cards'.format(i),
+                   [{'id': 'c{}'.format(i), 'name': 'Card', 'idList': 'l{}'.format(i),
+                     'labels': []}])
+                  for i in range(12))
+    responder = batch_responder(routes)
+
+    def respond(method, url, params):
+        if url.endswith('/lists'):
+            return lists
+        return responder(method, url, params)
+
+    client, session = make_client(respond)
+    board_lists = client.get_board_lists('board1', with_cards=True)
+    # One call for the lists, two /batch calls for the cards of 12 lists.
+    assert len(session.calls) == 3
+    assert [bl.cards[0].id for bl in board_lists] == ['c{}'.format(i) for i in range(12)]
+    assert len(session.calls) == 3
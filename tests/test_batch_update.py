@@ -0,0 +1,56 @@
+# coding: utf-8
+"""test_batch_update.py"""
+
+import pytest
+
+from fakes import make_client
+
+
+def card_source(**fields):
+    source = {'id': 'c1', 'name': 'Old', 'desc': '', 'closed': False, 'idList': 'l1',
+              'idBoard': 'b1', 'labels': []}
+    source.update(fields)
+    return source
+
+
+def test_setters_write_immediately_outside_batch():
+    client, session = make_client([card_source(), card_source(name='New')])
+    card = client.get_card('c1')
+    card.name = 'New'
+    assert card.name == 'New'
+    assert session.calls[1][0] == 'put'
+
+
+def test_batch_update_sends_one_put():
+    def respond(method, url, params):
+        if method == 'get':
+            return card_source()
+        return card_source(name=params['name'], desc=params['desc'],
+                           idList=params['idList'], closed=True, idBoard='b2')
+    client, session = make_client(respond)
+    card = client.get_card('c1')
+    with card.batch_update():
+        card.name = 'New'
+        card.desc = 'Details'
+        card.move_to_list('l2')
+        card.archive()
+        assert card.name == 'New'
+        assert card.closed is True
+        assert len(session.calls) == 1
+    method, url, params = session.calls[1]
+    assert len(session.calls) == 2
+    assert url.endswith('/cards/c1')
+    assert params['closed'] == 'true'
+    assert (card.name, card.desc, card.id_list, card.id_board) == ('New', 'Details', 'l2', 'b2')
+
+
+def test_batch_update_restores_fields_on_error():
+    client, session = make_client([card_source()])
+    card = client.get_card('c1')
+    with pytest.raises(RuntimeError):
+        with card.batch_update():
+            card.name = 'New'
+            raise RuntimeError('abort')
+    assert card.name == 'Old'
+    assert len(session.calls) == 1
+    assert card.save() is False
@@ -0,0 +1,102 @@
+# coding: utf-8
+"""test_bulk.py"""
+
+import threading
+import time
+
+from simpletrello.ratelimit import RateLimiter
+
+from fakes import FakeClock, make_client
+
+
+def test_bulk_create_cards_streams_and_reports_in_order():
+    lock = threading.Lock()
+    seen = []
+
+    def respond(method, url, params):
+        if method == 'get':
+            return [{'id': 'c0', 'pos': 16384}]
+        with lock:
+            seen.append(params['name'])
+            # The first attempt at 'card 3' is rate limited, the retry succeeds.
+            if params['name'] == 'card 3' and seen.count('card 3') == 1:
+                return 429
+        if params['name'] == 'card 5':
+            return 500
+        return {'id': 'id-' + params['name'], 'name': params['name'],
+                'idList': params['idList'], 'labels': []}
+
+    clock = FakeClock()
+    limiter = RateLimiter('test-key-bulk', 'test-token-bulk', clock=clock, sleep=clock.sleep)
+    client, session = make_client(respond, rate_limit=limiter)
+    names = ('card {}'.format(i) for i in range(8))
+    report = client.bulk_create_cards('l1', names, max_workers=4)
+    assert [r.item for r in report] == ['card {}'.format(i) for i in range(8)]
+    assert [r.item for r in report.failed] == ['card 5']
+    assert report.results[3].value.id == 'id-card 3'
+    # The client retries the 429 once; creates are not retried after a 500,
+    # as the card may exist.
+    assert seen.count('card 5') == 1
+    assert seen.count('card 3') == 2
+
+
+def test_bulk_create_reports_unreadable_list_per_card():
+    def respond(method, url, params):
+        if url.endswith('/lists/missing/cards'):
+            return 404
+        if method == 'get':
+            return []
+        return {'id': 'id-' + params['name'], 'name': params['name'],
+                'idList': params['idList'], 'labels': []}
+
+    client, session = make_client(respond)
+    cards = ['a', {'name': 'b', 'idList': 'missing'}, 'c', {'name': 'd', 'idList': 'missing'}]
+    report = client.bulk_create_cards('l1', cards)
+    assert [r.ok for r in report] == [True, False, True, False]
+    assert report.results[1].item == {'name': 'b', 'idList': 'missing'}
+    gets = [call[1] for call in session.calls if call[0] == 'get']
+    assert len([url for url in gets if 'missing' in url]) == 1
+
+
+def test_bulk_created_cards_keep_input_order():
+    lock = threading.Lock()
+    done = []
+
+    def respond(method, url, params):
+        if method == 'get':
+            return [{'id': 'c0', 'pos': 16384}, {'id': 'c1', 'pos': 32768}]
+        # Later cards finish first.
+        time.sleep(0.01 * (10 - int(params['name'])))
+        with lock:
+            done.append(params['name'])
+        return {'id': 'id' + params['name'], 'name': params['name'], 'idList': params['idList'],
+                'pos': params['pos'], 'labels': []}
+
+    client, session = make_client(respond)
+    cards = [str(i) for i in range(8)] + [{'name': '9', 'pos': 'top'}]
+    report = client.bulk_create_cards('l1', cards, max_workers=8)
+    assert done != sorted(done)
+    assert [r.value.pos for r in report][:3] == [49152, 65536, 81920]
+    positions = [r.value.pos for r in report][:8]
+    assert positions == sorted(positions)
+    assert report.results[8].value.pos == 'top'
+    assert [call[0] for call in session.calls].count('get') == 1
+
+
+def test_bulk_update_cards_leaves_retries_to_the_client():
+    attempts = {}
+
+    def respond(method, url, params):
+        card_id = url.rsplit('/', 1)[-1]
+        attempts[card_id] = attempts.get(card_id, 0) + 1
+        if card_id == 'c1':
+            return 503
+        return {'id': card_id, 'name': params['name'], 'labels': []}
+
+    client, session = make_client(respond)
+    report = client.bulk_update_cards([('c1', {'name': 'one'}), {'id': 'c2', 'name': 'two'}])
+    assert [r.ok for r in report] == [False, True]
+    assert report.results[1].value.name == 'two'
+    # 5xx retries happen once, in the session's urllib3 Retry, not again here.
+    assert attempts == {'c1': 1, 'c2': 1}
+    assert all(call[0] == 'put' for call in session.calls)
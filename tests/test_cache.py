@@ -0,0 +1,119 @@
+# coding: utf-8
+"""test_cache.py"""
+
+from simpletrello.cache import ResponseCache, ValidatorStore, cache_key, resource_ids
+
+from fakes import FakeClock, FakeResponse, make_client
+
+
+def test_cache_key_ignores_param_order():
+    assert cache_key(['boards', 'b1'], {'fields': 'all', 'labels': 'all'}) == \
+        cache_key(['boards', 'b1'], {'labels': 'all', 'fields': 'all'})
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(ttls={'boards': 10}, clock=clock)
+    cache.set(['boards', 'b1'], None, {'id': 'b1'}, 10)
+    assert cache.get(['boards', 'b1']) == (True, {'id': 'b1'})
+    clock.now += 11
+    assert cache.get(['boards', 'b1']) == (False, None)
+    assert cache.stats.expirations == 1
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    cache.set(['cards', 'c1'], None, 1, 10)
+    cache.set(['cards', 'c2'], None, 2, 10)
+    cache.get(['cards', 'c1'])
+    cache.set(['cards', 'c3'], None, 3, 10)
+    assert cache.get(['cards', 'c2'])[0] is False
+    assert cache.get(['cards', 'c1'])[0] is True
+    cache.set(['cards', 'c4'], None, 4, 95)
+    assert len(cache) == 1
+    assert cache.size == 95
+    assert cache.stats.evictions == 3
+
+
+def test_client_serves_repeated_reads_from_cache():
+    client, session = make_client([{'id': 'b1', 'name': 'Board'}], cache=True)
+    assert client.get_board('b1').name == 'Board'
+    assert client.get_board('b1').name == 'Board'
+    assert len(session.calls) == 1
+    assert client.cache.stats.hits == 1
+
+
+def test_writes_invalidate_related_entries():
+    responses = [
+        [{'id': 'c1', 'idList': 'l1', 'idBoard': 'b1', 'name': 'Card', 'labels': []}],
+        {'id': 'c2', 'idList': 'l1', 'idBoard': 'b1', 'name': 'New', 'labels': []},
+        [{'id': 'c1', 'idList': 'l1', 'idBoard': 'b1', 'name': 'Card', 'labels': []},
+         {'id': 'c2', 'idList': 'l1', 'idBoard': 'b1', 'name': 'New', 'labels': []}],
+    ]
+    client, session = make_client(responses, cache=True)
+    assert len(client.get_cards_by_board('b1')) == 1
+    client.create_card('New', 'l1')
+    assert len(client.get_cards_by_board('b1')) == 2
+    assert client.cache.stats.invalidations == 1
+
+
+def test_batch_and_search_entries_are_invalidated():
+    assert resource_ids(['batch'], {'urls': '/boards/b1,/lists/l1/cards?fields=name'}) == \
+        set(['b1', 'l1'])
+    cache = ResponseCache()
+    cache.set(['batch'], {'urls': '/boards/b1,/cards/c1'}, [{'200': {'id': 'b1'}}], 10)
+    cache.set(['search'], {'query': 'release'}, {'cards': [{'id': 'c2'}]}, 10)
+    cache.set(['members', 'me', 'boards'], None, [{'id': 'b1'}], 10)
+    cache.set(['boards', 'b2'], None, {'id': 'b2'}, 10)
+    cache.invalidate(['cards', 'c1'], {'name': 'Renamed'})
+    assert len(cache) == 1
+    assert cache.get(['boards', 'b2'])[0] is True
+
+
+def test_moving_a_card_invalidates_the_list_it_left():
+    card = {'id': 'c1', 'idList': 'l1', 'idBoard': 'b1', 'name': 'Card', 'labels': []}
+    moved = dict(card, idList='l2')
+    client, session = make_client([card, [], moved, [{'id': 'a1'}]], cache=True)
+    # Known from a live object: the list's actions do not mention the card.
+    live = client.get_card('c1')
+    assert client._get(['lists', 'l1', 'actions']) == []
+    live.id_list = 'l2'
+    assert client._get(['lists', 'l1', 'actions']) == [{'id': 'a1'}]
+
+    # Known from the cached listing only.
+    other, session = make_client([[card], moved, []], cache=True)
+    assert len(other._get(['lists', 'l1', 'cards'])) == 1
+    other._put(['cards', 'c1'], params={'idList': 'l2'})
+    assert other._get(['lists', 'l1', 'cards']) == []
+
+
+def test_refresh_sends_conditional_request_and_reuses_body_on_304():
+    board = {'id': 'b1', 'name': 'Board', 'closed': False}
+    responses = [
+        FakeResponse(200, board, headers={'ETag': '"v1"'}),
+        FakeResponse(304),
+    ]
+    client, session = make_client(responses)
+    b = client.get_board('b1', fields='all', conditional=True)
+    b.refresh_full_data()
+    assert session.headers_sent[0] is None
+    assert session.headers_sent[1] == {'If-None-Match': '"v1"'}
+    assert b.full_data == board
+    assert b.name == 'Board'
+    assert client.validators.not_modified == 1
+    assert len(session.calls) == 2
+
+
+def test_validator_store_is_bounded_by_bytes():
+    store = ValidatorStore(max_bytes=100)
+    etag = {'ETag': '"v1"'}
+    store.set(['boards', 'b1'], None, etag, {'id': 'b1'}, 60)
+    store.set(['boards', 'b2'], None, etag, {'id': 'b2'}, 30)
+    assert store.size == 90
+    store.set(['boards', 'b3'], None, etag, {'id': 'b3'}, 30)
+    assert store.headers(['boards', 'b1']) is None
+    assert store.size == 60
+    store.set(['boards', 'b4'], None, etag, {'id': 'b4'}, 101)
+    assert store.headers(['boards', 'b4']) is None
+    store.set(['boards', 'b2'], None, {}, {'id': 'b2'}, 30)
+    assert len(store) == 1 and store.size == 30
@@ -2,6 +2,7 @@
 """test_client.py"""
 
 import os
+import requests
 from simpletrello import TrelloClient
 
 
@@ -13,3 +14,27 @@ def test_client():
     assert isinstance(t, TrelloClient)
     assert repr(t) == '<simpletrello.TrelloCLient>(key={}...{}, token={}...{})'\
         .format(key[0], key[-1], token[0], token[-1])
+
+
+def test_client_session_pool():
+    """Client owns a single pooled session, shared by objects it creates."""
+    t = TrelloClient(api_key='key', token='token', pool_maxsize=25, max_retries=2)
+    adapter = t.session.get_adapter('https://api.trello.com/1')
+    assert adapter._pool_maxsize == 25
+    assert adapter.max_retries.total == 2
+
+
+def test_client_context_manager_closes_session():
+    closed = []
+    with TrelloClient(api_key='key', token='token') as t:
+        t.session.close = lambda: closed.append(True)
+    assert closed == [True]
+
+
+def test_client_does_not_close_passed_session():
+    session = requests.Session()
+    closed = []
+    session.close = lambda: closed.append(True)
+    with TrelloClient(api_key='key', token='token', session=session) as t:
+        assert t.session is session
+    assert closed == []
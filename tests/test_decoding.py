@@ -0,0 +1,62 @@
+# coding: utf-8
+"""test_decoding.py"""
+
+import json
+
+import pytest
+
+from fakes import make_client
+
+from simpletrello.cardobject import Card
+from simpletrello.decoding import _iter_json_array, get_decoder
+
+
+def chunked(data, size):
+    data = data.encode('utf-8')
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def test_get_decoder():
+    assert get_decoder('json')[1](b'{"a": [1]}') == {'a': [1]}
+    name, loads = get_decoder()
+    assert name in ('orjson', 'ujson', 'json')
+    assert loads(b'[1, 2.5, "\\u00e9"]') == [1, 2.5, u'é']
+    assert get_decoder(len)[1] is len
+    with pytest.raises(ImportError):
+        get_decoder('no_such_decoder')
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 1000])
+def test_array_elements_across_chunk_boundaries(size):
+    items = [{'id': 'c1', 'name': u'café [1], {2}', 'pos': 16384.5},
+             12345, 'text', None, [1, [2]], {'nested': {'deep': True}}]
+    data = ' [\n' + ',\n '.join(json.dumps(item) for item in items) + ' ]\n'
+    assert list(_iter_json_array(chunked(data, size))) == items
+    assert list(_iter_json_array(chunked('[]', size))) == []
+
+
+def test_invalid_arrays():
+    with pytest.raises(ValueError):
+        list(_iter_json_array([b'{"id": 1}']))
+    with pytest.raises(ValueError):
+        list(_iter_json_array(chunked('[{"id": 1}, {"id"', 4)))
+
+
+def test_streamed_cards_are_built_incrementally():
+    sources = [{'id': 'c{:02}'.format(i), 'name': 'Card', 'idList': 'l1'} for i in range(5)]
+    client, session = make_client([sources], json_decoder='json')
+    records = []
+    client.add_request_hook(records.append)
+    cards = client.get_cards_by_board('b1', stream=True)
+    assert all(isinstance(card, Card) for card in cards)
+    assert [card.id for card in cards] == [source['id'] for source in sources]
+    assert records[0].bytes is None
+
+
+def test_streamed_pages():
+    pages = [[{'id': 'a{}'.format(i), 'type': 'commentCard', 'data': {'text': 'hi'}}
+              for i in ids] for ids in ([3, 1, 2], [0])]
+    client, session = make_client(pages)
+    comments = list(client.iter_comments(card_id='c1', page_size=3, stream=True))
+    assert [comment.id for comment in comments] == ['a3', 'a1', 'a2', 'a0']
+    assert session.calls[1][2]['before'] == 'a1'
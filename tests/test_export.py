@@ -0,0 +1,116 @@
+# coding: utf-8
+"""test_export.py"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+
+import pytest
+
+from simpletrello import TrelloClient
+from simpletrello.export import WRITERS, read_manifest
+from simpletrello.fakeserver import FakeTrello, Workspace
+
+
+def make_client(fake, fail_on=None):
+    session = fake.session()
+    if fail_on is not None:
+        request = session.request
+
+        def failing_request(method, url, **kwargs):
+            if fail_on in url:
+                raise IOError('connection lost')
+            return request(method, url, **kwargs)
+        session.request = failing_request
+    return TrelloClient(api_key='key', token='token', session=session, rate_limit=False)
+
+
+@pytest.fixture
+def fake():
+    return FakeTrello(Workspace(boards=3, lists_per_board=2, cards_per_list=15,
+                                comments_per_card=1), rate_limit=False)
+
+
+def read_jsonl(path):
+    with gzip.open(path) as f:
+        return [json.loads(line.decode('utf-8')) for line in f]
+
+
+def read_csv(path):
+    """Rows of a utf-8 csv file, as dicts of text on Python 2 and 3."""
+    if sys.version_info[0] == 2:
+        with open(path, 'rb') as f:
+            return [dict((key.decode('utf-8'), value.decode('utf-8'))
+                         for key, value in row.items()) for row in csv.DictReader(f)]
+    with io.open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_jsonl_export(tmpdir, fake):
+    path = str(tmpdir)
+    report = make_client(fake).export_workspace(path, compression='gzip', page_size=10)
+    assert len(report.exported) == 3
+    assert report.counts == {'boards': 3, 'lists': 6, 'labels': 18, 'cards': 90,
+                             'comments': 90}
+    board_id = fake.workspace.board_id(1)
+    cards = read_jsonl(os.path.join(path, 'cards', board_id + '.jsonl.gz'))
+    assert len(cards) == 30 and all(card['idBoard'] == board_id for card in cards)
+    comments = read_jsonl(os.path.join(path, 'comments', board_id + '.jsonl.gz'))
+    assert comments[0]['type'] == 'commentCard'
+    assert read_manifest(path)[board_id]['counts']['cards'] == 30
+
+
+def test_csv_export_writes_columns(tmpdir, fake):
+    path = str(tmpdir)
+    board_id = fake.workspace.board_id(0)
+    make_client(fake).export_workspace(path, format='csv', board_ids=[board_id])
+    rows = read_csv(os.path.join(path, 'cards', board_id + '.csv'))
+    assert len(rows) == 30
+    assert rows[0]['closed'] == 'false'
+    label_ids = set(row['id'] for row in read_csv(os.path.join(path, 'labels', board_id + '.csv')))
+    card_label_ids = set(i for row in rows for i in row['idLabels'].split(',') if i)
+    assert card_label_ids and card_label_ids <= label_ids
+    comment = read_csv(os.path.join(path, 'comments', board_id + '.csv'))[0]
+    assert comment['idCard'] and comment['text']
+    assert os.listdir(os.path.join(path, 'boards')) == [board_id + '.csv']
+
+
+def test_csv_writer_keeps_non_ascii_text(tmpdir):
+    path = str(tmpdir.join('labels.csv'))
+    writer = WRITERS['csv'](path, 'labels', None)
+    writer.write({'id': u'lab1', 'idBoard': u'b1', 'name': u'Priorit\u00e9 \u2605', 'color': None})
+    writer.close()
+    assert read_csv(path) == [{'id': u'lab1', 'idBoard': u'b1', 'name': u'Priorit\u00e9 \u2605',
+                               'color': u''}]
+
+
+def test_interrupted_export_resumes_by_board(tmpdir, fake):
+    path = str(tmpdir)
+    second = fake.workspace.board_id(1)
+    with pytest.raises(IOError):
+        make_client(fake, fail_on=second + '/actions').export_workspace(path)
+    assert list(read_manifest(path)) == [fake.workspace.board_id(0)]
+    assert os.path.exists(os.path.join(path, 'cards', second + '.jsonl.partial'))
+
+    report = make_client(fake).export_workspace(path)
+    assert report.skipped == [fake.workspace.board_id(0)]
+    assert report.exported == [second, fake.workspace.board_id(2)]
+    assert os.path.exists(os.path.join(path, 'cards', second + '.jsonl'))
+    assert len(read_manifest(path)) == 3
+
+    with pytest.raises(ValueError):
+        make_client(fake).export_workspace(path, format='csv')
+    report = make_client(fake).export_workspace(path, format='csv', resume=False)
+    assert len(report.exported) == 3
+
+
+def test_parquet_export(tmpdir, fake):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    path = str(tmpdir)
+    make_client(fake).export_workspace(path, format='parquet', compression='gzip')
+    table = parquet.read_table(os.path.join(path, 'cards'))
+    assert table.num_rows == 90
+    assert table.schema.field('idLabels').type.value_type == 'string'
@@ -0,0 +1,132 @@
+# coding: utf-8
+"""test_fakeserver.py"""
+
+import pytest
+import requests
+from requests.exceptions import HTTPError
+
+from fakes import FakeClock
+
+from simpletrello import TrelloClient
+from simpletrello.fakeserver import FakeTrello, Workspace
+from simpletrello.sync import BoardSyncer
+
+
+def make_fake(**kwargs):
+    workspace = Workspace(boards=3, lists_per_board=4, cards_per_list=25, comments_per_card=2)
+    kwargs.setdefault('rate_limit', False)
+    fake = FakeTrello(workspace, **kwargs)
+    client = TrelloClient(api_key='key', token='token', session=fake.session(), rate_limit=False)
+    return fake, client
+
+
+def test_large_workspace_is_generated_lazily_and_deterministically():
+    fake = FakeTrello(Workspace(boards=1000, lists_per_board=10, cards_per_list=1000))
+    client = TrelloClient(api_key='key', token='token', session=fake.session(), rate_limit=False)
+    assert fake.workspace.num_cards == 10 ** 7
+    boards = client.get_all_boards()
+    assert len(boards) == 1000
+    assert client.get_board(boards[500].id).name == 'Board 500'
+    assert len(fake._boards) == 0
+
+    cards = client.get_cards(list_id=client.get_board_lists(boards[1].id)[0].id)
+    assert len(cards) == 1000
+    other = TrelloClient(api_key='key', token='token', rate_limit=False,
+                         session=FakeTrello(fake.workspace).session())
+    assert other.get_card(cards[10].id).name == cards[10].name
+    assert cards[10].board.id == boards[1].id
+
+
+def test_snapshot_pages_batch_and_search():
+    fake, client = make_fake()
+    board_id = fake.workspace.board_id(0)
+    board = client.load_board_snapshot(board_id)
+    assert len(board.lists) == 4 and len(board.cards) == 100
+    assert all(len(card.comments) == 2 for card in board.cards)
+
+    assert len(list(client.iter_cards(board_id=board_id, page_size=30))) == 100
+    comments = list(client.iter_comments(board_id=board_id, page_size=70))
+    assert len(comments) == 200
+    assert [c.id for c in comments] == sorted((c.id for c in comments), reverse=True)
+
+    lists = client.get_board_lists(board_id, with_cards=True)
+    assert [len(board_list.cards) for board_list in lists] == [25] * 4
+    word = board.cards[0].name.split()[0].lower()
+    found = list(client.iter_search(word, page_size=20))
+    assert board.cards[0] in found
+    assert all(word in '{} {}'.format(c.name, c.desc).lower() for c in found)
+
+
+def test_writes_show_up_as_actions():
+    fake, client = make_fake()
+    board_id = fake.workspace.board_id(1)
+    syncer = BoardSyncer.from_snapshot(client, board_id)
+    lists = syncer.board.lists
+
+    other = TrelloClient(api_key='key', token='other', session=fake.session(), rate_limit=False)
+    card = other.create_card('Write tests', lists[0].id)
+    other._put(['cards', card.id], params={'idList': lists[1].id, 'name': 'Written'})
+    other.create_comment('Done', card.id)
+    assert [action['type'] for action in syncer.sync()] == [
+        'createCard', 'updateCard', 'commentCard']
+    synced = syncer.board.get_card_by_id(card.id)
+    assert synced.name == 'Written' and synced.list is lists[1]
+    assert synced.comments[0].text == 'Done'
+
+    new_board = client.create_board('Fresh')
+    names = [board_list.name for board_list in client.get_board_lists(new_board.id)]
+    assert names == ['To Do', 'Doing', 'Done']
+    client.delete_board(new_board.id)
+    with pytest.raises(HTTPError):
+        client.get_board(new_board.id)
+
+
+def test_rate_limits_per_key_and_token():
+    clock = FakeClock()
+    fake, client = make_fake(rate_limit=((5, 10.0), (3, 10.0)), clock=clock)
+    other = TrelloClient(api_key='key', token='other', session=fake.session(), rate_limit=False)
+    board_id = fake.workspace.board_id(0)
+    response = client._get(['boards', board_id], as_json=False)
+    assert response.headers['X-Rate-Limit-Api-Token-Remaining'] == '2'
+    client._get(['boards', board_id])
+    client._get(['boards', board_id])
+    with pytest.raises(Exception) as info:
+        client._get(['boards', board_id])
+    assert 'Rate' in type(info.value).__name__
+    other._get(['boards', board_id])
+    other._get(['boards', board_id])
+    with pytest.raises(Exception):
+        other._get(['boards', board_id])
+    assert fake.status_counts == {200: 5, 429: 2}
+    clock.now += 10.0
+    client._get(['boards', board_id])
+
+
+def test_latency_errors_and_etags():
+    clock = FakeClock()
+    fake, client = make_fake(latency=(0.1, 0.2), error_rate=0.5, sleep=clock.sleep, seed=1)
+    statuses = [fake.handle('GET', '/1/boards/' + fake.workspace.board_id(0),
+                            {'key': 'k', 'token': 't'})[0] for i in range(50)]
+    assert set(statuses) == {200, 500}
+    assert 10 < statuses.count(500) < 40
+    assert all(0.1 <= seconds <= 0.2 for seconds in clock.slept)
+
+    fake, client = make_fake()
+    board_id = fake.workspace.board_id(0)
+    first = client._get(['boards', board_id], conditional=True)
+    assert client._get(['boards', board_id], conditional=True) == first
+    assert fake.status_counts == {200: 1, 304: 1}
+
+
+def test_http_server():
+    fake = FakeTrello(Workspace(boards=2, lists_per_board=2, cards_per_list=5))
+    with fake.serve() as server:
+        client = TrelloClient(api_key='key', token='token', base_url=server.base_url,
+                              rate_limit=False)
+        board = client.load_board_snapshot(fake.workspace.board_id(1))
+        assert len(board.cards) == 10
+        card = client.create_card('Over HTTP', board.lists[0].id, desc='With desc')
+        assert client.get_card(card.id).desc == 'With desc'
+        with pytest.raises(HTTPError):
+            client.get_card('missing')
+        assert requests.get(server.base_url + '/boards/' + board.id).status_code == 401
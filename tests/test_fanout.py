@@ -0,0 +1,65 @@
+# coding: utf-8
+"""test_fanout.py"""
+
+import threading
+import time
+
+from simpletrello.fanout import imap_bounded
+
+from fakes import make_client
+
+
+def test_imap_bounded_keeps_order_and_collects_errors():
+    def work(n):
+        time.sleep(0.01 * (5 - n % 5))
+        if n == 3:
+            raise ValueError('bad item')
+        return n * 10
+    results = list(imap_bounded(work, range(10), max_workers=4))
+    assert [r.item for r in results] == list(range(10))
+    assert [r.value for r in results if r.ok] == [0, 10, 20, 40, 50, 60, 70, 80, 90]
+    assert isinstance(results[3].error, ValueError)
+
+
+def test_imap_bounded_reads_input_lazily():
+    consumed = []
+
+    def items():
+        for n in range(100):
+            consumed.append(n)
+            yield n
+    results = imap_bounded(lambda n: n, items(), max_workers=2, window=4)
+    next(results)
+    assert len(consumed) <= 5
+
+
+def test_fetch_many_runs_in_parallel_on_shared_client():
+    lock = threading.Lock()
+    state = {'in_flight': 0, 'max': 0}
+
+    def respond(method, url, params):
+        with lock:
+            state['in_flight'] += 1
+            state['max'] = max(state['max'], state['in_flight'])
+        time.sleep(0.05)
+        with lock:
+            state['in_flight'] -= 1
+        card_id = url.rsplit('/', 2)[-2]
+        if card_id == 'missing':
+            return 404
+        return [{'id': 'a-' + card_id, 'type': 'commentCard',
+                 'data': {'text': card_id, 'card': {'id': card_id}}}]
+
+    client, session = make_client(respond, cache=True)
+    card_ids = ['c{}'.format(i) for i in range(16)] + ['missing']
+    results = client.fetch_many(card_ids, client.get_card_comments, max_workers=8)
+    assert [r.item for r in results] == card_ids
+    assert [r.value[0].text for r in results[:-1]] == card_ids[:-1]
+    assert not results[-1].ok
+    assert state['max'] > 1
+
+
+def test_map_get_accepts_params():
+    client, session = make_client(lambda method, url, params: {'url': url, 'p': params.get('x')})
+    results = client.map_get([['boards', 'b1'], (['boards', 'b2'], {'x': '1'})])
+    assert [r.value['p'] for r in results] == [None, '1']
@@ -0,0 +1,97 @@
+# coding: utf-8
+"""test_identitymap.py"""
+
+import gc
+import threading
+
+from simpletrello.cardobject import Card
+
+from fakes import make_client
+
+
+def card(name='Card', **fields):
+    source = {'id': 'c1', 'name': name, 'idList': 'l1', 'idBoard': 'b1', 'labels': []}
+    source.update(fields)
+    return source
+
+
+def test_same_id_gives_same_object_with_fresh_state():
+    client, session = make_client([card(), [card(name='Renamed')]])
+    first = client.get_card('c1')
+    from_list = client.get_cards(list_id='l1')[0]
+    assert from_list is first
+    assert first.name == 'Renamed'
+
+
+def test_partial_data_does_not_wipe_fields():
+    client, session = make_client([card(desc='Details'), {'cards': [{'id': 'c1', 'name': 'x'}]}])
+    first = client.get_card('c1')
+    found = list(client.iter_search('x'))[0]
+    assert found is first
+    assert first.desc == 'Details'
+    assert first.id_list == 'l1'
+
+
+def test_partial_data_refreshes_source_data():
+    client, session = make_client([card(desc='Details'), {'cards': [{'id': 'c1', 'name': 'x'}]}])
+    first = client.get_card('c1')
+    list(client.iter_search('x'))
+    assert first.source_data['name'] == 'x'
+    assert first.source_data['desc'] == 'Details'
+
+
+def test_concurrent_hydrates_share_one_new_object():
+    client, session = make_client([])
+    loaded = []
+    client.add_listener(lambda event, obj: loaded.append(obj) if event == 'loaded' else None)
+    start = threading.Barrier(8) if hasattr(threading, 'Barrier') else None
+    results = []
+
+    def hydrate():
+        if start is not None:
+            start.wait()
+        results.append(client._hydrate(Card, card()))
+    threads = [threading.Thread(target=hydrate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(id(obj) for obj in results)) == 1
+    assert loaded == results[:1]
+
+
+def test_objects_are_released_when_unreferenced():
+    client, session = make_client([card()])
+    kept = client.get_card('c1')
+    assert len(client.identity_map) == 1
+    del kept
+    gc.collect()
+    assert len(client.identity_map) == 0
+
+
+def test_board_cards_are_cached():
+    client, session = make_client([{'id': 'b1', 'name': 'Board'}, [card()]])
+    board = client.get_board('b1')
+    assert board.cards[0].id == 'c1'
+    assert board.cards[0].id == 'c1'
+    assert len(session.calls) == 2
+
+
+def test_refresh_keeps_object_graph_and_lookups_current():
+    from test_snapshot import snapshot_source
+    client, session = make_client([
+        snapshot_source(num_lists=2, cards_per_list=1),
+        {'id': 'l0', 'idBoard': 'b1', 'name': 'Renamed', 'closed': False, 'pos': 0,
+         'subscribed': False},
+        {'id': 'b1', 'name': 'Board', 'closed': True},
+    ])
+    board = client.load_board_snapshot('b1')
+    first = board.get_list_by_name('List 0')
+    assert first.subscribed is False
+    assert first.board is board and len(first.cards) == 1
+    assert board.get_list_by_name('Renamed') is first
+
+    board.refresh_full_data()
+    assert board.closed is True
+    assert board.lists[0] is first and board.labels[0].board is board
+    assert len(session.calls) == 3
@@ -0,0 +1,108 @@
+# coding: utf-8
+"""test_lookup.py"""
+
+import pytest
+
+from fakes import make_client
+from test_snapshot import snapshot_source
+
+from simpletrello import client as client_module
+from simpletrello.lookup import NameIndex, normalize_name
+from simpletrello.sync import BoardSyncer
+
+
+def loaded_board(responses=()):
+    source = snapshot_source(num_lists=3, cards_per_list=2)
+    source['labels'].append({'id': 'lab2', 'idBoard': 'b1', 'name': 'Feature', 'color': 'red'})
+    for card in source['cards']:
+        card['shortLink'] = 'sl-' + card['id']
+    client, session = make_client([source] + list(responses))
+    return client, session, client.load_board_snapshot('b1')
+
+
+def test_normalize_name():
+    assert normalize_name('  To  Do ') == normalize_name('to do') == 'to do'
+    assert normalize_name(None) == ''
+
+
+def test_board_lookups():
+    client, session, board = loaded_board()
+    assert board.get_list_by_name(' LIST  1 ') is board.lists[1]
+    assert board.get_list_by_id('l2') is board.lists[2]
+    assert board.get_list_by_id('nope') is None
+    assert board.get_label_by_name('bug') is board.labels[0]
+    assert board.get_labels_by_color('red') == board.labels
+    assert board.get_card_by_id('l1c1') is board.lists[1].cards[1]
+    assert board.get_card_by_short_link('sl-l2c0') is board.lists[2].cards[0]
+    with pytest.raises(ValueError):
+        board.get_list_by_name('missing')
+    assert len(session.calls) == 1
+
+
+def test_board_lookups_follow_changes():
+    client, session, board = loaded_board([
+        {'id': 'l0', 'idBoard': 'b1', 'name': 'Backlog'},
+        {'id': 'l1', 'idBoard': 'b1', 'closed': True},
+        {'id': 'l9', 'idBoard': 'b1', 'name': 'New list', 'closed': False},
+        {'id': 'c9', 'idBoard': 'b1', 'idList': 'l9', 'name': 'New card', 'shortLink': 'sl9'},
+    ])
+    assert board.get_list_by_name('list 0') is board.lists[0]
+    board.lists[0].name = 'Backlog'
+    assert board.get_list_by_name('backlog').id == 'l0'
+    with pytest.raises(ValueError):
+        board.get_list_by_name('list 0')
+    board.lists[1].archive()
+    with pytest.raises(ValueError):
+        board.get_list_by_name('list 1')
+    assert board.get_list_by_id('l1') is board.lists[1]
+
+    new_list = board.create_list('New list')
+    assert board.get_list_by_name('new list') is new_list
+    new_card = client.create_card('New card', 'l9')
+    assert board.get_card_by_short_link('sl9') is new_card
+    assert new_list.cards == [new_card]
+
+    BoardSyncer(board, since='a0').apply(
+        {'id': 'a1', 'type': 'createLabel',
+         'data': {'label': {'id': 'lab3', 'name': 'Ops', 'color': 'red'}}})
+    assert [label.id for label in board.get_labels_by_color('red')] == ['lab1', 'lab2', 'lab3']
+    assert len(session.calls) == 5
+
+
+def test_get_board_by_name_uses_directory(monkeypatch):
+    now = [0]
+    monkeypatch.setattr(client_module, 'clock', lambda: now[0])
+    boards = [{'id': 'b1', 'name': 'Roadmap', 'closed': False},
+              {'id': 'b2', 'name': 'Old roadmap', 'closed': True},
+              {'id': 'b3', 'name': 'Old Roadmap', 'closed': False}]
+    client, session = make_client([boards, {'id': 'b1', 'name': 'Plans'},
+                                   boards + [{'id': 'b4', 'name': 'Fresh', 'closed': False}]])
+    assert client.get_board_by_name('roadmap').id == 'b1'
+    assert client.get_board_by_name('OLD ROADMAP').id == 'b3'
+    assert len(session.calls) == 1
+
+    client.get_board_by_name('roadmap').name = 'Plans'
+    assert client.get_board_by_name('plans').id == 'b1'
+    assert len(session.calls) == 2
+
+    # A miss only reloads a directory older than DIRECTORY_REFRESH_INTERVAL.
+    with pytest.raises(ValueError):
+        client.get_board_by_name('fresh')
+    assert len(session.calls) == 2
+    now[0] = client_module.DIRECTORY_REFRESH_INTERVAL
+    assert client.get_board_by_name('fresh').id == 'b4'
+    assert len(session.calls) == 3
+    with pytest.raises(ValueError):
+        client.get_board_by_name('missing')
+    assert len(session.calls) == 3
+
+
+def test_name_index_rekeys():
+    client, session, board = loaded_board()
+    index = NameIndex(board.lists)
+    board.lists[0]._name = 'Renamed'
+    index.add(board.lists[0])
+    assert index.find('list 0') == []
+    assert index.find('renamed') == [board.lists[0]]
+    index.discard(board.lists[0])
+    assert index.find('renamed') == [] and len(index) == 2
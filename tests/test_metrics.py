@@ -0,0 +1,89 @@
+# coding: utf-8
+"""test_metrics.py"""
+
+import pytest
+from requests.exceptions import ConnectionError, HTTPError
+
+from fakes import make_client
+
+from simpletrello.metrics import MetricsAggregator, RequestRecord, template_path
+
+
+def record(latency, path='/boards/{id}', status=200, **kwargs):
+    fields = dict(method='get', path=path, status=status, latency=latency, bytes=10,
+                  retries=0, caller='app.py:1 in main', via=None, lazy=False, error=None)
+    fields.update(kwargs)
+    return RequestRecord(**fields)
+
+
+def test_template_path():
+    assert template_path(['boards', 'b1', 'cards']) == '/boards/{id}/cards'
+    assert template_path(['tokens', 'secret', 'webhooks']) == '/tokens/{id}/webhooks'
+    assert template_path('search') == '/search'
+
+
+def test_hook_records_requests():
+    def respond(method, url, params):
+        if url.endswith('/boards/b1'):
+            return {'id': 'b1', 'name': 'Board', 'closed': False}
+        if url.endswith('/cards/missing'):
+            return 404
+        raise ConnectionError('down')
+
+    client, session = make_client(respond)
+    records = []
+    client.add_request_hook(records.append)
+    board = client.get_board('b1')
+    board._closed = None
+    assert board.closed is False
+    with pytest.raises(HTTPError):
+        client.get_card('missing')
+    with pytest.raises(ConnectionError):
+        client.get_list('l1')
+    client.remove_request_hook(records.append)
+    client.get_board('b1')
+
+    assert [(r.method, r.path, r.status) for r in records] == [
+        ('get', '/boards/{id}', 200), ('get', '/boards/{id}', 200),
+        ('get', '/cards/{id}', 404), ('get', '/lists/{id}', None)]
+    first, implicit, missing, down = records
+    assert first.via is None
+    assert first.caller.startswith('test_metrics.py:')
+    assert first.caller.endswith('in test_hook_records_requests')
+    assert implicit.via == 'Board.closed' and implicit.lazy
+    assert not first.lazy
+    assert first.bytes > 0 and first.retries == 0 and first.ok
+    assert isinstance(missing.error, HTTPError) and not missing.ok
+    assert isinstance(down.error, ConnectionError)
+
+
+def test_aggregator_percentiles_and_summary():
+    metrics = MetricsAggregator()
+    for i in range(100):
+        metrics(record(0.02 if i < 90 else 0.4))
+    metrics(record(0.001, path='/cards/{id}', status=404, via='Card.comments'))
+    assert 0.01 < metrics.percentile(0.5, path='/boards/{id}') <= 0.025
+    assert 0.25 < metrics.percentile(0.99, path='/boards/{id}') <= 0.5
+    assert metrics.percentile(0.5, method='put') is None
+
+    top = metrics.summary()[0]
+    assert (top['path'], top['count'], top['errors']) == ('/boards/{id}', 100, 0)
+    assert top['bytes'] == 1000
+    assert metrics.summary()[1]['errors'] == 1
+    assert metrics.top_callers(1) == [('app.py:1 in main', 100)]
+
+
+def test_prometheus_text():
+    metrics = MetricsAggregator()
+    metrics(record(0.02))
+    metrics(record(3.0, status=None, retries=2, error=ConnectionError()))
+    text = metrics.to_prometheus()
+    labels = 'method="get",path="/boards/{id}"'
+    assert '# TYPE simpletrello_requests_total counter' in text
+    assert 'simpletrello_requests_total{%s,status="200"} 1' % labels in text
+    assert 'simpletrello_requests_total{%s,status="none"} 1' % labels in text
+    assert 'simpletrello_request_retries_total{%s} 2' % labels in text
+    assert 'simpletrello_request_duration_seconds_bucket{le="0.025",%s} 1' % labels in text
+    assert 'simpletrello_request_duration_seconds_bucket{le="+Inf",%s} 2' % labels in text
+    assert 'simpletrello_request_duration_seconds_count{%s} 2' % labels in text
+    assert text.endswith('\n')
@@ -0,0 +1,67 @@
+# coding: utf-8
+"""test_models.py"""
+
+import json
+
+import pytest
+from simpletrello import TrelloClient
+from simpletrello.boardobject import Board
+from simpletrello.cardobject import Card
+from simpletrello.commentobject import Comment
+from simpletrello.labelobject import Label
+from simpletrello.listobject import List
+
+
+def card_source(i):
+    """A card roughly as returned by GET /boards/{id}/cards."""
+    return {
+        'id': '5a{:022d}'.format(i), 'name': 'Card number {}'.format(i), 'closed': False,
+        'desc': 'Some description text', 'idBoard': '59b20aa457b03ce5735de812',
+        'idList': '59b20aa457b03ce5735de813', 'idLabels': ['lab1', 'lab2'], 'idMembers': [],
+        'pos': 16384 * i, 'shortLink': 'abcd{:04d}'.format(i), 'subscribed': False,
+        'labels': [{'id': 'lab1', 'idBoard': 'b1', 'name': 'Bug', 'color': 'red'},
+                   {'id': 'lab2', 'idBoard': 'b1', 'name': 'Feature', 'color': 'green'}],
+        'badges': {'comments': 0, 'votes': 0, 'attachments': 0, 'checkItems': 0},
+        'dateLastActivity': '2018-01-01T00:00:00.000Z', 'idChecklists': [],
+        'url': 'https://trello.com/c/abcd{:04d}/{}-card-number'.format(i, i),
+    }
+
+
+def retained_bytes_per_card(client, count=5000):
+    tracemalloc = pytest.importorskip('tracemalloc')
+    payload = json.dumps([card_source(i) for i in range(count)])
+    tracemalloc.start()
+    try:
+        cards = [Card(client, source) for source in json.loads(payload)]
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(cards) == count
+    return current / count
+
+
+@pytest.mark.parametrize('cls, source', [
+    (Board, {'id': 'b1'}),
+    (List, {'id': 'l1'}),
+    (Card, {'id': 'c1'}),
+    (Comment, {'id': 'a1', 'data': {}}),
+    (Label, {'id': 'lab1'}),
+])
+def test_models_have_no_instance_dict(cls, source):
+    obj = cls(TrelloClient(api_key='key', token='token'), source)
+    assert not hasattr(obj, '__dict__')
+
+
+def test_cards_share_label_instances():
+    client = TrelloClient(api_key='key', token='token')
+    first, second = Card(client, card_source(1)), Card(client, card_source(2))
+    assert first.labels[0] is second.labels[0]
+    assert first.id_board is second.id_board
+
+
+def test_dropping_source_data_shrinks_cards():
+    keep = retained_bytes_per_card(TrelloClient(api_key='key', token='token'))
+    compact = retained_bytes_per_card(
+        TrelloClient(api_key='key', token='token', keep_source_data=False))
+    assert compact < keep / 3
+    assert compact < 1000
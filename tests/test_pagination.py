@@ -0,0 +1,41 @@
+# coding: utf-8
+"""test_pagination.py"""
+
+from fakes import make_client
+
+
+def card(card_id):
+    return {'id': card_id, 'name': card_id, 'idList': 'l1', 'labels': []}
+
+
+def test_iter_cards_pages_lazily_with_before():
+    pages = [[card('c{:02d}'.format(i)) for i in range(10, 5, -1)],
+             [card('c{:02d}'.format(i)) for i in range(5, 0, -1)],
+             []]
+    client, session = make_client(pages)
+    cards = client.iter_cards(board_id='b1', page_size=5)
+    first = next(cards)
+    assert first.id == 'c10'
+    assert len(session.calls) == 1
+    rest = list(cards)
+    assert len(rest) == 9
+    assert [call[2].get('before') for call in session.calls] == [None, 'c06', 'c01']
+    assert session.calls[0][2]['limit'] == 5
+
+
+def test_iter_comments_filters_comment_actions():
+    comment = {'id': 'a1', 'type': 'commentCard', 'date': '2018',
+               'data': {'text': 'hello', 'card': {'id': 'c1'}}}
+    client, session = make_client([[comment]])
+    comments = list(client.iter_comments(card_id='c1'))
+    assert [c.text for c in comments] == ['hello']
+    method, url, params = session.calls[0]
+    assert url.endswith('/cards/c1/actions')
+    assert params['filter'] == 'commentCard'
+
+
+def test_iter_search_pages_cards():
+    pages = [{'cards': [card('c1'), card('c2')]}, {'cards': [card('c3')]}]
+    client, session = make_client(pages)
+    assert [c.id for c in client.iter_search('bug', page_size=2)] == ['c1', 'c2', 'c3']
+    assert [call[2]['cards_page'] for call in session.calls] == [0, 1]
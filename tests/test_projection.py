@@ -0,0 +1,108 @@
+# coding: utf-8
+"""test_projection.py"""
+
+from fakes import make_client
+
+from simpletrello.textindex import SearchIndex
+
+FULL_CARD = {'id': 'c1', 'name': 'Card', 'idList': 'l1', 'idLabels': [], 'idBoard': 'b1',
+             'desc': 'Details', 'closed': False, 'pos': 1, 'due': None,
+             'shortLink': 'abc', 'labels': []}
+
+
+def test_per_call_fields_are_sent_and_missing_fields_load_once():
+    client, session = make_client([
+        [{'id': 'c1', 'name': 'Card', 'idList': 'l1'}],
+        {'id': 'c1', 'desc': 'Details', 'shortLink': 'abc', 'idBoard': 'b1'},
+    ])
+    card = client.get_cards_by_board('b1', fields=['name', 'idList'])[0]
+    assert session.calls[0][2]['fields'] == 'name,idList'
+    assert card.name == 'Card' and card.id_list == 'l1'
+    assert len(session.calls) == 1
+
+    assert card.desc == 'Details'
+    assert card.short_link == 'abc'
+    method, url, params = session.calls[1]
+    assert url.endswith('/cards/c1')
+    assert 'desc' in params['fields'].split(',')
+    assert 'name' not in params['fields'].split(',')
+    assert card._loaded is None
+
+
+def test_default_fields_and_full_fetch_override():
+    client, session = make_client([
+        {'id': 'c1', 'name': 'Card'},
+        FULL_CARD,
+        [{'id': 'l1', 'name': 'List'}],
+    ], default_fields={'cards': 'name', 'lists': ['name']})
+    card = client.get_card('c1')
+    assert session.calls[0][2]['fields'] == 'name'
+    assert card._loaded == set(['name'])
+
+    # A full fetch of the same card marks every field loaded.
+    client.get_card('c1', fields='all')
+    assert 'fields' not in session.calls[1][2]
+    assert card.desc == 'Details'
+
+    board_list = client.get_board_lists('b1')[0]
+    assert session.calls[2][2]['fields'] == 'name'
+    assert board_list.name == 'List'
+    assert len(session.calls) == 3
+
+
+def test_unprojected_objects_never_load_fields():
+    client, session = make_client([{'id': 'c1', 'name': 'Card'}])
+    card = client.get_card('c1')
+    assert card.desc is None
+    assert len(session.calls) == 1
+
+
+def test_internal_reads_do_not_load_fields():
+    client, session = make_client([
+        {'id': 'b1', 'name': 'Board', 'closed': False},
+        [{'id': 'c1', 'name': 'Release notes', 'idBoard': 'b1'}],
+    ])
+    board = client.get_board('b1')
+    index = SearchIndex(client)
+    index.add_board(board)
+    card = client.get_cards(list_id='l1', fields='name,idBoard')[0]
+    assert index.search('release') == [card]
+    assert len(session.calls) == 2
+
+
+def test_repr_does_not_load_fields():
+    client, session = make_client([{'id': 'c1', 'idList': 'l1'}])
+    card = client.get_card('c1', fields='idList')
+    assert repr(card) == '<simpletrello.cardobject.Card (None, c1)>'
+    assert len(session.calls) == 1
+
+
+def test_full_payload_marks_projected_objects_loaded():
+    from test_snapshot import snapshot_source
+    source = snapshot_source(num_lists=2, cards_per_list=2)
+    client, session = make_client([
+        [{'id': 'l0c0', 'name': 'Card 0'}],
+        source,
+    ])
+    card = client.get_cards_by_board('b1', fields='name')[0]
+    assert card._loaded == set(['name'])
+    board = client.load_board_snapshot('b1')
+    assert card._loaded is None
+    for board_list in board.lists:
+        for board_card in board_list.cards:
+            assert board_card.labels and board_card.id_list == board_list.id
+    assert len(session.calls) == 2
+
+
+def test_board_directory_does_not_load_names():
+    client, session = make_client([
+        [{'id': 'b1', 'name': 'Roadmap', 'closed': False}],
+        {'id': 'b2', 'closed': False},
+        {'id': 'b2', 'name': 'Ops'},
+    ], default_fields={'boards': 'closed'})
+    directory = client.board_directory()
+    board = client.get_board('b2')
+    assert len(session.calls) == 2
+    assert directory.find('ops') == []
+    assert board.name == 'Ops'
+    assert directory.find('ops') == [board]
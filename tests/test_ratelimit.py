@@ -0,0 +1,89 @@
+# coding: utf-8
+"""test_ratelimit.py"""
+
+import pytest
+from simpletrello import TrelloClient
+from simpletrello.exceptions import RateLimitExceeded
+from simpletrello.ratelimit import RateLimiter, TokenBucket
+
+from fakes import FakeClock, FakeResponse, FakeSession
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(10, 1.0, clock=clock)
+    waits = [bucket.reserve() for _ in range(10)]
+    assert waits == [0.0] * 10
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    clock.now += 3.0
+    assert bucket.reserve() == pytest.approx(0.0)
+
+
+def test_rate_limiter_uses_tighter_token_limit():
+    clock = FakeClock()
+    limiter = RateLimiter('test-key-pacing', 'test-token-pacing', headroom=1.0,
+                          clock=clock, sleep=clock.sleep)
+    for _ in range(10):
+        limiter.acquire()
+    assert clock.slept == []
+    limiter.acquire()
+    # Token bucket: burst of 10, then 9 per second. Key bucket: 30, then 27.
+    assert clock.slept == [pytest.approx(1 / 9.0)]
+
+
+def test_rate_limiter_stays_under_limit_in_every_window():
+    clock = FakeClock()
+    limiter = RateLimiter('test-key-window', 'test-token-window', clock=clock, sleep=clock.sleep)
+    sent = []
+    for _ in range(400):
+        limiter.acquire()
+        sent.append(clock.now)
+    # No 10 second window, wherever it starts, holds more than 95 requests.
+    for i, start in enumerate(sent):
+        in_window = [t for t in sent[i:] if t < start + 10.0]
+        assert len(in_window) <= 95
+
+
+def test_rate_limiter_shares_buckets_per_key_and_token():
+    a = RateLimiter('test-key-shared', 'test-token-a')
+    b = RateLimiter('test-key-shared', 'test-token-b')
+    assert a.key_bucket is b.key_bucket
+    assert a.token_bucket is not b.token_bucket
+    assert not [name for name in RateLimiter._buckets if 'test-key-shared' in name]
+
+
+def test_rate_limiter_refuses_to_share_bucket_with_other_settings():
+    RateLimiter('test-key-settings', 'test-token-settings')
+    with pytest.raises(ValueError):
+        RateLimiter('test-key-settings', 'test-token-settings', headroom=0.5)
+    with pytest.raises(ValueError):
+        RateLimiter('test-key-settings', 'test-token-settings', clock=FakeClock())
+
+
+def test_client_backs_off_and_retries_on_429():
+    clock = FakeClock()
+    limiter = RateLimiter('test-key-429', 'test-token-429', clock=clock, sleep=clock.sleep)
+    session = FakeSession([429, 429, FakeResponse(200, {'id': 'abc'})])
+    t = TrelloClient(api_key='key', token='token', session=session, rate_limit=limiter)
+    assert t._get(['boards', 'abc']) == {'id': 'abc'}
+    assert len(session.calls) == 3
+    assert len(clock.slept) == 2
+
+
+def test_client_raises_after_rate_limit_retries():
+    clock = FakeClock()
+    limiter = RateLimiter('test-key-raise', 'test-token-raise', clock=clock, sleep=clock.sleep)
+    session = FakeSession([429] * 3)
+    t = TrelloClient(api_key='key', token='token', session=session,
+                     rate_limit=limiter, max_rate_limit_retries=2)
+    with pytest.raises(RateLimitExceeded):
+        t._get(['boards', 'abc'])
+    assert len(session.calls) == 3
+
+
+def test_client_without_rate_limit_raises_on_first_429():
+    session = FakeSession([429])
+    t = TrelloClient(api_key='key', token='token', session=session, rate_limit=False)
+    with pytest.raises(RateLimitExceeded):
+        t._get(['boards', 'abc'])
@@ -0,0 +1,44 @@
+# coding: utf-8
+"""test_snapshot.py"""
+
+from fakes import make_client
+
+
+def snapshot_source(num_lists=50, cards_per_list=3):
+    lists, cards, actions = [], [], []
+    labels = [{'id': 'lab1', 'idBoard': 'b1', 'name': 'Bug', 'color': 'red'}]
+    for i in range(num_lists):
+        list_id = 'l{}'.format(i)
+        lists.append({'id': list_id, 'idBoard': 'b1', 'name': 'List {}'.format(i),
+                      'closed': False, 'pos': i})
+        for j in range(cards_per_list):
+            card_id = '{}c{}'.format(list_id, j)
+            cards.append({'id': card_id, 'idBoard': 'b1', 'idList': list_id,
+                          'name': 'Card {}'.format(j), 'labels': [dict(labels[0])],
+                          'idLabels': ['lab1'], 'badges': {'comments': 1}})
+            actions.append({'id': 'a' + card_id, 'type': 'commentCard', 'date': '2018',
+                            'idMemberCreator': 'm1',
+                            'data': {'text': 'hi', 'card': {'id': card_id},
+                                     'board': {'id': 'b1'}, 'list': {'id': list_id}}})
+    return {'id': 'b1', 'name': 'Board', 'closed': False, 'labels': labels,
+            'lists': lists, 'cards': cards, 'actions': actions,
+            'checklists': [{'id': 'ch1', 'idCard': 'l0c0', 'checkItems': []}]}
+
+
+def test_load_board_snapshot_uses_one_request():
+    client, session = make_client([snapshot_source()])
+    board = client.load_board_snapshot('b1')
+    assert len(board.lists) == 50
+    for board_list in board.lists:
+        assert board_list.board is board
+        for card in board_list.cards:
+            assert card.list is board_list
+            assert card.board is board
+            assert card.labels[0] is board.labels[0]
+            assert card.comments[0].card is card
+    assert board.lists[0].cards[0].checklists[0]['id'] == 'ch1'
+    assert board.labels[0].board is board
+    assert len(session.calls) == 1
+    method, url, params = session.calls[0]
+    assert params['cards'] == 'all'
+    assert params['actions'] == 'commentCard'
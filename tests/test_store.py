@@ -0,0 +1,151 @@
+# coding: utf-8
+"""test_store.py"""
+
+import pytest
+
+from fakes import make_client
+from test_snapshot import snapshot_source
+
+from simpletrello.store import LocalStore
+
+
+def board_source():
+    source = snapshot_source(num_lists=2, cards_per_list=2)
+    source['labels'].append({'id': 'lab2', 'idBoard': 'b1', 'name': 'Feature', 'color': 'blue'})
+    source['cards'][0]['due'] = '2018-03-01T12:00:00.000Z'
+    source['cards'][1]['due'] = '2018-04-01T12:00:00.000Z'
+    source['cards'][2]['idLabels'] = ['lab2']
+    source['cards'][2]['labels'] = [dict(source['labels'][1])]
+    source['cards'][3]['closed'] = True
+    return source
+
+
+def test_save_and_query():
+    client, session = make_client([board_source()])
+    store = LocalStore()
+    store.save_board(client.load_board_snapshot('b1'))
+
+    assert [c['id'] for c in store.cards_by_list('l0')] == ['l0c0', 'l0c1']
+    assert [c['id'] for c in store.cards_by_list('l1')] == ['l1c0']
+    assert len(store.cards_by_list('l1', include_closed=True)) == 2
+    assert [c['id'] for c in store.cards_by_label(label_name='bug')] == ['l0c0', 'l0c1']
+    assert [c['id'] for c in store.cards_by_label(label_id='lab2')] == ['l1c0']
+    due = store.cards_due_between('2018-02-01', '2018-03-15', board_id='b1')
+    assert [c['id'] for c in due] == ['l0c0']
+    assert len(store.cards_due_between(start='2018-01-01')) == 2
+    assert store.comments_for_card('l0c0')[0]['text'] == 'hi'
+    assert len(session.calls) == 1
+
+
+def test_load_board_without_requests(tmpdir):
+    path = str(tmpdir.join('replica.db'))
+    client, session = make_client([board_source()])
+    with LocalStore(path) as store:
+        store.save_board(client.load_board_snapshot('b1'), since='a9')
+
+    other, other_session = make_client([])
+    with LocalStore(path) as store:
+        assert store.query('PRAGMA journal_mode')[0]['journal_mode'] == 'wal'
+        board, since = store.load_board(other, 'b1')
+    assert since == 'a9'
+    assert [l_.id for l_ in board.lists] == ['l0', 'l1']
+    card = board.lists[1].cards[0]
+    assert card.list is board.lists[1]
+    assert card.labels[0] is board.labels[1]
+    assert board.lists[0].cards[0].due == '2018-03-01T12:00:00.000Z'
+    assert board.lists[0].cards[0].comments[0].text == 'hi'
+    assert other_session.calls == []
+
+
+def test_unloaded_comments_stay_unloaded():
+    client, session = make_client([board_source()])
+    board = client.load_board_snapshot('b1')
+    board.lists[0].cards[0]._comments = None
+    store = LocalStore()
+    store.save_board(board)
+
+    other, other_session = make_client([[]])
+    loaded, since = store.load_board(other, 'b1')
+    assert loaded.lists[0].cards[0].comments == []
+    assert len(other_session.calls) == 1
+    assert store.load_board(other, 'missing') == (None, None)
+
+
+def test_sync_board_is_incremental(tmpdir):
+    path = str(tmpdir.join('replica.db'))
+    create = {'id': 'a2', 'type': 'createCard',
+              'data': {'card': {'id': 'new', 'name': 'New card'}, 'list': {'id': 'l1'}}}
+    client, session = make_client([[{'id': 'a1'}], board_source(), [create]])
+    with LocalStore(path) as store:
+        store.sync_board(client, 'b1')
+        store.sync_board(client, 'b1')
+        assert [c['id'] for c in store.cards_by_list('l1')] == ['l1c0', 'new']
+    assert len(session.calls) == 3
+
+    # A new process resumes from the stored action id, without a snapshot.
+    other, other_session = make_client([[]])
+    with LocalStore(path) as store:
+        store.sync_board(other, 'b1')
+    method, url, params = other_session.calls[0]
+    assert url.endswith('/boards/b1/actions')
+    assert params['since'] == 'a2'
+
+
+def test_sync_rewrites_only_rows_the_actions_name():
+    actions = [
+        # Newest first, as Trello returns them.
+        {'id': 'a5', 'type': 'deleteLabel', 'data': {'label': {'id': 'lab2'}}},
+        {'id': 'a4', 'type': 'commentCard',
+         'data': {'text': 'Shipped', 'card': {'id': 'l0c0'}, 'list': {'id': 'l0'}}},
+        {'id': 'a3', 'type': 'deleteCard', 'data': {'card': {'id': 'l0c1'}, 'list': {'id': 'l0'}}},
+        {'id': 'a2', 'type': 'updateCard', 'data': {'card': {'id': 'l1c0', 'name': 'Renamed'}}},
+    ]
+    source = snapshot_source(num_lists=10, cards_per_list=2)
+    source['labels'].append({'id': 'lab2', 'idBoard': 'b1', 'name': 'Feature', 'color': 'blue'})
+    source['cards'][2]['idLabels'].append('lab2')
+    client, session = make_client([[{'id': 'a1'}], source, actions])
+    store = LocalStore()
+    store.sync_board(client, 'b1')
+    full = store.conn.total_changes
+    board = store.sync_board(client, 'b1')
+    # Rows of l0, l0c0, l0c1, l1c0 and lab2 only, not the other 17 cards.
+    assert store.conn.total_changes - full < full / 3
+
+    assert [c['id'] for c in store.cards_by_list('l0')] == ['l0c0']
+    assert sorted(c['name'] for c in store.cards_by_list('l1')) == ['Card 1', 'Renamed']
+    assert store.cards_by_label(label_id='lab2') == []
+    assert sorted(c['text'] for c in store.comments_for_card('l0c0')) == ['Shipped', 'hi']
+    assert store.comments_for_card('l0c1') == []
+    other, other_session = make_client([])
+    assert store.load_board(other, 'b1')[0].lists[0].cards[0].name == board.lists[0].cards[0].name
+    assert len(session.calls) == 3
+
+
+def test_load_board_refuses_live_objects():
+    client, session = make_client([board_source()])
+    board = client.load_board_snapshot('b1')
+    store = LocalStore()
+    store.save_board(board, since='a1')
+    board.lists[0].cards[0]._name = 'Fresher'
+    updated = []
+    client.add_listener(lambda event, obj: updated.append(obj))
+    with pytest.raises(ValueError):
+        store.load_board(client, 'b1')
+    assert board.lists[0].cards[0].name == 'Fresher'
+    assert updated == []
+
+    # sync_board starts again from a snapshot instead.
+    session.responses.extend([[{'id': 'a2'}], board_source()])
+    assert store.sync_board(client, 'b1') is board
+    assert store.query('SELECT since FROM sync_state') == [{'since': 'a2'}]
+
+
+def test_save_board_does_not_load_projected_fields():
+    client, session = make_client([board_source()])
+    board = client.load_board_snapshot('b1')
+    board.lists[0].cards[0]._loaded = set(['name'])
+    board._loaded = set(['name'])
+    store = LocalStore()
+    store.save_board(board)
+    assert store.cards_by_list('l0')[0]['name'] == 'Card 0'
+    assert len(session.calls) == 1
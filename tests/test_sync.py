@@ -0,0 +1,100 @@
+# coding: utf-8
+"""test_sync.py"""
+
+from simpletrello.snapshot import hydrate_board
+from simpletrello.sync import BoardSyncer
+
+from fakes import make_client
+from test_snapshot import snapshot_source
+
+
+def action(action_id, action_type, **data):
+    data.setdefault('board', {'id': 'b1'})
+    return {'id': action_id, 'type': action_type, 'date': '2018', 'idMemberCreator': 'm1',
+            'data': data}
+
+
+def test_sync_applies_deltas_in_order():
+    new_actions = [
+        # Newest first, as Trello returns them.
+        action('a6', 'deleteComment', action={'id': 'al0c0'}, card={'id': 'l0c0'}),
+        action('a5', 'commentCard', text='Nice', card={'id': 'l1c0'}, list={'id': 'l1'}),
+        action('a4', 'updateCard', card={'id': 'l0c1', 'closed': True}, old={'closed': False}),
+        action('a3', 'updateCard', card={'id': 'x1', 'idList': 'l1'},
+               listBefore={'id': 'l0'}, listAfter={'id': 'l1'}),
+        action('a2', 'createCard', card={'id': 'x1', 'name': 'Fresh'}, list={'id': 'l0'}),
+        action('a1', 'updateList', list={'id': 'l0', 'name': 'Renamed'}, old={'name': 'List 0'}),
+    ]
+    responses = [[{'id': 'a0'}], snapshot_source(num_lists=2, cards_per_list=2), new_actions, []]
+    client, session = make_client(responses)
+    syncer = BoardSyncer.from_snapshot(client, 'b1')
+    assert syncer.since == 'a0'
+
+    applied = syncer.sync()
+    assert [a['id'] for a in applied] == ['a1', 'a2', 'a3', 'a4', 'a5', 'a6']
+    assert syncer.since == 'a6'
+    assert session.calls[2][2]['since'] == 'a0'
+
+    list0, list1 = syncer.board.lists
+    assert list0.name == 'Renamed'
+    assert [c.id for c in list0.cards] == ['l0c0', 'l0c1']
+    assert list0.cards[1].closed is True
+    assert list0.cards[0].comments == []
+    moved = list1.cards[-1]
+    assert (moved.id, moved.name, moved.list) == ('x1', 'Fresh', list1)
+    assert [c.text for c in list1.cards[0].comments] == ['hi', 'Nice']
+
+    assert syncer.sync() == []
+    assert session.calls[3][2]['since'] == 'a6'
+    assert len(session.calls) == 4
+
+
+def test_sync_pages_through_large_feeds():
+    page1 = [action('p{:04d}'.format(i), 'unknownType') for i in range(1000, 0, -1)]
+    page2 = [action('p0000', 'unknownType')]
+    client, session = make_client([page1, page2])
+    board = hydrate_board(client, snapshot_source(num_lists=1, cards_per_list=1))
+    syncer = BoardSyncer(board, since='start')
+    applied = syncer.sync()
+    assert len(applied) == 1001
+    assert applied[0]['id'] == 'p0000'
+    assert session.calls[1][2]['before'] == 'p0001'
+
+
+def test_new_syncer_starts_after_newest_action():
+    client, session = make_client([[{'id': 'a9'}], []])
+    board = hydrate_board(client, snapshot_source(num_lists=1, cards_per_list=1))
+    syncer = BoardSyncer(board)
+    assert syncer.since == 'a9'
+    assert session.calls[0][2] == {'key': 'key', 'token': 'token', 'limit': 1, 'fields': 'id'}
+    assert syncer.sync() == []
+    assert session.calls[1][2]['since'] == 'a9'
+
+
+def test_polls_bypass_the_response_cache():
+    responses = [[{'id': 'a1'}], [{'id': 'a2'}],
+                 [action('a3', 'unknownType')], [], []]
+    client, session = make_client(responses, cache=True)
+    board = hydrate_board(client, snapshot_source(num_lists=1, cards_per_list=1))
+    assert BoardSyncer(board).since == 'a1'
+    syncer = BoardSyncer(board)
+    assert syncer.since == 'a2'
+    assert [a['id'] for a in syncer.sync()] == ['a3']
+    assert syncer.sync() == []
+    assert syncer.sync() == []
+    assert len(session.calls) == 5
+
+
+def test_label_actions_notify_touched_cards():
+    client, session = make_client([])
+    board = hydrate_board(client, snapshot_source(num_lists=1, cards_per_list=2))
+    syncer = BoardSyncer(board, since='a0')
+    updated = []
+    client.add_listener(lambda event, obj: updated.append(obj.id) if event == 'updated' else None)
+    syncer.apply(action('a1', 'removeLabelFromCard', card={'id': 'l0c0'}, label={'id': 'lab1'}))
+    syncer.apply(action('a2', 'addLabelToCard', card={'id': 'l0c0'},
+                        label={'id': 'lab2', 'name': 'New', 'color': 'blue'}))
+    assert updated == ['l0c0', 'l0c0']
+    del updated[:]
+    syncer.apply(action('a3', 'deleteLabel', label={'id': 'lab2'}))
+    assert updated == ['l0c0']
@@ -0,0 +1,81 @@
+# coding: utf-8
+"""test_textindex.py"""
+
+from fakes import make_client
+from test_snapshot import snapshot_source
+
+from simpletrello.cardobject import Card
+from simpletrello.commentobject import Comment
+from simpletrello.sync import BoardSyncer
+from simpletrello.textindex import SearchIndex, parse_query
+
+
+def indexed_board(responses=()):
+    source = snapshot_source(num_lists=2, cards_per_list=2)
+    source['cards'][0]['name'] = 'Deploy the release notes'
+    source['cards'][0]['desc'] = 'Write notes for the Release'
+    source['cards'][1]['name'] = 'Notes on release planning'
+    source['actions'][2]['data']['text'] = 'Deployment blocked by CI'
+    client, session = make_client([source] + list(responses))
+    board = client.load_board_snapshot('b1')
+    index = SearchIndex(client)
+    index.add_board(board)
+    return client, session, board, index
+
+
+def ids(results):
+    return [obj.id for obj in results]
+
+
+def test_parse_query():
+    assert parse_query('"Release Notes" deploy* x-ray') == [
+        (['release', 'notes'], False), (['deploy'], True), (['x', 'ray'], False)]
+
+
+def test_search_terms_phrases_and_prefixes():
+    client, session, board, index = indexed_board()
+    assert ids(index.search('RELEASE notes')) == ['l0c0', 'l0c1']
+    assert ids(index.search('"release notes"')) == ['l0c0']
+    assert ids(index.search('"notes release"')) == []
+    assert ids(index.search('deploy*')) == ['l0c0', 'al1c0']
+    assert ids(index.search('deploy*', types=Comment)) == ['al1c0']
+    assert ids(index.search('write', fields='name')) == []
+    assert ids(index.search('list 1', types=Card)) == []
+    assert ids(index.search('"list 1"')) == ['l1']
+    assert ids(index.search('board')) == ['b1']
+    assert index.search('') == []
+    assert len(session.calls) == 1
+
+
+def test_index_follows_client_changes():
+    client, session, board, index = indexed_board(
+        [{'id': 'l0c1', 'name': 'Renamed card'}, {'id': 'l0c1', 'name': 'Renamed again'}])
+    card = board.lists[0].cards[1]
+    card.name = 'Renamed card'
+    assert ids(index.search('planning')) == []
+    assert ids(index.search('renamed')) == ['l0c1']
+
+    syncer = BoardSyncer(board, since='a0')
+    syncer.apply({'id': 'a1', 'type': 'createCard',
+                  'data': {'card': {'id': 'new', 'name': 'Fresh release'},
+                           'list': {'id': 'l1'}}})
+    assert 'new' in ids(index.search('release'))
+    syncer.apply({'id': 'a2', 'type': 'deleteCard', 'data': {'card': {'id': 'l0c0'}}})
+    assert ids(index.search('"release notes"')) == []
+
+    index.close()
+    card.name = 'Renamed again'
+    assert ids(index.search('renamed')) == ['l0c1']
+    assert index.search('again') == []
+
+
+def test_remove_drops_tokens():
+    client, session, board, index = indexed_board()
+    for board_list in board.lists:
+        for card in board_list.cards:
+            index.remove(card)
+            for comment in card.comments:
+                index.remove(comment)
+    assert index.search('release') == []
+    assert index._tokens == sorted(index._postings)
+    assert len(index) == 3
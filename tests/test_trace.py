@@ -0,0 +1,54 @@
+# coding: utf-8
+"""test_trace.py"""
+
+import pytest
+
+from fakes import make_client
+
+from simpletrello.exceptions import ImplicitFetchError
+
+
+def respond(method, url, params):
+    if url.endswith('/b1/lists'):
+        return [{'id': 'l{}'.format(i), 'idBoard': 'b1', 'name': 'List', 'closed': False}
+                for i in range(4)]
+    if url.endswith('/cards'):
+        return []
+    return {'id': 'b1', 'name': 'Board', 'closed': False}
+
+
+def test_trace_reports_n_plus_one(capsys):
+    client, session = make_client(respond)
+    board = client.get_board('b1')
+    with client.trace() as tracer:
+        client.get_cards_by_board('b1')
+        for board_list in board.lists:
+            board_list.cards
+    assert [fetch.via for fetch in tracer.fetches] == ['Board.lists'] + ['List.cards'] * 4
+
+    patterns = tracer.patterns()
+    assert len(patterns) == 1
+    pattern = patterns[0]
+    assert (pattern.via, pattern.path, pattern.count) == ('List.cards', '/lists/{id}/cards', 4)
+    assert pattern.caller.endswith('in test_trace_reports_n_plus_one')
+    assert 'get_cards_by_lists' in pattern.suggestion
+
+    report = capsys.readouterr().err
+    assert report.startswith('Implicit fetches: 5, from 2 properties')
+    assert 'List.cards: 4 x GET /lists/{id}/cards' in report
+
+    # Tracing stops with the block.
+    board._lists = None
+    board.lists
+    assert len(tracer.fetches) == 5
+
+
+def test_strict_trace_raises_before_sending():
+    client, session = make_client(respond)
+    board = client.get_board('b1')
+    with client.trace(strict=True, report=False):
+        board.refresh_lists()
+        with pytest.raises(ImplicitFetchError) as info:
+            board.lists[0].cards
+    assert 'List.cards' in str(info.value)
+    assert [url for method, url, params in session.calls][-1].endswith('/b1/lists')
@@ -0,0 +1,75 @@
+# coding: utf-8
+"""test_transport.py"""
+
+import json
+
+import pytest
+
+from fakes import FakeClock, FakeSession
+
+from simpletrello import TrelloClient
+from simpletrello.exceptions import CassetteMiss
+from simpletrello.ratelimit import RateLimiter
+from simpletrello.transport import RecordingTransport, ReplayTransport
+
+BOARD = {'id': 'b1', 'name': 'Board', 'closed': False}
+CARDS = [{'id': 'c1', 'name': 'Card', 'idList': 'l1', 'idBoard': 'b1'}]
+
+
+def respond(method, url, params):
+    if url.endswith('/cards'):
+        return CARDS
+    return BOARD
+
+
+def test_record_then_replay(tmpdir):
+    path = str(tmpdir.join('cassette.jsonl'))
+    with RecordingTransport(path, session=FakeSession(respond)) as recorder:
+        trello = TrelloClient(api_key='key', token='secret', session=recorder, rate_limit=False)
+        trello.get_board('b1')
+        trello.get_cards_by_board('b1', fields=['name', 'idList'])
+
+    with open(path) as f:
+        text = f.read()
+    assert 'secret' not in text
+    records = [json.loads(line) for line in text.splitlines()]
+    assert [(r['method'], r['path']) for r in records] == [
+        ('get', '/1/boards/b1'), ('get', '/1/boards/b1/cards')]
+
+    replay = ReplayTransport(path)
+    trello = TrelloClient(api_key='other', token='other', session=replay, rate_limit=False,
+                          base_url='http://localhost:1/1')
+    assert trello.get_board('b1').name == 'Board'
+    cards = trello.get_cards_by_board('b1', fields=['name', 'idList'], stream=True)
+    assert [card.id for card in cards] == ['c1']
+    with pytest.raises(CassetteMiss):
+        trello.get_cards_by_board('b1')
+
+
+def test_added_responses_repeat_and_match_params():
+    replay = ReplayTransport()
+    replay.add('get', '/1/boards/b1', dict(BOARD, name='First'))
+    replay.add('get', '/1/boards/b1', dict(BOARD, name='Then'))
+    replay.add('get', '/1/boards/b1/cards', [], params={'filter': 'closed'})
+    replay.add('get', '/1/cards/missing', status=404)
+    trello = TrelloClient(api_key='key', token='token', session=replay, rate_limit=False)
+    assert [trello._get(['boards', 'b1'])['name'] for i in range(3)] == ['First', 'Then', 'Then']
+    assert trello._get(['boards', 'b1', 'cards'], params={'filter': 'closed'}) == []
+    with pytest.raises(CassetteMiss):
+        trello._get(['boards', 'b1', 'cards'], params={'filter': 'open'})
+    with pytest.raises(Exception) as info:
+        trello.get_card('missing')
+    assert info.value.response.status_code == 404
+
+
+def test_latency_and_throttling():
+    clock = FakeClock()
+    replay = ReplayTransport(latency=0.05, throttle_every=2, retry_after=3, sleep=clock.sleep)
+    replay.add('get', '/1/boards/b1', BOARD)
+    limiter = RateLimiter('test-key-replay', 'test-token-replay', clock=clock, sleep=clock.sleep)
+    trello = TrelloClient(api_key='key', token='token', session=replay, rate_limit=limiter)
+    for i in range(3):
+        assert trello._get(['boards', 'b1']) == BOARD
+    assert replay.request_count == 5 and replay.throttled == 2
+    assert clock.slept.count(0.05) == 5
+    assert 3.0 in clock.slept
@@ -0,0 +1,110 @@
+# coding: utf-8
+"""test_webhooks.py"""
+
+import pytest
+import requests
+
+from fakes import make_client
+from test_snapshot import snapshot_source
+
+from simpletrello.sync import BoardSyncer
+from simpletrello.webhooks import WebhookReceiver, compute_signature, replay, verify_signature
+
+SECRET = 'app-secret'
+CALLBACK_URL = 'https://example.com/trello'
+
+
+def card_action(action_id, action_type, card, **data):
+    data.update({'card': card, 'board': {'id': 'b1'}})
+    return {'model': {'id': 'b1'},
+            'action': {'id': action_id, 'type': action_type, 'data': data}}
+
+
+def test_signature():
+    signature = compute_signature(SECRET, b'{"a": 1}', CALLBACK_URL)
+    assert verify_signature(SECRET, '{"a": 1}', CALLBACK_URL, signature)
+    assert not verify_signature(SECRET, b'{"a": 2}', CALLBACK_URL, signature)
+    assert not verify_signature(SECRET, b'{"a": 1}', CALLBACK_URL, None)
+    # Headers arrive as native strings: bytes on Python 2.
+    assert verify_signature(SECRET, b'{"a": 1}', CALLBACK_URL, signature.encode('ascii'))
+    assert not verify_signature(SECRET, b'{"a": 1}', CALLBACK_URL, '\u00e9' + signature[1:])
+
+
+def test_webhook_client_methods():
+    client, session = make_client([{'id': 'w1'}, [{'id': 'w1'}], {'_value': None}])
+    assert client.create_webhook(CALLBACK_URL, 'b1', description='bot')['id'] == 'w1'
+    assert client.get_webhooks() == [{'id': 'w1'}]
+    client.delete_webhook('w1')
+    assert session.calls[0][2]['callbackURL'] == CALLBACK_URL
+    assert session.calls[0][2]['idModel'] == 'b1'
+    assert session.calls[1][1].endswith('/tokens/token/webhooks')
+    assert session.calls[2][:2] == ('delete', 'https://api.trello.com/1/webhooks/w1')
+
+
+def test_receiver_applies_followed_board_actions():
+    client, session = make_client([snapshot_source(num_lists=2, cards_per_list=1),
+                                   [{'id': 'a4'}]])
+    board = client.load_board_snapshot('b1')
+    seen = []
+    with WebhookReceiver(client, secret=SECRET, callback_url=CALLBACK_URL) as receiver:
+        syncer = receiver.follow(board)
+        # The board is current, so polling would resume after its newest action.
+        assert syncer.since == 'a4'
+        receiver.on_action(seen.append)
+        assert requests.head(receiver.url).status_code == 200
+
+        payload = card_action('a5', 'createCard', {'id': 'new', 'name': 'Pushed'},
+                              list={'id': 'l1'})
+        response = replay(receiver.url, payload, secret=SECRET, callback_url=CALLBACK_URL)
+        assert response.status_code == 200
+        # Trello retries deliveries; a repeat is acknowledged but not applied twice.
+        replay(receiver.url, payload, secret=SECRET, callback_url=CALLBACK_URL)
+
+        forged = card_action('a6', 'deleteCard', {'id': 'new'})
+        assert replay(receiver.url, forged, secret='wrong',
+                      callback_url=CALLBACK_URL).status_code == 401
+        assert requests.post(receiver.url, data=b'not json', headers={
+            'X-Trello-Webhook': compute_signature(SECRET, b'not json', CALLBACK_URL),
+        }).status_code == 400
+
+    assert [card.id for card in board.lists[1].cards] == ['l1c0', 'new']
+    assert syncer.since == 'a5'
+    assert [action['id'] for action in seen] == ['a5']
+    assert len(session.calls) == 2
+
+
+def test_receiver_updates_live_objects_and_cache():
+    client, session = make_client([
+        {'id': 'c1', 'idBoard': 'b1', 'idList': 'l1', 'name': 'Old name'},
+        {'id': 'c1', 'idBoard': 'b1', 'idList': 'l2', 'name': 'Fresh'},
+    ], cache=True)
+    card = client.get_card('c1')
+    receiver = WebhookReceiver(client)
+    assert receiver.handle(card_action('a1', 'updateCard', {'id': 'c1', 'name': 'New name'},
+                                       listAfter={'id': 'l2'}, listBefore={'id': 'l1'}))
+    assert card.name == 'New name'
+    assert card.id_list == 'l2'
+    client.get_card('c1')
+    assert len(session.calls) == 2
+
+
+def test_failed_action_is_applied_on_retry():
+    client, session = make_client([snapshot_source(num_lists=1, cards_per_list=1)])
+    board = client.load_board_snapshot('b1')
+    receiver = WebhookReceiver(client)
+    syncer = receiver.follow(BoardSyncer(board, since='a0'))
+    apply = syncer.apply
+    failures = [RuntimeError('boom')]
+
+    def flaky_apply(action):
+        if failures:
+            raise failures.pop()
+        return apply(action)
+    syncer.apply = flaky_apply
+
+    payload = card_action('a5', 'createCard', {'id': 'new', 'name': 'Pushed'}, list={'id': 'l0'})
+    with pytest.raises(RuntimeError):
+        receiver.handle(payload)
+    assert receiver.handle(payload) is True
+    assert receiver.handle(payload) is False
+    assert [card.id for card in board.lists[0].cards] == ['l0c0', 'new']